@@ -3,18 +3,28 @@ Document Upload API endpoints
 """
 
 from fastapi import APIRouter, File, UploadFile, HTTPException, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from typing import Optional
+import codecs
+import contextlib
+import json
+import tempfile
 import time
 
-from app.models.schemas import TextVerificationResult, VerificationOptions
+from app.core.config import settings
+from app.core.uploads import spooled_upload
+from app.models.schemas import HallucinationBatchInput, TextVerificationResult, VerificationOptions
 from app.services.document_service import document_processor
-from app.services.verification_service import VerificationService
+from app.services.verification_service import PageCitationStream, VerificationService
 from app.services.hallucination_models import hallucination_detector, claim_extractor
 
 router = APIRouter()
 verification_service = VerificationService()
 
+CLAIM_CHUNK_BYTES = 64 * 1024
+
 
 @router.post("/upload-document", response_model=TextVerificationResult)
 async def upload_document(
@@ -32,22 +42,37 @@ async def upload_document(
     - Plain text files
     
     Automatically extracts text, finds citations, and verifies them.
+    Files up to MAX_UPLOAD_SIZE_MB are accepted (413 above that).
     """
     try:
         start_time = time.time()
         logger.info(f"📄 Processing uploaded file: {file.filename}")
         
-        # Read file content
-        file_content = await file.read()
-        
-        # Process document and extract text
-        doc_result = await document_processor.process_document(
-            file_content=file_content,
-            filename=file.filename,
-            enable_ocr=enable_ocr
+        # Create verification options
+        options = VerificationOptions(
+            enable_ai_scoring=enable_ai_analysis,
+            check_metadata=False,
+            check_content=False
         )
         
+        # Citations are verified page by page while the rest of the
+        # document is still being extracted (OCR can take a while)
+        citation_stream = PageCitationStream(verification_service, options)
+        try:
+            # Spool to disk (size limit checked per chunk) - never read into memory
+            async with spooled_upload(file) as file_path:
+                doc_result = await document_processor.process_file(
+                    file_path=file_path,
+                    filename=file.filename,
+                    enable_ocr=enable_ocr,
+                    on_page=citation_stream.add_page
+                )
+        except BaseException:
+            citation_stream.cancel()
+            raise
+        
         if not doc_result["success"]:
+            citation_stream.cancel()
             raise HTTPException(
                 status_code=400,
                 detail="Failed to extract text from document"
@@ -56,25 +81,15 @@ async def upload_document(
         extracted_text = doc_result["text"]
         logger.info(f"✅ Extracted {len(extracted_text)} characters from {file.filename}")
         
-        # Create verification options
-        options = VerificationOptions(
-            enable_ai_scoring=enable_ai_analysis,
-            check_metadata=False,
-            check_content=False
-        )
-        
         # Verify citations in extracted text
-        result = await verification_service.verify_text(
-            text=extracted_text,
-            format="plain",
-            options=options
-        )
+        result = await citation_stream.finish()
         
         # Add document metadata
         result.metadata = {
             "filename": file.filename,
             "extraction_method": doc_result["method"],
             "pages": doc_result.get("pages"),
+            "pages_ocr": doc_result.get("pages_ocr"),
             "text_length": len(extracted_text)
         }
         
@@ -83,6 +98,8 @@ async def upload_document(
         
         return result
         
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Document processing error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -128,24 +145,159 @@ async def detect_hallucinations(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/detect-hallucinations/batch")
+async def detect_hallucinations_batch(input_data: HallucinationBatchInput):
+    """
+    Hallucination detection for many citations at once
+    
+    Large batches are sharded across the CPU worker pool. Results keep the
+    input order. With `stream=true` the response is NDJSON - one
+    {"index", "detection_result"} line per citation, sent as soon as it's
+    ready - followed by a final {"summary": ...} line.
+    """
+    if not input_data.citations:
+        raise HTTPException(status_code=400, detail="No citations provided")
+    
+    if len(input_data.citations) > settings.HALLUCINATION_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {settings.HALLUCINATION_BATCH_MAX} citations per batch request"
+        )
+    
+    logger.info(f"🔍 Running batch hallucination detection on {len(input_data.citations)} citations")
+    start_time = time.time()
+    
+    def summary(likely_hallucinated: int) -> dict:
+        return {
+            "total": len(input_data.citations),
+            "likely_hallucinated": likely_hallucinated,
+            "processing_time_ms": int((time.time() - start_time) * 1000)
+        }
+    
+    def detect():
+        # aclosing: a disconnected client cancels the shards not yet started
+        return contextlib.aclosing(
+            hallucination_detector.stream_batch_detect(input_data.citations, input_data.contexts)
+        )
+    
+    if input_data.stream:
+        async def ndjson():
+            likely_hallucinated = 0
+            try:
+                async with detect() as results:
+                    async for index, result in results:
+                        likely_hallucinated += result["is_likely_hallucinated"]
+                        yield json.dumps({"index": index, "detection_result": result}) + "\n"
+            except Exception as e:
+                logger.error(f"Batch hallucination detection error: {e}")
+                yield json.dumps({"error": str(e)}) + "\n"
+                return
+            yield json.dumps({"summary": summary(likely_hallucinated)}) + "\n"
+        
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    try:
+        async with detect() as results:
+            detection_results = [result async for _, result in results]
+    except Exception as e:
+        logger.error(f"Batch hallucination detection error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "results": detection_results,
+        **summary(sum(r["is_likely_hallucinated"] for r in detection_results))
+    }
+
+
 @router.post("/extract-claims")
-async def extract_claims(text: str = Form(...)):
+async def extract_claims(
+    text: Optional[str] = Form(None),
+    file: Optional[UploadFile] = File(None),
+    stream: bool = Form(False)
+):
     """
     Extract verifiable claims from text
     
     Breaks down text into individual factual claims that can be verified.
     Useful for detailed fact-checking.
+    
+    Send `text`, or a UTF-8 text `file` for book-length input - the file is
+    read in chunks and never held in memory whole. With `stream=true` the
+    response is NDJSON: one claim per line as it's found, then a final
+    {"summary": ...} line.
     """
-    try:
+    if text is None and file is None:
+        raise HTTPException(status_code=400, detail="Provide text or a file")
+    
+    if file is not None:
+        logger.info(f"📝 Extracting claims from {file.filename}")
+        text_length = 0
+        source = file.file
+        if stream:
+            # The upload is closed once this handler returns, before the
+            # response body is streamed - keep our own (disk-backed) copy
+            source = await run_in_threadpool(tempfile.TemporaryFile, dir=settings.UPLOAD_SPOOL_DIR or None)
+            while data := await file.read(CLAIM_CHUNK_BYTES):
+                await run_in_threadpool(source.write, data)
+            await run_in_threadpool(source.seek, 0)
+        
+        async def chunks():
+            nonlocal text_length
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            try:
+                while True:
+                    # File IO off the event loop, as UploadFile does
+                    data = await run_in_threadpool(source.read, CLAIM_CHUNK_BYTES)
+                    chunk = decoder.decode(data, final=not data)
+                    text_length += len(chunk)
+                    if chunk:
+                        yield chunk
+                    if not data:
+                        break
+            finally:
+                if source is not file.file:
+                    await run_in_threadpool(source.close)
+        
+        claims = claim_extractor.aiter_claims(chunks())
+    else:
         logger.info(f"📝 Extracting claims from {len(text)} chars")
+        text_length = len(text)
         
-        claims = claim_extractor.extract_claims(text)
+        async def claims_from_text():
+            for claim in claim_extractor.iter_claims([text]):
+                yield claim
         
+        claims = claims_from_text()
+    
+    def summary(total: int, factual: int) -> dict:
         return {
-            "claims": claims,
-            "total_claims": len(claims),
-            "factual_claims": len([c for c in claims if c["needs_verification"]]),
-            "text_length": len(text)
+            "total_claims": total,
+            "factual_claims": factual,
+            "text_length": text_length
+        }
+    
+    if stream:
+        async def ndjson():
+            total = factual = 0
+            try:
+                async for claim in claims:
+                    total += 1
+                    factual += claim["needs_verification"]
+                    yield json.dumps(claim) + "\n"
+            except Exception as e:
+                logger.error(f"Claim extraction error: {e}")
+                yield json.dumps({"error": str(e)}) + "\n"
+                return
+            yield json.dumps({"summary": summary(total, factual)}) + "\n"
+        
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    try:
+        claim_list = [claim async for claim in claims]
+        
+        return {
+            "claims": claim_list,
+            **summary(len(claim_list), len([c for c in claim_list if c["needs_verification"]]))
         }
         
     except Exception as e:
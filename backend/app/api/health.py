@@ -5,6 +5,8 @@ Health check endpoints
 from fastapi import APIRouter
 from datetime import datetime
 from app.core.config import settings
+from app.services.ai_service import ai_service
+from app.services.embedding_service import embedding_service
 
 router = APIRouter()
 
@@ -20,6 +22,27 @@ async def health_check():
     }
 
 
+@router.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness check
+    
+    The API is ready as soon as the worker is up - requests that don't need
+    Layer 3 are served while its model loads (or if it is broken). The
+    embedding backend's live state (ready, loading, unavailable or
+    not_loaded) is reported per feature.
+    """
+    content_verification = await embedding_service.probe()
+    
+    return {
+        "ready": True,
+        "timestamp": datetime.utcnow().isoformat(),
+        "features": {
+            "content_verification": content_verification,
+        },
+    }
+
+
 @router.get("/health/detailed")
 async def detailed_health_check():
     """Detailed health check with service status"""
@@ -38,6 +61,11 @@ async def detailed_health_check():
             "openai_api": {"status": "available"},
             "crossref_api": {"status": "available"},
             "arxiv_api": {"status": "available"},
+            "embedding_model": {
+                "status": embedding_service.status,
+                "backend": embedding_service.backend,
+            },
+            "llm_providers": ai_service.router.snapshot(),
         },
         "system": {
             "environment": settings.ENV,
@@ -5,7 +5,7 @@ Caches Crossref, arXiv, and OpenAlex API calls to avoid rate limits
 
 import json
 import hashlib
-from typing import Optional, Any
+from typing import Optional, Any, List, Dict
 from loguru import logger
 import redis.asyncio as aioredis
 from functools import wraps
@@ -17,6 +17,7 @@ class CacheService:
     
     def __init__(self):
         self.redis = None
+        self.redis_raw = None  # Binary-safe client for raw byte values
         self.enabled = False
         
     async def connect(self, redis_url: str = "redis://localhost:6379/0"):
@@ -29,6 +30,12 @@ class CacheService:
                 socket_connect_timeout=2,
                 socket_timeout=2
             )
+            self.redis_raw = await aioredis.from_url(
+                redis_url,
+                decode_responses=False,
+                socket_connect_timeout=2,
+                socket_timeout=2
+            )
             # Test connection
             await self.redis.ping()
             self.enabled = True
@@ -37,6 +44,7 @@ class CacheService:
             logger.warning(f"⚠️ Redis cache disabled (connection failed): {e}")
             self.enabled = False
             self.redis = None
+            self.redis_raw = None
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
@@ -76,6 +84,37 @@ class CacheService:
         except Exception as e:
             logger.error(f"Cache set error: {e}")
     
+    async def get_many_bytes(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Get raw byte values for several keys in one round trip"""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+        
+        try:
+            return await self.redis_raw.mget(keys)
+        except Exception as e:
+            logger.error(f"Cache mget error: {e}")
+            return [None] * len(keys)
+    
+    async def set_many_bytes(self, items: Dict[str, bytes], ttl: int = 3600):
+        """
+        Set raw byte values (no JSON encoding) with a shared TTL
+        
+        Args:
+            items: Mapping of cache key to bytes
+            ttl: Time to live in seconds (default 1 hour)
+        """
+        if not self.enabled or not items:
+            return
+        
+        try:
+            async with self.redis_raw.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, value, ex=ttl)
+                await pipe.execute()
+            logger.debug(f"Cache SET: {len(items)} binary keys (TTL: {ttl}s)")
+        except Exception as e:
+            logger.error(f"Cache set error: {e}")
+    
     async def delete(self, key: str):
         """Delete key from cache"""
         if not self.enabled:
@@ -92,6 +131,8 @@ class CacheService:
         if self.redis:
             try:
                 await self.redis.close()
+                if self.redis_raw:
+                    await self.redis_raw.close()
                 logger.info("Redis connection closed")
             except Exception as e:
                 logger.debug(f"Redis close error: {e}")
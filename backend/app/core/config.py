@@ -35,6 +35,34 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = ""  # Alias for GOOGLE_API_KEY
     ANTHROPIC_API_KEY: str = ""
     
+    # LLM Calls (Layer 4)
+    LLM_PROVIDER: str = "auto"  # "auto" = providers with API keys; "fake" = offline simulator
+    LLM_TIMEOUT_SECONDS: float = 30.0  # Per provider attempt
+    LLM_REQUEST_DEADLINE_SECONDS: float = 45.0  # Whole request, including failover
+    LLM_ROUTER_MAX_SAMPLES: int = 50  # Recent calls per provider used for routing
+    LLM_ROUTER_WINDOW_SECONDS: float = 300.0  # Older calls are forgotten
+    OPENAI_MAX_CONCURRENCY: int = 8  # In-flight requests per worker
+    GEMINI_MAX_CONCURRENCY: int = 4  # Also the Gemini thread pool size
+    LLM_CACHE_TTL: int = 2592000  # Parsed outcomes, 30 days (0 = disabled)
+    LLM_BATCH_SIZE: int = 10  # Citations scored per request in text/batch verification
+    
+    # Fake LLM (LLM_PROVIDER=fake) - offline load and regression testing
+    FAKE_LLM_LATENCY_MS: float = 800.0  # Median latency
+    FAKE_LLM_LATENCY_SIGMA: float = 0.5  # Log-normal spread (tail heaviness)
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_SEED: int = 42
+    FAKE_LLM_MAX_CONCURRENCY: int = 64
+    
+    # AI Gating - skip the LLM when Layers 1-3 are conclusive
+    AI_GATING_ENABLED: bool = True
+    AI_GATING_CONFIRM_FIELDS: List[str] = ["authors", "year"]  # Crossref fields that must be compared and match
+    AI_GATING_REJECT_STATUS_CODES: List[int] = [404, 410]  # Crossref statuses that count as fabricated
+    AI_GATING_REJECTED_CONFIDENCE: float = 0.1  # Layer 4 score recorded for rejected citations
+    
+    # Early Exit - stop verifying once the verdict is settled
+    EARLY_EXIT_ENABLED: bool = True
+    EARLY_EXIT_MIN_FAILED_LAYERS: int = 2  # Failed layers that already make a citation FAKE
+    
     # External APIs
     CROSSREF_EMAIL: str = ""
     SERPER_API_KEY: str = ""
@@ -63,6 +91,35 @@ class Settings(BaseSettings):
     VERIFICATION_TIMEOUT_SECONDS: int = 30
     ENABLE_AI_SCORING: bool = True
     ENABLE_CITATION_GRAPH: bool = True
+    VERIFY_MAX_CONCURRENT_CITATIONS: int = 5  # Citation pipelines in flight per text/batch request
+    
+    # URL Checks (Layer 1) - cache TTLs in seconds by outcome
+    URL_CHECK_TTL_OK: int = 86400
+    URL_CHECK_TTL_NOT_FOUND: int = 21600
+    URL_CHECK_TTL_ERROR: int = 300
+    URL_CHECK_TTL_NETWORK_ERROR: int = 60
+    
+    # Upstream HTTP (shared client)
+    DNS_CACHE_TTL: int = 300
+    DNS_CACHE_MAX_ENTRIES: int = 1024  # Least recently used hosts are evicted first
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_KEEPALIVE_EXPIRY: float = 120.0
+    HTTP_PREWARM_URLS: List[str] = [
+        "https://api.crossref.org/",
+        "http://export.arxiv.org/",
+        "https://api.openalex.org/",
+        "https://doi.org/",
+    ]
+    
+    # Hallucination Detection
+    HALLUCINATION_RULES_FILE: str = ""  # JSON rule set; empty = bundled app/data/hallucination_rules.json
+    HALLUCINATION_BATCH_MAX: int = 10000  # Citations per /detect-hallucinations/batch request
+    HALLUCINATION_BATCH_INLINE_MAX: int = 64  # Smaller batches skip the process pool
+    HALLUCINATION_MIN_SHARD_SIZE: int = 32
+    HALLUCINATION_QUOTE_MIN_SCORE: float = 0.6  # Best window similarity below this flags the quote
+    CLAIM_MAX_SENTENCE_CHARS: int = 10000  # Longer runs without . ! ? are split
+    CLAIM_NUMBER_REL_TOLERANCE: float = 0.0  # On top of the written precision ("95%" = 94.5-95.5)
+    CLAIM_NUMBER_ABS_TOLERANCE: float = 0.0
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -72,6 +129,42 @@ class Settings(BaseSettings):
     PLAYWRIGHT_HEADLESS: bool = True
     PLAYWRIGHT_TIMEOUT: int = 30000
     
+    # Worker Pools
+    CPU_POOL_WORKERS: int = 0  # 0 = one process per CPU core
+    
+    # Document Processing
+    MAX_UPLOAD_SIZE_MB: int = 200  # Enforced while the upload streams in
+    UPLOAD_SPOOL_DIR: str = ""  # Temp dir for uploads; empty = system default
+    PDF_EXTRACTION_TIME_BUDGET: float = 30.0  # Seconds per document; later pages are dropped
+    PDF_MIN_PAGES_PER_WORKER: int = 8  # Smaller PDFs aren't split across workers
+    OCR_DPI: int = 200  # Render resolution for scanned pages
+    OCR_MIN_PAGE_CHARS: int = 20  # Pages with a shorter text layer are OCR'd
+    OCR_TIME_BUDGET: float = 300.0  # Seconds per document; unfinished pages are skipped
+    
+    # Embeddings (Layer 3)
+    EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "sentence-transformers"  # or "onnx-int8", "sidecar"
+    EMBEDDING_ONNX_DIR: str = "models/all-MiniLM-L6-v2-onnx-int8"
+    EMBEDDING_SIDECAR_SOCKET: str = "/tmp/hallux-embeddings.sock"
+    EMBEDDING_SIDECAR_BACKEND: str = "sentence-transformers"  # Model backend inside the sidecar
+    EMBEDDING_MAX_SEQ_LENGTH: int = 256
+    EMBEDDING_WARMUP: bool = True  # Load the model in the background at startup
+    EMBEDDING_LOAD_RETRY_SECONDS: float = 60.0  # Retry a failed model load after this long
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_BATCH_WAIT_MS: int = 10
+    EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # In-memory LRU budget
+    EMBEDDING_CACHE_TTL: int = 604800  # 7 days in the shared cache
+    EMBEDDING_CACHE_SHARED: bool = True
+    LAYER3_PASSAGE_CHARS: int = 1000
+    LAYER3_PASSAGE_OVERLAP: int = 200
+    LAYER3_MAX_PASSAGES: int = 64
+    LAYER3_TOP_K: int = 3
+    
+    # Citation Suggestions
+    SUGGESTION_INDEX_DIR: str = ""  # Built with: python -m app.services.suggestion_index build
+    SUGGESTION_TOP_K: int = 3
+    SUGGESTION_MIN_SCORE: float = 0.45
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
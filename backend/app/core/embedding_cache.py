@@ -0,0 +1,122 @@
+"""
+Embedding Cache
+Content-hash keyed cache of embedding vectors: an in-memory LRU with a byte
+budget, optionally backed by the shared Redis cache
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.cache import cache_service
+from app.core.config import settings
+
+
+class EmbeddingCache:
+    """
+    Cache of float32 embedding vectors keyed by model name + text hash
+
+    Vectors are stored as raw float32 bytes in Redis (no JSON), and as
+    read-only numpy arrays in the local LRU. Only used from the event loop
+    thread, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = settings.EMBEDDING_CACHE_MAX_BYTES,
+        ttl: int = settings.EMBEDDING_CACHE_TTL,
+        use_shared_cache: bool = settings.EMBEDDING_CACHE_SHARED,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.use_shared_cache = use_shared_cache
+
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """
+        Cache key for a text embedded by a given model
+
+        Example:
+            make_key("all-MiniLM-L6-v2", "some text")
+            -> "emb:all-MiniLM-L6-v2:b94f6f12..."
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"emb:{model_name}:{digest}"
+
+    async def get_many(self, model_name: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up vectors for texts (None where not cached)"""
+        keys = [self.make_key(model_name, text) for text in texts]
+        results = [self._get_local(key) for key in keys]
+
+        missing = [i for i, vector in enumerate(results) if vector is None]
+        if missing and self.use_shared_cache:
+            raw_values = await cache_service.get_many_bytes([keys[i] for i in missing])
+            for i, raw in zip(missing, raw_values):
+                if raw:
+                    vector = np.frombuffer(raw, dtype=np.float32)
+                    self._put_local(keys[i], vector)
+                    results[i] = vector
+
+        found = sum(1 for vector in results if vector is not None)
+        self.hits += found
+        self.misses += len(results) - found
+        return results
+
+    async def set_many(self, model_name: str, texts: List[str], vectors: np.ndarray):
+        """Store vectors for texts locally and in the shared cache"""
+        shared: Dict[str, bytes] = {}
+        for text, vector in zip(texts, vectors):
+            key = self.make_key(model_name, text)
+            vector = np.array(vector, dtype=np.float32)
+            self._put_local(key, vector)
+            if self.use_shared_cache:
+                shared[key] = vector.tobytes()
+
+        if shared:
+            await cache_service.set_many_bytes(shared, ttl=self.ttl)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache size and hit counters"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # ========== LOCAL LRU ==========
+
+    def _get_local(self, key: str) -> Optional[np.ndarray]:
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+        return vector
+
+    def _put_local(self, key: str, vector: np.ndarray):
+        if vector.nbytes > self.max_bytes:
+            return
+
+        vector.flags.writeable = False
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+
+        # Evict least recently used vectors until back under budget
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+
+# Global embedding cache instance
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,61 @@
+"""
+Shared worker pools for CPU-bound work
+Keeps parsing/extraction off the asyncio event loop
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def process_pool_workers() -> int:
+    """Number of processes in the shared pool"""
+    return settings.CPU_POOL_WORKERS or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared process pool, creating it on first use
+
+    Uses the "spawn" start method so children never inherit the event loop,
+    open sockets or loaded models of the parent worker (and behaves the same
+    on Linux and Windows).
+    """
+    global _process_pool
+    if _process_pool is None:
+        workers = process_pool_workers()
+        _process_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"✅ CPU worker pool started ({workers} processes)")
+    return _process_pool
+
+
+async def run_in_process(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a picklable, module-level function in the shared process pool
+
+    Example:
+        text = await run_in_process(extract_article_text, html)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), partial(func, *args, **kwargs))
+
+
+def shutdown_executors():
+    """Shut down shared pools (called on application shutdown)"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+        logger.info("CPU worker pool stopped")
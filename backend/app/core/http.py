@@ -0,0 +1,205 @@
+"""
+Shared HTTP Client
+One pooled httpx client per worker with an in-process DNS cache, plus
+connection pre-warming for the upstream APIs every verification hits
+"""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+from loguru import logger
+
+from app.core.config import settings
+
+
+class DnsCache:
+    """
+    Resolver cache with a fixed TTL and a size cap
+
+    getaddrinfo doesn't expose record TTLs, so entries live for
+    DNS_CACHE_TTL seconds and are dropped early if every address fails.
+    URL checks reach arbitrary hosts, so at most ``max_entries`` are kept:
+    expired entries go first, then the least recently used.
+    """
+
+    def __init__(self, ttl: int = settings.DNS_CACHE_TTL, max_entries: int = settings.DNS_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, List[str]]]" = OrderedDict()
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """IP addresses for host (IP literals are returned as-is)"""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._store(key, addresses)
+        logger.debug(f"DNS resolved {host} -> {addresses}")
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        self._entries.pop((host, port), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: Tuple[str, int], addresses: List[str]):
+        now = time.monotonic()
+        self._entries[key] = (now + self.ttl, addresses)
+        self._entries.move_to_end(key)
+        if len(self._entries) <= self.max_entries:
+            return
+
+        for stale in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[stale]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that connects via the DNS cache
+
+    Connects to the cached IP; TLS still uses the original hostname for SNI
+    and certificate checks (httpcore passes it to start_tls separately).
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, dns_cache: DnsCache):
+        self._backend = backend
+        self._dns_cache = dns_cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self._dns_cache.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(f"DNS resolution failed for {host}: {e}") from e
+
+        last_error = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+
+        # Every cached address failed - resolve afresh next time
+        self._dns_cache.invalidate(host, port)
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+dns_cache = DnsCache()
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_closing: set = set()  # Keeps stale-client close tasks alive until they finish
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Shared client for upstream API calls (created on first use)
+
+    Connections are kept alive between verifications, so repeat calls to
+    Crossref/arXiv/OpenAlex skip DNS, TCP and TLS setup entirely.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            _close_stale_client(_client, _client_loop)
+
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _install_dns_cache(transport)
+        _client = httpx.AsyncClient(transport=transport, timeout=10.0)
+        _client_loop = loop
+    return _client
+
+
+def _install_dns_cache(transport: httpx.AsyncHTTPTransport):
+    """
+    Route the transport's connections through the DNS cache
+
+    httpx doesn't expose the network backend, so this wraps the pool's
+    private one (httpcore is pinned in requirements.txt). If the internals
+    don't look as expected the client works without the cache.
+    """
+    pool = getattr(transport, "_pool", None)
+    backend = getattr(pool, "_network_backend", None)
+    if not isinstance(backend, httpcore.AsyncNetworkBackend):
+        logger.warning(f"⚠️ Unsupported httpcore {httpcore.__version__} - DNS cache disabled")
+        return
+    pool._network_backend = CachingNetworkBackend(backend, dns_cache)
+
+
+def _close_stale_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+    """Close a client left over from a previous event loop (e.g. between test clients)"""
+    if loop is not None and loop.is_running():
+        # Its connections belong to that loop (in another thread) - close them there
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+
+    async def close():
+        try:
+            await client.aclose()
+        except Exception as e:
+            # The old loop is gone; sockets it can't release are dropped with the pool
+            logger.debug(f"Stale HTTP client close: {e}")
+
+    task = asyncio.get_running_loop().create_task(close())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+async def prewarm_upstreams(urls: List[str] = settings.HTTP_PREWARM_URLS):
+    """Resolve and open pooled connections to the configured upstreams"""
+    client = get_http_client()
+
+    async def warm(url: str):
+        started = time.perf_counter()
+        try:
+            await client.head(url, timeout=5.0)
+            logger.info(f"🔥 Pre-warmed {urlsplit(url).netloc} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        except httpx.HTTPError as e:
+            logger.warning(f"⚠️ Pre-warm failed for {url}: {e}")
+
+    await asyncio.gather(*(warm(url) for url in urls))
+
+
+async def close_http_client():
+    """Close the shared client (called on application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
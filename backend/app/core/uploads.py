@@ -0,0 +1,144 @@
+"""
+Upload handling for large documents
+Size limits enforced while the request body streams in, and uploads
+spooled to temp files so they're processed from disk, not memory
+"""
+
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterable
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from loguru import logger
+
+from app.core.config import settings
+
+SPOOL_CHUNK_BYTES = 1024 * 1024
+MULTIPART_OVERHEAD_BYTES = 64 * 1024  # Boundaries, headers and small form fields
+
+
+def max_upload_bytes() -> int:
+    return settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+
+class UploadTooLarge(HTTPException):
+    """
+    Raised from the request body stream once it passes the size limit
+
+    An HTTPException, so FastAPI's form parsing lets it through (it turns
+    any other error into a 400) and it is answered as a 413.
+    """
+
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=413,
+            detail=f"File too large. Max size: {settings.MAX_UPLOAD_SIZE_MB}MB",
+        )
+        self.max_bytes = max_bytes
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects oversized request bodies on upload routes with 413
+
+    Checks Content-Length up front and counts the bytes actually received,
+    so chunked uploads are cut off as soon as they pass the limit instead
+    of being buffered by the form parser first.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_bytes: int = 0):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes or max_upload_bytes() + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise UploadTooLarge(self.max_bytes)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except UploadTooLarge:
+            # Normally answered by the exception handlers; this covers
+            # bodies read outside a route (e.g. by other middleware)
+            if response_started:
+                raise
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope, receive, send):
+        logger.warning(f"⚠️ Upload to {scope['path']} rejected: over {settings.MAX_UPLOAD_SIZE_MB}MB")
+        response = JSONResponse(
+            status_code=413,
+            content={
+                "error": True,
+                "status_code": 413,
+                "message": f"File too large. Max size: {settings.MAX_UPLOAD_SIZE_MB}MB",
+            },
+        )
+        await response(scope, receive, send)
+
+
+@asynccontextmanager
+async def spooled_upload(file: UploadFile, max_bytes: int = 0) -> AsyncIterator[Path]:
+    """
+    Copy an upload to a temp file in chunks and yield its path
+
+    The size limit (MAX_UPLOAD_SIZE_MB by default) is checked per chunk -
+    the upload is never held in memory. The file is removed on exit.
+
+    Example:
+        async with spooled_upload(file) as path:
+            result = await document_processor.process_file(path, file.filename)
+    """
+    max_bytes = max_bytes or max_upload_bytes()
+    # File IO runs in the threadpool, as UploadFile's own does
+    spool = await run_in_threadpool(
+        tempfile.NamedTemporaryFile,
+        suffix=Path(file.filename or "").suffix,
+        dir=settings.UPLOAD_SPOOL_DIR or None,
+        delete=False,
+    )
+    try:
+        try:
+            size = 0
+            while chunk := await file.read(SPOOL_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Max size: {max_bytes / 1024 / 1024:g}MB",
+                    )
+                await run_in_threadpool(spool.write, chunk)
+        finally:
+            await run_in_threadpool(spool.close)
+        yield Path(spool.name)
+    finally:
+        await run_in_threadpool(os.unlink, spool.name)
@@ -8,11 +8,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from loguru import logger
+import asyncio
 import sys
 
 from app.core.config import settings
 from app.api import verification, health, document
 from app.core.cache import cache_service
+from app.core.executors import shutdown_executors
+from app.core.http import close_http_client, prewarm_upstreams
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.services.ai_service import ai_service
+from app.services.embedding_service import embedding_service
+from app.services.suggestion_index import suggestion_engine
 
 # Configure logging
 logger.remove()
@@ -45,6 +52,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Redis cache disabled (will work without caching): {e}")
     
+    # Load the Layer 3 model in the background - the worker serves requests
+    # that don't need embeddings immediately (see /api/health/ready)
+    if settings.EMBEDDING_WARMUP:
+        app.state.embedding_warmup = asyncio.create_task(embedding_service.warm_up())
+    
+    # Map the citation suggestion index off the event loop
+    if suggestion_engine.index is not None:
+        app.state.suggestion_index_load = asyncio.create_task(suggestion_engine.load())
+    
+    # Resolve and connect to Crossref/arXiv/OpenAlex before the first request
+    if settings.HTTP_PREWARM_URLS:
+        app.state.http_prewarm = asyncio.create_task(prewarm_upstreams())
+    
     yield
     
     logger.info("🛑 Shutting down Hallux API Server...")
@@ -53,6 +73,10 @@ async def lifespan(app: FastAPI):
         await cache_service.close()
     except Exception as e:
         logger.debug(f"Cache cleanup skipped: {e}")
+    await close_http_client()
+    ai_service.close()
+    embedding_service.close()
+    shutdown_executors()
 
 
 # Create FastAPI app
@@ -66,6 +90,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Reject oversized uploads while they stream in
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    paths=["/api/upload-document", "/api/extract-claims"],
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
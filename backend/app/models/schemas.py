@@ -55,6 +55,13 @@ class BatchInput(BaseModel):
     options: Optional[VerificationOptions] = VerificationOptions()
 
 
+class HallucinationBatchInput(BaseModel):
+    """Batch hallucination detection input"""
+    citations: List[str] = Field(..., description="Citations to check")
+    contexts: Optional[List[Optional[str]]] = Field(None, description="Context per citation (same order)")
+    stream: bool = Field(False, description="Stream NDJSON lines as results become available")
+
+
 class LayerResult(BaseModel):
     """Result from a single verification layer"""
     status: LayerStatus
@@ -106,6 +113,7 @@ class TextVerificationResult(BaseModel):
     results: List[VerificationResult]
     overall_confidence: float
     processing_time_ms: int
+    metadata: Optional[Dict[str, Any]] = None  # Source document details (uploads)
     timestamp: str = datetime.utcnow().isoformat()
 
 
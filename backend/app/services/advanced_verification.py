@@ -5,14 +5,20 @@ Implements the "winning" features suggested by competition analysis
 
 import re
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 from loguru import logger
-import httpx
-from sentence_transformers import SentenceTransformer, util
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
 from app.core.cache import cached
+from app.core.config import settings
+from app.core.executors import run_in_process
+from app.core.http import get_http_client
+from app.services.claim_alignment import ClaimSourceIndex
+from app.services.content_extraction import extract_article_text
+from app.services.embedding_service import (
+    embedding_service,
+    EmbeddingModelUnavailable,
+)
+from app.services.passage_similarity import chunk_passages, score_passages
 
 class AdvancedVerificationService:
     """
@@ -24,13 +30,9 @@ class AdvancedVerificationService:
         self.arxiv_api = "http://export.arxiv.org/api/query?id_list="
         self.openalex_api = "https://api.openalex.org/works/"
         
-        # Initialize sentence-transformers model for semantic similarity
-        try:
-            self.embeddings_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("✅ Loaded sentence-transformers model for semantic similarity")
-        except Exception as e:
-            logger.error(f"Failed to load embeddings model: {e}")
-            self.embeddings_model = None
+        # Sentence-transformers inference runs on the shared embedding service
+        # thread, so similarity scoring never blocks the event loop
+        self.embeddings = embedding_service
         
     # ========== GEMINI SUGGESTION 1: Real Crossref API Integration ==========
     
@@ -40,7 +42,8 @@ class AdvancedVerificationService:
         ✨ LAYER 3 IMPLEMENTATION: Real web scraping + semantic similarity
         
         Scrapes the source URL using Playwright (handles dynamic content),
-        extracts main text/abstract, calculates semantic similarity with context.
+        extracts main text/abstract, chunks it into overlapping passages and
+        scores the context against every passage (best passage wins).
         
         Args:
             url: Source URL to scrape
@@ -51,7 +54,9 @@ class AdvancedVerificationService:
                 "aligned": bool,  # True if content matches context
                 "confidence": float,  # 0.0-1.0 similarity score
                 "reason": str,
-                "similarity_score": float,
+                "similarity_score": float,  # Best passage similarity
+                "top_k_scores": List[float],
+                "best_passage_offset": int,  # Offset of best passage in scraped text
                 "content_length": int,
                 "flags": List[str]
             }
@@ -60,6 +65,9 @@ class AdvancedVerificationService:
         
         try:
             # Step 1: Scrape the URL with Playwright (handles JavaScript)
+            # Imported here so workers that never scrape don't pay for it at startup
+            from playwright.async_api import async_playwright
+            
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=True)
                 page = await browser.new_page()
@@ -88,54 +96,8 @@ class AdvancedVerificationService:
                         "flags": ["inaccessible_url"]
                     }
             
-            # Step 2: Extract main content with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove scripts, styles, navigation
-            for tag in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                tag.decompose()
-            
-            # Extract abstract/main text (prioritize academic article structures)
-            abstract_text = ""
-            main_text = ""
-            
-            # Try common academic article selectors
-            abstract_selectors = [
-                'section.abstract',
-                'div.abstract',
-                'div[class*="abstract"]',
-                'p[class*="abstract"]',
-                'section[id*="abstract"]'
-            ]
-            
-            for selector in abstract_selectors:
-                abstract_elem = soup.select_one(selector)
-                if abstract_elem:
-                    abstract_text = abstract_elem.get_text(separator=' ', strip=True)
-                    break
-            
-            # Extract main content
-            main_selectors = [
-                'article',
-                'main',
-                'div[class*="content"]',
-                'div[class*="article"]',
-                'section[class*="body"]'
-            ]
-            
-            for selector in main_selectors:
-                main_elem = soup.select_one(selector)
-                if main_elem:
-                    main_text = main_elem.get_text(separator=' ', strip=True)
-                    break
-            
-            # Fallback: use all paragraph text
-            if not main_text:
-                paragraphs = soup.find_all('p')
-                main_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
-            
-            # Combine abstract + main (prioritize abstract)
-            scraped_content = f"{abstract_text} {main_text}".strip()
+            # Step 2: Extract abstract/main text off the event loop (lxml, single pass)
+            scraped_content = await run_in_process(extract_article_text, html_content)
             content_length = len(scraped_content)
             
             if content_length < 100:
@@ -149,8 +111,22 @@ class AdvancedVerificationService:
                     "flags": flags
                 }
             
-            # Step 3: Calculate semantic similarity using embeddings
-            if not self.embeddings_model:
+            # Step 3: Calculate semantic similarity against every passage
+            # Overlapping passages keep each window inside the model's token
+            # limit while covering the whole document, not just the abstract
+            passages = chunk_passages(
+                scraped_content,
+                size=settings.LAYER3_PASSAGE_CHARS,
+                overlap=settings.LAYER3_PASSAGE_OVERLAP,
+                max_passages=settings.LAYER3_MAX_PASSAGES,
+            )
+            
+            try:
+                # One batched call for the claim and all passages
+                embeddings = await self.embeddings.encode(
+                    [context] + [passage for _, passage in passages]
+                )
+            except EmbeddingModelUnavailable:
                 logger.error("Embeddings model not loaded, cannot calculate similarity")
                 return {
                     "aligned": False,
@@ -161,16 +137,10 @@ class AdvancedVerificationService:
                     "flags": ["model_error"]
                 }
             
-            # Truncate to avoid token limits (models handle ~512 tokens)
-            context_truncated = context[:2000]
-            scraped_truncated = scraped_content[:2000]
-            
-            # Generate embeddings
-            context_embedding = self.embeddings_model.encode(context_truncated, convert_to_tensor=True)
-            scraped_embedding = self.embeddings_model.encode(scraped_truncated, convert_to_tensor=True)
-            
-            # Cosine similarity
-            similarity_score = float(util.cos_sim(context_embedding, scraped_embedding)[0][0])
+            # Vectorized cosine similarity over all passages
+            scores = score_passages(embeddings[0], embeddings[1:], top_k=settings.LAYER3_TOP_K)
+            similarity_score = scores["max_score"]
+            best_offset, best_passage = passages[scores["best_index"]]
             
             # Step 4: Determine alignment based on thresholds
             if similarity_score >= 0.7:
@@ -199,6 +169,11 @@ class AdvancedVerificationService:
                 "confidence": confidence,
                 "reason": status,
                 "similarity_score": similarity_score,
+                "top_k_scores": scores["top_k_scores"],
+                "top_k_mean": scores["top_k_mean"],
+                "best_passage_offset": best_offset,
+                "best_passage": best_passage[:300],
+                "passages_scored": len(passages),
                 "content_length": content_length,
                 "flags": flags
             }
@@ -223,64 +198,78 @@ class AdvancedVerificationService:
         logger.info(f"Verifying DOI with Crossref: {doi}")
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.crossref_api}{doi}",
-                    headers={"User-Agent": "Hallux/1.0 (mailto:hallux@example.com)"}
-                )
-                
-                if response.status_code != 200:
-                    return {
-                        "verified": False,
-                        "confidence": 0.0,
-                        "reason": f"DOI not found in Crossref (Status: {response.status_code})"
-                    }
-                
-                data = response.json()
-                message = data.get("message", {})
-                
-                # Extract metadata
-                actual_authors = [author.get("family", "") for author in message.get("author", [])]
-                actual_year = message.get("published-print", {}).get("date-parts", [[None]])[0][0]
-                actual_title = message.get("title", [""])[0]
-                
-                # Extract expected year from citation
-                year_match = re.search(r'\((\d{4})\)', citation_text)
-                expected_year = int(year_match.group(1)) if year_match else None
-                
-                # Extract expected authors from citation
-                author_match = re.search(r'([A-Z][a-z]+)', citation_text)
-                expected_author = author_match.group(1) if author_match else None
-                
-                # CRITICAL: Check for mismatches (Partial Hallucination Detection)
-                mismatches = []
-                confidence = 1.0
-                
-                if expected_year and actual_year and expected_year != actual_year:
+            client = get_http_client()
+            response = await client.get(
+                f"{self.crossref_api}{doi}",
+                headers={"User-Agent": "Hallux/1.0 (mailto:hallux@example.com)"}
+            )
+            
+            if response.status_code != 200:
+                return {
+                    "verified": False,
+                    "confidence": 0.0,
+                    "reason": f"DOI not found in Crossref (Status: {response.status_code})",
+                    "status_code": response.status_code
+                }
+            
+            data = response.json()
+            message = data.get("message", {})
+            
+            # Extract metadata
+            actual_authors = [author.get("family", "") for author in message.get("author", [])]
+            actual_year = message.get("published-print", {}).get("date-parts", [[None]])[0][0]
+            actual_title = message.get("title", [""])[0]
+            
+            # Extract expected year from citation
+            year_match = re.search(r'\((\d{4})\)', citation_text)
+            expected_year = int(year_match.group(1)) if year_match else None
+            
+            # Extract expected authors from citation
+            author_match = re.search(r'([A-Z][a-z]+)', citation_text)
+            expected_author = author_match.group(1) if author_match else None
+            
+            # CRITICAL: Check for mismatches (Partial Hallucination Detection)
+            mismatches = []
+            compared_fields = []
+            matched_fields = []
+            confidence = 1.0
+            
+            if expected_year and actual_year:
+                compared_fields.append("year")
+                if expected_year != actual_year:
                     mismatches.append(f"Year mismatch: Citation says {expected_year}, DOI says {actual_year}")
                     confidence -= 0.4
-                
-                if expected_author and expected_author not in actual_authors:
+                else:
+                    matched_fields.append("year")
+            
+            if expected_author:
+                compared_fields.append("authors")
+                if expected_author not in actual_authors:
                     mismatches.append(f"Author mismatch: '{expected_author}' not in {actual_authors}")
                     confidence -= 0.3
-                
-                result = {
-                    "verified": len(mismatches) == 0,
-                    "confidence": max(confidence, 0.1),
-                    "actual_title": actual_title,
-                    "actual_authors": actual_authors,
-                    "actual_year": actual_year,
-                    "mismatches": mismatches,
-                    "doi": doi
-                }
-                
-                if mismatches:
-                    result["reason"] = "⚠️ PARTIAL HALLUCINATION: DOI exists but details don't match"
                 else:
-                    result["reason"] = "✅ DOI verified with matching metadata"
-                
-                return result
-                
+                    matched_fields.append("authors")
+            
+            result = {
+                "verified": len(mismatches) == 0,
+                "confidence": max(confidence, 0.1),
+                "actual_title": actual_title,
+                "actual_authors": actual_authors,
+                "actual_year": actual_year,
+                "mismatches": mismatches,
+                "compared_fields": compared_fields,  # Citation details checked against Crossref
+                "matched_fields": matched_fields,
+                "doi": doi,
+                "status_code": response.status_code
+            }
+            
+            if mismatches:
+                result["reason"] = "⚠️ PARTIAL HALLUCINATION: DOI exists but details don't match"
+            else:
+                result["reason"] = "✅ DOI verified with matching metadata"
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Crossref API error: {e}")
             return {
@@ -299,38 +288,38 @@ class AdvancedVerificationService:
         logger.info(f"Verifying arXiv ID: {arxiv_id}")
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.arxiv_api}{arxiv_id}")
-                
-                if response.status_code != 200:
-                    return {
-                        "verified": False,
-                        "confidence": 0.0,
-                        "reason": f"arXiv ID not found (Status: {response.status_code})"
-                    }
-                
-                # Parse XML response
-                content = response.text
-                
-                if "<title>" not in content or "entry" not in content:
-                    return {
-                        "verified": False,
-                        "confidence": 0.1,
-                        "reason": "arXiv ID format invalid or paper not found"
-                    }
-                
-                # Extract title (simple XML parsing)
-                title_match = re.search(r'<title>(.*?)</title>', content, re.DOTALL)
-                title = title_match.group(1).strip() if title_match else "Unknown"
-                
+            client = get_http_client()
+            response = await client.get(f"{self.arxiv_api}{arxiv_id}")
+            
+            if response.status_code != 200:
                 return {
-                    "verified": True,
-                    "confidence": 0.9,
-                    "reason": "✅ arXiv preprint found",
-                    "title": title,
-                    "arxiv_id": arxiv_id
+                    "verified": False,
+                    "confidence": 0.0,
+                    "reason": f"arXiv ID not found (Status: {response.status_code})"
                 }
-                
+            
+            # Parse XML response
+            content = response.text
+            
+            if "<title>" not in content or "entry" not in content:
+                return {
+                    "verified": False,
+                    "confidence": 0.1,
+                    "reason": "arXiv ID format invalid or paper not found"
+                }
+            
+            # Extract title (simple XML parsing)
+            title_match = re.search(r'<title>(.*?)</title>', content, re.DOTALL)
+            title = title_match.group(1).strip() if title_match else "Unknown"
+            
+            return {
+                "verified": True,
+                "confidence": 0.9,
+                "reason": "✅ arXiv preprint found",
+                "title": title,
+                "arxiv_id": arxiv_id
+            }
+            
         except Exception as e:
             logger.error(f"arXiv API error: {e}")
             return {
@@ -393,45 +382,42 @@ class AdvancedVerificationService:
     async def check_claim_source_alignment(
         self, 
         claim: str, 
-        source_abstract: str,
+        source_abstract: Union[str, ClaimSourceIndex],
         use_embeddings: bool = False
     ) -> Dict[str, Any]:
         """
         ADVANCED: Check if the abstract actually supports the numerical claim
         Example: Claim says "95% accuracy" but paper says "85% accuracy"
+        
+        Pass a ClaimSourceIndex instead of the abstract text to reuse the
+        indexed source across calls.
         """
         logger.info("Checking claim-source alignment")
         
-        # Extract numbers from claim
-        claim_numbers = re.findall(r'\b\d+(?:\.\d+)?%?\b', claim)
-        source_numbers = re.findall(r'\b\d+(?:\.\d+)?%?\b', source_abstract)
-        
-        # Simple keyword matching
-        claim_keywords = set(re.findall(r'\b[a-z]{4,}\b', claim.lower()))
-        source_keywords = set(re.findall(r'\b[a-z]{4,}\b', source_abstract.lower()))
-        
-        keyword_overlap = len(claim_keywords & source_keywords) / len(claim_keywords) if claim_keywords else 0
-        
-        flags = []
-        
-        # Check for numerical mismatches
-        if claim_numbers and source_numbers:
-            if not any(cn in source_numbers for cn in claim_numbers):
-                flags.append(f"🚩 STAT MISMATCH: Claim mentions {claim_numbers} but source has {source_numbers}")
-        
-        # Check keyword alignment
-        if keyword_overlap < 0.3:
-            flags.append(f"⚠️ LOW SEMANTIC OVERLAP: Only {keyword_overlap*100:.0f}% keyword match")
-        
-        similarity_score = keyword_overlap
+        results = await self.check_claims_source_alignment([claim], source_abstract)
+        return results[0]
+    
+    async def check_claims_source_alignment(
+        self,
+        claims: List[str],
+        source_abstract: Union[str, ClaimSourceIndex]
+    ) -> List[Dict[str, Any]]:
+        """
+        Check many claims that cite the same source
         
-        return {
-            "aligned": len(flags) == 0,
-            "confidence": similarity_score,
-            "similarity_score": round(similarity_score * 100, 1),
-            "flags": flags,
-            "reason": " | ".join(flags) if flags else f"✅ {similarity_score*100:.0f}% semantic alignment"
-        }
+        The source is tokenized and its numbers normalized once; claim
+        numbers are matched against it in one vectorized pass, within
+        CLAIM_NUMBER_REL_TOLERANCE / CLAIM_NUMBER_ABS_TOLERANCE.
+        """
+        index = (
+            source_abstract if isinstance(source_abstract, ClaimSourceIndex)
+            else ClaimSourceIndex(source_abstract)
+        )
+        return index.check_many(
+            claims,
+            rel_tol=settings.CLAIM_NUMBER_REL_TOLERANCE,
+            abs_tol=settings.CLAIM_NUMBER_ABS_TOLERANCE
+        )
     
     # ========== GEMINI SUGGESTION 5: Citation Graph Reputation ==========
     
@@ -444,50 +430,50 @@ class AdvancedVerificationService:
         logger.info(f"Checking citation network for DOI: {doi}")
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # OpenAlex requires DOI format: https://doi.org/10.xxxx/xxxxx
-                doi_url = f"https://doi.org/{doi}"
-                response = await client.get(
-                    f"{self.openalex_api}doi:{doi}",
-                    headers={"User-Agent": "Hallux/1.0 (mailto:hallux@example.com)"}
-                )
-                
-                if response.status_code != 200:
-                    return {
-                        "verified": False,
-                        "confidence": 0.3,
-                        "reason": "Paper not found in OpenAlex"
-                    }
-                
-                data = response.json()
-                
-                cited_by_count = data.get("cited_by_count", 0)
-                publication_year = data.get("publication_year")
-                authorships = len(data.get("authorships", []))
-                
-                # Calculate reputation score
-                reputation_flags = []
-                confidence = 0.5
-                
-                if cited_by_count > 50:
-                    reputation_flags.append(f"✅ Well-cited ({cited_by_count} citations)")
-                    confidence += 0.3
-                elif cited_by_count == 0 and publication_year and (datetime.now().year - publication_year) > 2:
-                    reputation_flags.append(f"⚠️ No citations after {datetime.now().year - publication_year} years")
-                    confidence -= 0.2
-                
-                if authorships == 0:
-                    reputation_flags.append("🚩 No authors listed (potential fake)")
-                    confidence -= 0.4
-                
+            client = get_http_client()
+            # OpenAlex requires DOI format: https://doi.org/10.xxxx/xxxxx
+            doi_url = f"https://doi.org/{doi}"
+            response = await client.get(
+                f"{self.openalex_api}doi:{doi}",
+                headers={"User-Agent": "Hallux/1.0 (mailto:hallux@example.com)"}
+            )
+            
+            if response.status_code != 200:
                 return {
-                    "verified": confidence > 0.5,
-                    "confidence": max(confidence, 0.1),
-                    "cited_by_count": cited_by_count,
-                    "reputation_flags": reputation_flags,
-                    "reason": " | ".join(reputation_flags)
+                    "verified": False,
+                    "confidence": 0.3,
+                    "reason": "Paper not found in OpenAlex"
                 }
-                
+            
+            data = response.json()
+            
+            cited_by_count = data.get("cited_by_count", 0)
+            publication_year = data.get("publication_year")
+            authorships = len(data.get("authorships", []))
+            
+            # Calculate reputation score
+            reputation_flags = []
+            confidence = 0.5
+            
+            if cited_by_count > 50:
+                reputation_flags.append(f"✅ Well-cited ({cited_by_count} citations)")
+                confidence += 0.3
+            elif cited_by_count == 0 and publication_year and (datetime.now().year - publication_year) > 2:
+                reputation_flags.append(f"⚠️ No citations after {datetime.now().year - publication_year} years")
+                confidence -= 0.2
+            
+            if authorships == 0:
+                reputation_flags.append("🚩 No authors listed (potential fake)")
+                confidence -= 0.4
+            
+            return {
+                "verified": confidence > 0.5,
+                "confidence": max(confidence, 0.1),
+                "cited_by_count": cited_by_count,
+                "reputation_flags": reputation_flags,
+                "reason": " | ".join(reputation_flags)
+            }
+            
         except Exception as e:
             logger.error(f"OpenAlex API error: {e}")
             return {
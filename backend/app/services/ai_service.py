@@ -3,50 +3,52 @@ AI Service for Citation Verification
 Integrates OpenAI GPT-4 and Google Gemini
 """
 
-from typing import Optional, Dict, Any
+import asyncio
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Optional, Dict, Any, List, Tuple
 from loguru import logger
-import os
 
-from app.core.config import Settings
+from app.core.cache import cache_service
+from app.core.config import settings
 from app.models.schemas import LayerResult, LayerStatus
+from app.services.llm_providers import LLMProvider, LLMProviderError, load_providers
+from app.services.llm_router import LLMRouter
 
-# Initialize settings
-settings = Settings()
+
+SYSTEM_PROMPT = (
+    "You are an expert academic citation verification system. Analyze citations for "
+    "credibility, validity, and potential hallucinations. Provide confidence scores between 0 and 1."
+)
+
+ANALYSIS_STEPS = """1. Evaluate if this citation appears legitimate or potentially fabricated
+2. Check for red flags (fake URLs, impossible dates, non-existent authors)
+3. Assess consistency between citation format and content
+4. Provide a confidence score (0.0 to 1.0) where:
+   - 0.9-1.0: Highly credible, verified citation
+   - 0.7-0.8: Likely valid, minor concerns
+   - 0.5-0.6: Suspicious, requires verification
+   - 0.0-0.4: Likely hallucinated or fabricated
+"""
 
 
 class AIService:
     """AI-powered citation analysis service"""
     
     def __init__(self):
-        self.openai_key = settings.OPENAI_API_KEY
-        self.google_key = settings.GOOGLE_API_KEY or settings.GEMINI_API_KEY
-        self.openai_client = None
-        self.gemini_model = None
-        
-        # Initialize OpenAI if key is available
-        if self.openai_key:
-            try:
-                from openai import AsyncOpenAI
-                self.openai_client = AsyncOpenAI(api_key=self.openai_key)
-                logger.info("✅ OpenAI client initialized")
-            except Exception as e:
-                logger.warning(f"OpenAI initialization failed: {e}")
-        
-        # Initialize Gemini if key is available
-        if self.google_key:
-            try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.google_key)
-                self.gemini_model = genai.GenerativeModel('gemini-pro')
-                logger.info("✅ Gemini client initialized")
-            except Exception as e:
-                logger.warning(f"Gemini initialization failed: {e}")
+        # Preference order (OpenAI, then Gemini) only breaks ties - the
+        # router sends each request to the healthiest provider
+        self.providers: List[LLMProvider] = load_providers()
+        self.router = LLMRouter(self.providers)
     
     async def analyze_citation_confidence(
         self,
         citation: str,
         context: Optional[str] = None,
-        verification_data: Optional[Dict[str, Any]] = None
+        verification_data: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
     ) -> LayerResult:
         """
         Use AI to analyze citation credibility and provide confidence score
@@ -55,137 +57,245 @@ class AIService:
             citation: The citation text to analyze
             context: Optional context where citation appears
             verification_data: Results from other verification layers
+            use_cache: Reuse a previous outcome for the same prompt (False forces a fresh call)
         
         Returns:
             LayerResult with AI confidence score and reasoning
         """
         
-        # Try OpenAI first, fallback to Gemini
-        if self.openai_client:
-            return await self._analyze_with_openai(citation, context, verification_data)
-        elif self.gemini_model:
-            return await self._analyze_with_gemini(citation, context, verification_data)
-        else:
+        if not self.providers:
             return LayerResult(
                 status=LayerStatus.SKIPPED,
                 details="AI analysis unavailable - no API keys configured",
                 confidence=None,
                 metadata={"reason": "No AI API keys found"}
             )
+        
+        return await self._analyze(citation, context, verification_data, use_cache)
     
-    async def _analyze_with_openai(
+    async def analyze_citations_batch(
+        self,
+        items: List[Dict[str, Any]],
+        use_cache: bool = True
+    ) -> List[LayerResult]:
+        """
+        Score several citations with one LLM request per LLM_BATCH_SIZE items
+        
+        Args:
+            items: Dicts with "citation" and optional "context" / "verification_data"
+            use_cache: Reuse previous outcomes (shared with single-citation calls)
+        
+        Returns:
+            One LayerResult per item, in input order. Items missing from an
+            unparseable batched response fall back to single-citation calls.
+        """
+        
+        if not self.providers:
+            return [
+                LayerResult(
+                    status=LayerStatus.SKIPPED,
+                    details="AI analysis unavailable - no API keys configured",
+                    confidence=None,
+                    metadata={"reason": "No AI API keys found"}
+                )
+                for _ in items
+            ]
+        
+        prompts = [
+            self._build_analysis_prompt(item["citation"], item.get("context"), item.get("verification_data"))
+            for item in items
+        ]
+        
+        results: List[Optional[LayerResult]] = [None] * len(items)
+        if use_cache and settings.LLM_CACHE_TTL > 0:
+            results = list(await asyncio.gather(*(self._get_cached_outcome(prompt) for prompt in prompts)))
+        
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            logger.info(f"🤖 Scoring {len(pending)}/{len(items)} citations in batches...")
+        
+        chunks = [pending[i:i + settings.LLM_BATCH_SIZE] for i in range(0, len(pending), settings.LLM_BATCH_SIZE)]
+        chunk_results = await asyncio.gather(*(
+            self._analyze_chunk([items[i] for i in chunk], [prompts[i] for i in chunk])
+            for chunk in chunks
+        ))
+        for chunk, scored in zip(chunks, chunk_results):
+            for i, result in zip(chunk, scored):
+                results[i] = result
+        
+        return results
+    
+    async def _analyze(
         self,
         citation: str,
         context: Optional[str],
-        verification_data: Optional[Dict[str, Any]]
+        verification_data: Optional[Dict[str, Any]],
+        use_cache: bool = True
     ) -> LayerResult:
-        """Analyze citation using OpenAI GPT-4"""
+        """Analyze citation with the healthiest provider"""
         
         try:
             # Build prompt with verification context
             prompt = self._build_analysis_prompt(citation, context, verification_data)
             
-            logger.info("🤖 Analyzing citation with OpenAI GPT-4...")
+            if use_cache and settings.LLM_CACHE_TTL > 0:
+                cached = await self._get_cached_outcome(prompt)
+                if cached is not None:
+                    logger.info(f"✅ {cached.metadata['provider']} analysis served from cache - Confidence: {cached.confidence:.2f}")
+                    return cached
             
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert academic citation verification system. Analyze citations for credibility, validity, and potential hallucinations. Provide confidence scores between 0 and 1."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=500,
-                temperature=0.3,
-            )
+            logger.info("🤖 Analyzing citation with AI...")
             
-            analysis = response.choices[0].message.content
+            response = await self.router.complete(SYSTEM_PROMPT, prompt, max_tokens=500)
+            analysis = response["text"]
             
             # Parse confidence score from response
             confidence = self._extract_confidence_score(analysis)
             
-            # Determine status based on confidence
-            if confidence >= 0.8:
-                status = LayerStatus.PASSED
-            elif confidence >= 0.5:
-                status = LayerStatus.WARNING
-            else:
-                status = LayerStatus.FAILED
+            logger.info(f"✅ {response['provider']} analysis complete - Confidence: {confidence:.2f} ({response['latency_ms']}ms)")
             
-            logger.info(f"✅ OpenAI analysis complete - Confidence: {confidence:.2f}")
+            metadata = self._response_metadata(response)
+            if response.get("tokens") is not None:
+                metadata["tokens"] = response["tokens"]
             
-            return LayerResult(
-                status=status,
-                details=analysis,
-                confidence=confidence,
-                metadata={
-                    "model": "gpt-4",
-                    "provider": "openai",
-                    "tokens": response.usage.total_tokens
-                }
-            )
+            return await self._store_outcome(prompt, analysis, confidence, metadata)
             
-        except Exception as e:
-            logger.error(f"OpenAI analysis error: {e}")
-            return LayerResult(
-                status=LayerStatus.WARNING,
-                details=f"AI analysis error: {str(e)}",
-                confidence=0.5,
-                metadata={"error": str(e)}
-            )
+        except LLMProviderError as e:
+            return self._error_result(e)
     
-    async def _analyze_with_gemini(
+    async def _analyze_chunk(
         self,
-        citation: str,
-        context: Optional[str],
-        verification_data: Optional[Dict[str, Any]]
-    ) -> LayerResult:
-        """Analyze citation using Google Gemini"""
+        items: List[Dict[str, Any]],
+        prompts: List[str]
+    ) -> List[LayerResult]:
+        """Score up to LLM_BATCH_SIZE citations with a single request"""
+        
+        if len(items) == 1:
+            item = items[0]
+            return [await self._analyze(
+                item["citation"], item.get("context"), item.get("verification_data"), use_cache=False
+            )]
         
         try:
-            # Build prompt with verification context
-            prompt = self._build_analysis_prompt(citation, context, verification_data)
-            
-            logger.info("🤖 Analyzing citation with Google Gemini...")
-            
-            response = self.gemini_model.generate_content(prompt)
-            analysis = response.text
-            
-            # Parse confidence score from response
-            confidence = self._extract_confidence_score(analysis)
-            
-            # Determine status based on confidence
-            if confidence >= 0.8:
-                status = LayerStatus.PASSED
-            elif confidence >= 0.5:
-                status = LayerStatus.WARNING
-            else:
-                status = LayerStatus.FAILED
-            
-            logger.info(f"✅ Gemini analysis complete - Confidence: {confidence:.2f}")
-            
-            return LayerResult(
-                status=status,
-                details=analysis,
-                confidence=confidence,
-                metadata={
-                    "model": "gemini-pro",
-                    "provider": "google"
-                }
+            response = await self.router.complete(
+                SYSTEM_PROMPT,
+                self._build_batch_prompt(items),
+                max_tokens=min(4096, 100 + 200 * len(items))
             )
-            
-        except Exception as e:
-            logger.error(f"Gemini analysis error: {e}")
-            return LayerResult(
-                status=LayerStatus.WARNING,
-                details=f"AI analysis error: {str(e)}",
-                confidence=0.5,
-                metadata={"error": str(e)}
+        except LLMProviderError as e:
+            return [self._error_result(e) for _ in items]
+        
+        scores = self._parse_batch_response(response["text"], len(items))
+        metadata = {**self._response_metadata(response), "batch_size": len(items)}
+        
+        results: List[Optional[LayerResult]] = []
+        for index, prompt in enumerate(prompts):
+            if index in scores:
+                confidence, reasoning = scores[index]
+                analysis = f"Confidence Score: {confidence:.2f}\n\nReasoning: {reasoning}"
+                results.append(await self._store_outcome(prompt, analysis, confidence, dict(metadata)))
+            else:
+                results.append(None)
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            logger.warning(f"⚠️ Batched response covered {len(items) - len(missing)}/{len(items)} citations - scoring the rest individually")
+            fallback = await asyncio.gather(*(
+                self._analyze(
+                    items[i]["citation"], items[i].get("context"), items[i].get("verification_data"),
+                    use_cache=False
+                )
+                for i in missing
+            ))
+            for i, result in zip(missing, fallback):
+                results[i] = result
+        else:
+            logger.info(f"✅ {response['provider']} batch analysis complete - {len(items)} citations in one request")
+        
+        return results
+    
+    async def _get_cached_outcome(self, prompt: str) -> Optional[LayerResult]:
+        """Previously parsed outcome for this prompt from any configured provider"""
+        keys = [self._outcome_cache_key(p.name, p.model, prompt) for p in self.router.ranked()]
+        for cached in await asyncio.gather(*(cache_service.get(key) for key in keys)):
+            if cached is not None:
+                return LayerResult(
+                    status=LayerStatus(cached["status"]),
+                    details=cached["details"],
+                    confidence=cached["confidence"],
+                    metadata={**cached["metadata"], "cached": True}
+                )
+        return None
+    
+    async def _store_outcome(
+        self,
+        prompt: str,
+        analysis: str,
+        confidence: float,
+        metadata: Dict[str, Any]
+    ) -> LayerResult:
+        """Turn a parsed confidence into a LayerResult and cache it"""
+        
+        # Determine status based on confidence
+        if confidence >= 0.8:
+            status = LayerStatus.PASSED
+        elif confidence >= 0.5:
+            status = LayerStatus.WARNING
+        else:
+            status = LayerStatus.FAILED
+        
+        # Cache the parsed outcome, not the raw response
+        if settings.LLM_CACHE_TTL > 0:
+            await cache_service.set(
+                self._outcome_cache_key(metadata["provider"], metadata["model"], prompt),
+                {"status": status.value, "details": analysis, "confidence": confidence, "metadata": metadata},
+                ttl=settings.LLM_CACHE_TTL
             )
+        
+        return LayerResult(
+            status=status,
+            details=analysis,
+            confidence=confidence,
+            metadata=metadata
+        )
+    
+    @staticmethod
+    def _response_metadata(response: Dict[str, Any]) -> Dict[str, Any]:
+        """Layer metadata describing which provider answered and how fast"""
+        metadata = {
+            "model": response["model"],
+            "provider": response["provider"],
+            "latency_ms": response["latency_ms"],
+        }
+        if response["failed_over"]:
+            metadata["failed_over"] = response["failed_over"]
+        return metadata
+    
+    @staticmethod
+    def _error_result(error: Exception) -> LayerResult:
+        logger.error(f"AI analysis error: {error}")
+        return LayerResult(
+            status=LayerStatus.WARNING,
+            details=f"AI analysis error: {str(error)}",
+            confidence=0.5,
+            metadata={"error": str(error)}
+        )
+    
+    @staticmethod
+    def _outcome_cache_key(provider: str, model: str, prompt: str) -> str:
+        """
+        Cache key for a parsed outcome: provider, model and a hash of the
+        normalized prompt (Unicode NFC, whitespace collapsed), which covers
+        the citation, context and layer summaries
+        """
+        normalized = re.sub(r"\s+", " ", unicodedata.normalize("NFC", f"{SYSTEM_PROMPT}\n{prompt}")).strip()
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return f"llm:{provider}:{model}:{digest}"
+    
+    def close(self):
+        """Release provider resources (called on application shutdown)"""
+        for provider in self.providers:
+            provider.close()
     
     def _build_analysis_prompt(
         self,
@@ -195,50 +305,102 @@ class AIService:
     ) -> str:
         """Build detailed prompt for AI analysis"""
         
-        prompt = f"""Analyze this citation for credibility and potential AI hallucination:
+        prompt = "Analyze this citation for credibility and potential AI hallucination:\n"
+        prompt += self._build_citation_sections(citation, context, verification_data)
+        prompt += f"""
+**Analysis Required:**
+{ANALYSIS_STEPS}
+**Response Format:**
+Confidence Score: [0.0-1.0]
 
+Reasoning: [Your detailed analysis explaining the confidence score, red flags, and verification status]
+"""
+        
+        return prompt
+    
+    def _build_batch_prompt(self, items: List[Dict[str, Any]]) -> str:
+        """Build one prompt covering several citations, answered as a JSON array"""
+        
+        prompt = f"Analyze each of these {len(items)} citations for credibility and potential AI hallucination:\n"
+        for number, item in enumerate(items, start=1):
+            prompt += f"\n### Citation {number}\n"
+            prompt += self._build_citation_sections(item["citation"], item.get("context"), item.get("verification_data"))
+        
+        prompt += f"""
+**Analysis Required (for each citation):**
+{ANALYSIS_STEPS}
+**Response Format:**
+Respond with only a JSON array containing one object per citation, in order:
+[{{"id": 1, "confidence": 0.0-1.0, "reasoning": "Brief analysis explaining the score and any red flags"}}]
+"""
+        
+        return prompt
+    
+    def _build_citation_sections(
+        self,
+        citation: str,
+        context: Optional[str],
+        verification_data: Optional[Dict[str, Any]]
+    ) -> str:
+        """Citation, context and layer-summary sections shared by both prompts"""
+        
+        sections = f"""
 **Citation:**
 {citation}
 """
         
         if context:
-            prompt += f"""
+            sections += f"""
 **Context:**
 {context}
 """
         
         if verification_data:
-            prompt += f"""
+            sections += f"""
 **Technical Verification Results:**
 - URL Status: {verification_data.get('url_status', 'N/A')}
 - Metadata Check: {verification_data.get('metadata_status', 'N/A')}
 - Content Match: {verification_data.get('content_confidence', 'N/A')}
 """
         
-        prompt += """
-**Analysis Required:**
-1. Evaluate if this citation appears legitimate or potentially fabricated
-2. Check for red flags (fake URLs, impossible dates, non-existent authors)
-3. Assess consistency between citation format and content
-4. Provide a confidence score (0.0 to 1.0) where:
-   - 0.9-1.0: Highly credible, verified citation
-   - 0.7-0.8: Likely valid, minor concerns
-   - 0.5-0.6: Suspicious, requires verification
-   - 0.0-0.4: Likely hallucinated or fabricated
-
-**Response Format:**
-Confidence Score: [0.0-1.0]
-
-Reasoning: [Your detailed analysis explaining the confidence score, red flags, and verification status]
-"""
+        return sections
+    
+    def _parse_batch_response(self, analysis: str, count: int) -> Dict[int, Tuple[float, str]]:
+        """
+        Per-item (confidence, reasoning) from a batched response, keyed by
+        0-based position; malformed or missing entries are left out
+        """
         
-        return prompt
+        match = re.search(r"\[.*\]", analysis, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            entries = json.loads(match.group(0))
+        except ValueError:
+            return {}
+        if not isinstance(entries, list):
+            return {}
+        
+        scores = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry["id"]) - 1
+                score = float(entry["confidence"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= index < count:
+                continue
+            if score > 1.0:
+                score = score / 100.0  # Handle percentage format
+            scores[index] = (max(0.0, min(1.0, score)), str(entry.get("reasoning", "")).strip())
+        
+        return scores
     
     def _extract_confidence_score(self, analysis: str) -> float:
         """Extract confidence score from AI response"""
         
-        import re
-        
         # Look for "Confidence Score: 0.85" pattern
         score_match = re.search(r'[Cc]onfidence\s+[Ss]core:\s*(\d+\.?\d*)', analysis)
         
@@ -0,0 +1,232 @@
+"""
+Claim-Source Alignment
+Indexes a source text once (keywords and normalized quantities) so many
+claims can be checked against it with vectorized number matching
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# 1,200 | 3.5 | .95 followed by an optional scale word and unit
+_QUANTITY = re.compile(
+    r"(?<![\w.])(?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+)"
+    r"(?:\s*(?P<scale>thousand|million|billion|[kKMB])\b)?"
+    r"(?:\s*-?\s*(?P<unit>%|percent\b|per\s+cent\b|percentage\s+points?\b|pp\b|"
+    r"x\b|times\b|fold\b|ms\b|milliseconds?\b|s\b|sec\b|seconds?\b|min\b|minutes?\b|"
+    r"h\b|hours?\b|days?\b|kb\b|mb\b|gb\b|tb\b))?",
+    re.IGNORECASE,
+)
+_KEYWORD = re.compile(r"\b[a-z]{4,}\b")
+
+_MATCH_BLOCK_ROWS = 1024  # Claim numbers per broadcast - bounds the distance matrix
+
+_SCALES = {"thousand": 1e3, "k": 1e3, "million": 1e6, "m": 1e6, "billion": 1e9, "b": 1e9}
+
+# Unit spelling -> (canonical unit, factor to the canonical unit)
+_UNITS = {
+    "%": ("%", 1.0), "percent": ("%", 1.0), "per cent": ("%", 1.0),
+    "percentage point": ("pp", 1.0), "percentage points": ("pp", 1.0), "pp": ("pp", 1.0),
+    "x": ("x", 1.0), "times": ("x", 1.0), "fold": ("x", 1.0),
+    "ms": ("s", 1e-3), "millisecond": ("s", 1e-3), "milliseconds": ("s", 1e-3),
+    "s": ("s", 1.0), "sec": ("s", 1.0), "second": ("s", 1.0), "seconds": ("s", 1.0),
+    "min": ("s", 60.0), "minute": ("s", 60.0), "minutes": ("s", 60.0),
+    "h": ("s", 3600.0), "hour": ("s", 3600.0), "hours": ("s", 3600.0),
+    "day": ("s", 86400.0), "days": ("s", 86400.0),
+    "kb": ("bytes", 1e3), "mb": ("bytes", 1e6), "gb": ("bytes", 1e9), "tb": ("bytes", 1e12),
+}
+
+
+def extract_quantities(text: str) -> List[Dict[str, Any]]:
+    """
+    Numbers in text, normalized to a canonical unit
+
+    Returns:
+        List of {
+            "raw": str,  # As written, e.g. "1.2 million", "95 percent"
+            "value": float,  # In the canonical unit
+            "unit": str,  # "%", "pp", "x", "s", "bytes" or "" (plain number)
+            "precision": float,  # Half a unit of the last written digit
+            "start": int,
+            "end": int
+        }
+    """
+    quantities = []
+    for match in _QUANTITY.finditer(text):
+        number = match.group("number").replace(",", "")
+        decimals = len(number.split(".")[1]) if "." in number else 0
+
+        factor = 1.0
+        scale = match.group("scale")
+        if scale:
+            # "B"/"M"/"k" only count as scales right after the number (5M, 2k)
+            if len(scale) == 1 and match.start("scale") != match.end("number"):
+                scale = None
+            else:
+                factor = _SCALES[scale.lower()]
+
+        unit = ""
+        spelled = match.group("unit")
+        if spelled:
+            unit, unit_factor = _UNITS[" ".join(spelled.lower().split())]
+            factor *= unit_factor
+
+        end = match.end() if (spelled or scale) else match.end("number")
+        quantities.append({
+            "raw": text[match.start():end],
+            "value": float(number) * factor,
+            "unit": unit,
+            "precision": 0.5 * 10.0 ** -decimals * factor,
+            "start": match.start(),
+            "end": end,
+        })
+    return quantities
+
+
+class ClaimSourceIndex:
+    """
+    One source text (e.g. a paper abstract), prepared for claim checks
+
+    Holds the source's keyword set and its quantities as per-unit numpy
+    arrays of values, precisions and positions. Build it once per source
+    and reuse it for every claim that cites that source.
+
+    Two numbers agree when their units match and they differ by no more
+    than the coarser of the two written precisions ("95%" covers 94.5-95.5),
+    widened by ``rel_tol`` of the larger value and ``abs_tol``.
+    """
+
+    def __init__(self, source_text: str):
+        self.source_text = source_text
+        self.keywords = set(_KEYWORD.findall(source_text.lower()))
+        self.quantities = extract_quantities(source_text)
+        self._source_numbers = str([q["raw"] for q in self.quantities])
+
+        self._by_unit: Dict[str, Dict[str, np.ndarray]] = {}
+        for unit in {q["unit"] for q in self.quantities}:
+            members = [i for i, q in enumerate(self.quantities) if q["unit"] == unit]
+            self._by_unit[unit] = {
+                "index": np.array(members),
+                "value": np.array([self.quantities[i]["value"] for i in members]),
+                "precision": np.array([self.quantities[i]["precision"] for i in members]),
+            }
+
+    def match_quantities(
+        self,
+        quantities: List[Dict[str, Any]],
+        rel_tol: float = 0.0,
+        abs_tol: float = 0.0,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Closest agreeing source quantity for each given quantity (or None)
+
+        Quantities of one unit are compared against all source values of
+        that unit in broadcast blocks of up to 1024 rows.
+        """
+        matches: List[Optional[Dict[str, Any]]] = [None] * len(quantities)
+
+        for unit in {q["unit"] for q in quantities}:
+            source = self._by_unit.get(unit)
+            if source is None:
+                continue
+            members = [i for i, q in enumerate(quantities) if q["unit"] == unit]
+            for block in range(0, len(members), _MATCH_BLOCK_ROWS):
+                rows = members[block:block + _MATCH_BLOCK_ROWS]
+                for i, column in zip(rows, self._closest(source, [quantities[i] for i in rows], rel_tol, abs_tol)):
+                    if column is not None:
+                        matches[i] = self.quantities[int(source["index"][column])]
+
+        return matches
+
+    @staticmethod
+    def _closest(
+        source: Dict[str, np.ndarray],
+        quantities: List[Dict[str, Any]],
+        rel_tol: float,
+        abs_tol: float,
+    ) -> List[Optional[int]]:
+        """Column of the closest agreeing source value per quantity"""
+        values = np.array([q["value"] for q in quantities])
+        precisions = np.array([q["precision"] for q in quantities])
+
+        distance = np.abs(values[:, None] - source["value"][None, :])
+        tolerance = np.maximum(
+            np.maximum(precisions[:, None], source["precision"][None, :]),
+            rel_tol * np.maximum(np.abs(values)[:, None], np.abs(source["value"])[None, :]),
+        )
+        np.maximum(tolerance, abs_tol, out=tolerance)
+        # Non-agreeing pairs can't be the closest
+        distance[distance > tolerance] = np.inf
+        closest = distance.argmin(axis=1)
+        found = np.isfinite(distance[np.arange(len(quantities)), closest])
+        return [int(column) if ok else None for column, ok in zip(closest, found)]
+
+    def check(self, claim: str, rel_tol: float = 0.0, abs_tol: float = 0.0) -> Dict[str, Any]:
+        """Check one claim (see check_many)"""
+        return self.check_many([claim], rel_tol, abs_tol)[0]
+
+    def check_many(
+        self,
+        claims: List[str],
+        rel_tol: float = 0.0,
+        abs_tol: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Check claims against the source
+
+        Returns, per claim:
+            {
+                "aligned": bool,
+                "confidence": float,  # Keyword overlap, 0-1
+                "similarity_score": float,  # Same, as a percentage
+                "flags": List[str],
+                "reason": str,
+                "numbers": {
+                    "matched": [{"claim": str, "source": str, "position": int}],
+                    "unmatched": [str]  # Claim numbers the source doesn't state
+                }
+            }
+        """
+        per_claim = [extract_quantities(claim) for claim in claims]
+        flat = [q for quantities in per_claim for q in quantities]
+        flat_matches = self.match_quantities(flat, rel_tol, abs_tol)
+
+        results = []
+        cursor = 0
+        for claim, quantities in zip(claims, per_claim):
+            matches = flat_matches[cursor:cursor + len(quantities)]
+            cursor += len(quantities)
+
+            claim_keywords = set(_KEYWORD.findall(claim.lower()))
+            keyword_overlap = len(claim_keywords & self.keywords) / len(claim_keywords) if claim_keywords else 0
+
+            flags = []
+
+            # Check for numerical mismatches
+            if quantities and self.quantities and not any(matches):
+                flags.append(
+                    f"🚩 STAT MISMATCH: Claim mentions {[q['raw'] for q in quantities]} "
+                    f"but source has {self._source_numbers}"
+                )
+
+            # Check keyword alignment
+            if keyword_overlap < 0.3:
+                flags.append(f"⚠️ LOW SEMANTIC OVERLAP: Only {keyword_overlap*100:.0f}% keyword match")
+
+            results.append({
+                "aligned": len(flags) == 0,
+                "confidence": keyword_overlap,
+                "similarity_score": round(keyword_overlap * 100, 1),
+                "flags": flags,
+                "reason": " | ".join(flags) if flags else f"✅ {keyword_overlap*100:.0f}% semantic alignment",
+                "numbers": {
+                    "matched": [
+                        {"claim": q["raw"], "source": m["raw"], "position": m["start"]}
+                        for q, m in zip(quantities, matches) if m
+                    ],
+                    "unmatched": [q["raw"] for q, m in zip(quantities, matches) if not m],
+                },
+            })
+
+        return results
@@ -0,0 +1,126 @@
+"""
+Main-text Extraction for Scraped Pages
+Single-pass lxml walk that pulls the abstract and article body out of publisher HTML
+"""
+
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+
+# Boilerplate elements removed before text extraction
+_STRIP_TAGS = frozenset({"script", "style", "nav", "header", "footer", "aside"})
+
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8", remove_comments=True)
+
+
+def _abstract_rank(tag: str, classes: str, element_id: str) -> Optional[int]:
+    """
+    Priority of an element as the abstract (lower wins), mirroring the selectors
+    section.abstract, div.abstract, div[class*=abstract], p[class*=abstract],
+    section[id*=abstract]
+    """
+    if tag == "section" and "abstract" in classes.split():
+        return 0
+    if tag == "div" and "abstract" in classes.split():
+        return 1
+    if tag == "div" and "abstract" in classes:
+        return 2
+    if tag == "p" and "abstract" in classes:
+        return 3
+    if tag == "section" and "abstract" in element_id:
+        return 4
+    return None
+
+
+def _main_rank(tag: str, classes: str) -> Optional[int]:
+    """
+    Priority of an element as the main text (lower wins), mirroring the selectors
+    article, main, div[class*=content], div[class*=article], section[class*=body]
+    """
+    if tag == "article":
+        return 0
+    if tag == "main":
+        return 1
+    if tag == "div" and "content" in classes:
+        return 2
+    if tag == "div" and "article" in classes:
+        return 3
+    if tag == "section" and "body" in classes:
+        return 4
+    return None
+
+
+def _text(element, separator: str = " ") -> str:
+    """Stripped text fragments of an element joined by separator"""
+    return separator.join(
+        fragment.strip() for fragment in element.itertext() if fragment.strip()
+    )
+
+
+def extract_article_text(html: str) -> str:
+    """
+    Extract abstract + main text from an HTML page
+
+    Parses the page once with lxml and classifies every element in a single
+    document-order walk, so the boilerplate removal and every abstract/main
+    selector are resolved without re-scanning the tree.
+
+    This is CPU-bound and synchronous; call it through
+    ``app.core.executors.run_in_process`` from async code.
+
+    Returns:
+        Abstract followed by main text (empty string if nothing usable)
+    """
+    if not html or not html.strip():
+        return ""
+
+    try:
+        root = lxml.html.fromstring(html.encode("utf-8", errors="replace"), parser=_HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return ""
+
+    to_drop = []
+    paragraphs = []
+    abstract, abstract_rank = None, None
+    main, main_rank = None, None
+
+    # Pre-order walk; boilerplate subtrees are never descended into, so
+    # nothing inside them can be picked as abstract/main
+    stack = [root]
+    while stack:
+        element = stack.pop()
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue
+        if tag in _STRIP_TAGS:
+            to_drop.append(element)
+            continue
+
+        classes = element.get("class", "")
+        rank = _abstract_rank(tag, classes, element.get("id", ""))
+        if rank is not None and (abstract_rank is None or rank < abstract_rank):
+            abstract, abstract_rank = element, rank
+
+        rank = _main_rank(tag, classes)
+        if rank is not None and (main_rank is None or rank < main_rank):
+            main, main_rank = element, rank
+
+        if tag == "p":
+            paragraphs.append(element)
+
+        stack.extend(reversed(element))
+
+    for element in to_drop:
+        if element.getparent() is not None:
+            element.drop_tree()
+
+    abstract_text = _text(abstract) if abstract is not None else ""
+
+    main_text = _text(main) if main is not None else ""
+
+    if not main_text:
+        # Fallback: use all paragraph text
+        main_text = " ".join(_text(p, separator="") for p in paragraphs)
+
+    return f"{abstract_text} {main_text}".strip()
@@ -4,12 +4,19 @@ Handles PDF, DOCX, images with OCR
 Extracts text for citation verification
 """
 
-import os
-import io
-from typing import Optional, List, Dict, Any
+import asyncio
+import math
+import mmap
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Tuple, Callable, Awaitable
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
 from pathlib import Path
 
+from app.core.config import settings
+from app.core.executors import process_pool_workers, run_in_process
+
 # Optional python-magic (may not work on Windows without libmagic)
 try:
     import magic
@@ -21,7 +28,7 @@ except ImportError:
 # Document processing libraries
 try:
     import PyPDF2
-    from pdf2image import convert_from_bytes
+    from pdf2image import convert_from_path
     HAS_PDF = True
 except ImportError:
     HAS_PDF = False
@@ -43,6 +50,10 @@ except ImportError:
     logger.warning("OCR libraries not available")
 
 
+# Receives (page_number, page_text) as soon as a page's text is ready
+PageCallback = Callable[[int, str], Awaitable[None]]
+
+
 class DocumentProcessor:
     """Process various document formats and extract text"""
     
@@ -54,21 +65,27 @@ class DocumentProcessor:
     }
     
     def __init__(self):
-        self.max_file_size = 10 * 1024 * 1024  # 10MB
+        self.max_file_size = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
         
-    async def process_document(
+    async def process_file(
         self,
-        file_content: bytes,
+        file_path: Path,
         filename: str,
-        enable_ocr: bool = True
+        enable_ocr: bool = True,
+        on_page: Optional[PageCallback] = None
     ) -> Dict[str, Any]:
         """
         Process uploaded document and extract text
         
+        The file is read where it lies - PDF workers memory-map it instead
+        of receiving a copy, so large scans don't multiply per worker.
+        
         Args:
-            file_content: Raw file bytes
+            file_path: Document on local disk
             filename: Original filename
             enable_ocr: Whether to use OCR for images/scanned PDFs
+            on_page: Called with each page's text as soon as it's ready
+                (every PDF page in order; other formats once, as page 1)
             
         Returns:
             Dict with extracted text and metadata
@@ -76,7 +93,7 @@ class DocumentProcessor:
         logger.info(f"Processing document: {filename}")
         
         # Check file size
-        if len(file_content) > self.max_file_size:
+        if file_path.stat().st_size > self.max_file_size:
             raise ValueError(f"File too large. Max size: {self.max_file_size / 1024 / 1024}MB")
         
         # Detect file type
@@ -84,22 +101,27 @@ class DocumentProcessor:
         
         # Extract text based on file type
         if file_ext == '.pdf':
-            return await self._process_pdf(file_content, enable_ocr)
+            return await self._process_pdf(file_path, enable_ocr, on_page)
         elif file_ext in ['.docx', '.doc']:
-            return await self._process_docx(file_content)
+            result = await self._process_docx(file_path)
         elif file_ext in ['.jpg', '.jpeg', '.png', '.tiff', '.bmp']:
-            return await self._process_image(file_content)
+            result = await self._process_image(file_path)
         elif file_ext in ['.txt', '.md']:
-            return await self._process_text(file_content)
+            result = await self._process_text(file_path)
         else:
             raise ValueError(f"Unsupported file format: {file_ext}")
+        
+        if on_page and result["text"]:
+            await on_page(1, result["text"])
+        return result
     
     async def _process_pdf(
         self,
-        file_content: bytes,
-        enable_ocr: bool
+        file_path: Path,
+        enable_ocr: bool,
+        on_page: Optional[PageCallback] = None
     ) -> Dict[str, Any]:
-        """Extract text from PDF, with OCR fallback for scanned PDFs"""
+        """Extract text from PDF, with OCR for pages that have no text layer"""
         
         if not HAS_PDF:
             raise ImportError("PyPDF2 not installed. Run: pip install PyPDF2")
@@ -107,28 +129,62 @@ class DocumentProcessor:
         logger.info("Extracting text from PDF...")
         
         try:
-            # Try regular text extraction first
-            pdf_file = io.BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            # Parsing runs in the CPU pool - never on the event loop
+            page_count = await run_in_process(_pdf_page_count, str(file_path))
+            page_texts, pages_extracted = await self._extract_pdf_pages(file_path, page_count)
+            truncated = pages_extracted < page_count
+            
+            # Scanned pages have no (or a junk) text layer
+            scanned_pages = {
+                page_num for page_num, page_text in enumerate(page_texts)
+                if len(page_text.strip()) < settings.OCR_MIN_PAGE_CHARS
+            }
+            
+            run_ocr = bool(scanned_pages) and enable_ocr and HAS_OCR
+            
+            # Every page goes to on_page in order, once it and all earlier pages
+            # are final; pages OCR doesn't run on (or fails for) keep their raw text
+            final = [not run_ocr or page_num not in scanned_pages for page_num in range(len(page_texts))]
+            next_page = 0
             
-            text = ""
-            page_count = len(pdf_reader.pages)
+            async def release():
+                nonlocal next_page
+                while next_page < len(page_texts) and final[next_page]:
+                    if on_page:
+                        await on_page(next_page + 1, page_texts[next_page])
+                    next_page += 1
             
-            for page_num, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
-                    logger.debug(f"Extracted text from page {page_num + 1}/{page_count}")
+            async def ocr_done(page_number: int, page_text: str):
+                page_texts[page_number - 1] = page_text
+                final[page_number - 1] = True
+                await release()
             
-            # If no text extracted and OCR enabled, try OCR
-            if not text.strip() and enable_ocr and HAS_OCR:
-                logger.info("No text found, attempting OCR...")
-                text = await self._ocr_pdf(file_content)
+            await release()
+            
+            ocr_pages = 0
+            if run_ocr:
+                logger.info(f"Running OCR on {len(scanned_pages)}/{page_count} pages without a text layer...")
+                ocr_texts = await self._ocr_pdf_pages(file_path, sorted(scanned_pages), ocr_done)
+                ocr_pages = len(ocr_texts)
+                final = [True] * len(page_texts)
+                await release()
+            
+            text = "\n\n".join(page_text for page_text in page_texts if page_text.strip())
+            
+            if not ocr_pages:
+                method = "text_extraction"
+            elif ocr_pages == len(page_texts):
+                method = "ocr"
+            else:
+                method = "text_extraction+ocr"
             
             return {
                 "text": text.strip(),
                 "pages": page_count,
-                "method": "ocr" if not text.strip() else "text_extraction",
+                "pages_extracted": pages_extracted,
+                "pages_ocr": ocr_pages,
+                "truncated": truncated,
+                "method": method,
                 "success": bool(text.strip())
             }
             
@@ -136,31 +192,110 @@ class DocumentProcessor:
             logger.error(f"PDF processing error: {e}")
             raise ValueError(f"Failed to process PDF: {str(e)}")
     
-    async def _ocr_pdf(self, file_content: bytes) -> str:
-        """OCR scanned PDF pages"""
+    async def _extract_pdf_pages(
+        self,
+        file_path: Path,
+        page_count: int
+    ) -> Tuple[List[str], int]:
+        """
+        Extract page texts with page ranges spread over the CPU pool
+        
+        The whole document shares one time budget (PDF_EXTRACTION_TIME_BUDGET):
+        workers stop between pages once it has passed, and ranges still
+        queued are cancelled. Pages are returned in order up to the first
+        page that wasn't reached.
+        
+        Returns:
+            (page_texts, pages_extracted)
+        """
+        if page_count == 0:
+            return [], 0
+        
+        pages_per_range = max(
+            settings.PDF_MIN_PAGES_PER_WORKER,
+            math.ceil(page_count / process_pool_workers())
+        )
+        ranges = [
+            (start, min(start + pages_per_range, page_count))
+            for start in range(0, page_count, pages_per_range)
+        ]
+        deadline = time.time() + settings.PDF_EXTRACTION_TIME_BUDGET
+        
+        tasks = [
+            asyncio.ensure_future(run_in_process(_extract_pdf_page_range, str(file_path), start, end, deadline))
+            for start, end in ranges
+        ]
+        # Small grace so workers can return what they have at the deadline
+        done, pending = await asyncio.wait(tasks, timeout=settings.PDF_EXTRACTION_TIME_BUDGET + 1.0)
+        for task in pending:
+            task.cancel()
+        
+        page_texts: List[str] = []
+        for (start, end), task in zip(ranges, tasks):
+            if task not in done or task.exception() is not None:
+                if task in done:
+                    logger.warning(f"⚠️ PDF pages {start + 1}-{end} failed: {task.exception()}")
+                break
+            range_texts = task.result()
+            page_texts.extend(range_texts)
+            if len(range_texts) < end - start:
+                break
+        
+        if len(page_texts) < page_count:
+            logger.warning(f"⚠️ PDF extraction stopped after {len(page_texts)}/{page_count} pages")
+        logger.debug(f"Extracted text from {len(page_texts)}/{page_count} pages in {len(ranges)} ranges")
+        
+        return page_texts, len(page_texts)
+    
+    async def _ocr_pdf_pages(
+        self,
+        file_path: Path,
+        page_numbers: List[int],
+        on_page: Optional[PageCallback] = None
+    ) -> Dict[int, str]:
+        """
+        OCR selected PDF pages (0-based) across the CPU pool
         
+        Each task renders a single page at OCR_DPI and OCRs it, so memory
+        holds one bitmap per worker rather than the whole document. Pages
+        are reported to `on_page` as they finish, blank ones included. Pages
+        not done within OCR_TIME_BUDGET are skipped.
+        
+        Returns:
+            OCR text by page number
+        """
         if not HAS_OCR:
             raise ImportError("OCR libraries not installed. Run: pip install pytesseract pillow pdf2image")
         
-        logger.info("Running OCR on PDF pages...")
-        
+        tasks = [
+            asyncio.ensure_future(run_in_process(_ocr_pdf_page, str(file_path), page_num, settings.OCR_DPI))
+            for page_num in page_numbers
+        ]
+        ocr_texts: Dict[int, str] = {}
         try:
-            # Convert PDF to images
-            images = convert_from_bytes(file_content)
-            
-            text = ""
-            for i, image in enumerate(images):
-                logger.debug(f"OCR on page {i + 1}/{len(images)}")
-                page_text = pytesseract.image_to_string(image)
-                text += page_text + "\n\n"
-            
-            return text
-            
-        except Exception as e:
-            logger.error(f"OCR error: {e}")
-            return ""
+            for task in asyncio.as_completed(tasks, timeout=settings.OCR_TIME_BUDGET):
+                try:
+                    page_num, page_text = await task
+                except asyncio.TimeoutError:
+                    raise
+                except Exception as e:
+                    logger.error(f"OCR error: {e}")
+                    continue
+                
+                logger.debug(f"OCR done for page {page_num + 1}")
+                ocr_texts[page_num] = page_text
+                if on_page:
+                    await on_page(page_num + 1, page_text)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ OCR time budget exceeded - {len(ocr_texts)}/{len(page_numbers)} pages done")
+        finally:
+            # Drop pages still queued
+            for task in tasks:
+                task.cancel()
+        
+        return ocr_texts
     
-    async def _process_docx(self, file_content: bytes) -> Dict[str, Any]:
+    async def _process_docx(self, file_path: Path) -> Dict[str, Any]:
         """Extract text from DOCX files"""
         
         if not HAS_DOCX:
@@ -169,20 +304,12 @@ class DocumentProcessor:
         logger.info("Extracting text from DOCX...")
         
         try:
-            docx_file = io.BytesIO(file_content)
-            doc = Document(docx_file)
-            
-            # Extract paragraphs
-            text = "\n\n".join([para.text for para in doc.paragraphs if para.text])
-            
-            # Extract tables
-            for table in doc.tables:
-                for row in table.rows:
-                    text += "\n" + "\t".join([cell.text for cell in row.cells])
+            # Parsing runs in the CPU pool - never on the event loop
+            text, paragraphs = await run_in_process(_docx_text, str(file_path))
             
             return {
                 "text": text.strip(),
-                "paragraphs": len(doc.paragraphs),
+                "paragraphs": paragraphs,
                 "method": "docx_extraction",
                 "success": bool(text.strip())
             }
@@ -191,7 +318,7 @@ class DocumentProcessor:
             logger.error(f"DOCX processing error: {e}")
             raise ValueError(f"Failed to process DOCX: {str(e)}")
     
-    async def _process_image(self, file_content: bytes) -> Dict[str, Any]:
+    async def _process_image(self, file_path: Path) -> Dict[str, Any]:
         """Extract text from image using OCR"""
         
         if not HAS_OCR:
@@ -200,12 +327,11 @@ class DocumentProcessor:
         logger.info("Running OCR on image...")
         
         try:
-            image = Image.open(io.BytesIO(file_content))
-            text = pytesseract.image_to_string(image)
+            text, dimensions = await run_in_process(_image_text, str(file_path))
             
             return {
                 "text": text.strip(),
-                "dimensions": image.size,
+                "dimensions": dimensions,
                 "method": "ocr",
                 "success": bool(text.strip())
             }
@@ -214,35 +340,103 @@ class DocumentProcessor:
             logger.error(f"Image OCR error: {e}")
             raise ValueError(f"Failed to process image: {str(e)}")
     
-    async def _process_text(self, file_content: bytes) -> Dict[str, Any]:
+    async def _process_text(self, file_path: Path) -> Dict[str, Any]:
         """Extract text from plain text files"""
         
         logger.info("Reading text file...")
         
+        # Uploads can be large - read and decode on a worker thread
+        text, encoding = await run_in_threadpool(_read_text_file, str(file_path))
+        result = {
+            "text": text.strip(),
+            "method": "text_file",
+            "success": bool(text.strip())
+        }
+        if encoding != "utf-8":
+            result["encoding"] = encoding
+        return result
+
+
+@contextmanager
+def _open_pdf(pdf_path: str):
+    """
+    PdfReader over a read-only memory map of the file
+    
+    Pool workers map the same file, so its pages are shared through the OS
+    page cache instead of each worker holding a copy.
+    """
+    with open(pdf_path, "rb") as pdf_file, mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield PyPDF2.PdfReader(mapped)
+
+
+def _pdf_page_count(pdf_path: str) -> int:
+    """Number of pages in a PDF (runs in a pool worker)"""
+    with _open_pdf(pdf_path) as pdf_reader:
+        return len(pdf_reader.pages)
+
+
+def _extract_pdf_page_range(
+    pdf_path: str,
+    start: int,
+    end: int,
+    deadline: float
+) -> List[str]:
+    """
+    Text of pages [start, end) (runs in a pool worker)
+    
+    Stops early once `deadline` (wall-clock time) has passed, so the
+    result may hold fewer pages than requested.
+    """
+    page_texts = []
+    with _open_pdf(pdf_path) as pdf_reader:
+        for page_num in range(start, end):
+            if time.time() > deadline:
+                break
+            page_texts.append(pdf_reader.pages[page_num].extract_text() or "")
+    return page_texts
+
+
+def _read_text_file(path: str) -> Tuple[str, str]:
+    """(text, encoding) of a text file: UTF-8, else the first single-byte encoding that fits"""
+    with open(path, "rb") as text_file:
+        content = text_file.read()
+    for encoding in ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']:
         try:
-            text = file_content.decode('utf-8')
-            
-            return {
-                "text": text.strip(),
-                "method": "text_file",
-                "success": bool(text.strip())
-            }
-            
+            return content.decode(encoding), encoding
         except UnicodeDecodeError:
-            # Try different encodings
-            for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-                try:
-                    text = file_content.decode(encoding)
-                    return {
-                        "text": text.strip(),
-                        "method": "text_file",
-                        "encoding": encoding,
-                        "success": bool(text.strip())
-                    }
-                except:
-                    continue
-            
-            raise ValueError("Failed to decode text file")
+            continue
+    raise ValueError("Failed to decode text file")
+
+
+def _docx_text(docx_path: str) -> Tuple[str, int]:
+    """(text, paragraph count) of a DOCX file, tables after paragraphs (runs in a pool worker)"""
+    doc = Document(docx_path)
+    
+    # Extract paragraphs
+    text = "\n\n".join([para.text for para in doc.paragraphs if para.text])
+    
+    # Extract tables
+    for table in doc.tables:
+        for row in table.rows:
+            text += "\n" + "\t".join([cell.text for cell in row.cells])
+    
+    return text, len(doc.paragraphs)
+
+
+def _image_text(image_path: str) -> Tuple[str, Tuple[int, int]]:
+    """(OCR text, dimensions) of an image (runs in a pool worker)"""
+    with Image.open(image_path) as image:
+        return pytesseract.image_to_string(image), image.size
+
+
+def _ocr_pdf_page(pdf_path: str, page_num: int, dpi: int) -> Tuple[int, str]:
+    """Render and OCR one page (runs in a pool worker)"""
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_num + 1, last_page=page_num + 1)
+    try:
+        return page_num, "".join(pytesseract.image_to_string(image) for image in images)
+    finally:
+        for image in images:
+            image.close()
 
 
 # Global document processor instance
@@ -0,0 +1,256 @@
+"""
+Embedding Backends
+Pluggable inference backends behind the embedding service: full-precision
+PyTorch sentence-transformers, an int8-quantized ONNX Runtime export for
+small CPU-only instances, or a client for the shared per-host sidecar
+"""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+
+
+class EmbeddingModelUnavailable(RuntimeError):
+    """Raised when the embedding model could not be loaded or reached"""
+
+
+class EmbeddingModelLoading(EmbeddingModelUnavailable):
+    """Raised when the model is reachable but still loading (e.g. in the sidecar)"""
+
+
+class EmbeddingBackend:
+    """
+    Synchronous text encoder used from the embedding service thread
+
+    Implementations return L2-normalized float32 vectors, shape (n, dim).
+    """
+
+    name = "base"
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        raise NotImplementedError
+
+    def probe(self):
+        """Raise if the backend can't serve encodes right now (in-process models always can)"""
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Full-precision PyTorch model via sentence-transformers"""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ).astype(np.float32, copy=False)
+
+
+class OnnxInt8Backend(EmbeddingBackend):
+    """
+    Int8-quantized transformer on ONNX Runtime (CPU)
+
+    Expects a directory produced by ``export_onnx_int8`` containing
+    ``model.onnx`` and ``tokenizer.json``. Pooling (attention-masked mean)
+    and normalization match the sentence-transformers pipeline.
+    """
+
+    name = "onnx-int8"
+
+    def __init__(self, model_dir: str, max_seq_length: int = 256):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        if not (model_dir / "model.onnx").exists():
+            raise FileNotFoundError(
+                f"No ONNX model in {model_dir}. Run: python benchmark_embeddings.py --export"
+            )
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_dir / "model.onnx"),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real (non-padding) tokens
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            vectors.append(pooled)
+
+        embeddings = np.concatenate(vectors).astype(np.float32, copy=False)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.clip(norms, 1e-12, None)
+
+
+class SidecarBackend(EmbeddingBackend):
+    """
+    Client for the per-host embedding sidecar (app.services.embedding_sidecar)
+
+    Every gunicorn worker talks to the one process that owns the model over a
+    Unix domain socket, so model memory is paid once per host. Connects
+    lazily and reconnects once on a broken connection (not on a timeout -
+    the sidecar is busy, and resending would only add to its queue); only
+    ever used from the embedding service thread, so the socket needs no
+    locking.
+    """
+
+    name = "sidecar"
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock = None
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        import socket
+        from app.services.embedding_sidecar import SidecarError, pack_request, recv_response
+
+        for attempt in range(2):
+            try:
+                if self._sock is None:
+                    self._connect()
+                self._sock.sendall(pack_request(texts))
+                return recv_response(self._sock)
+            except SidecarError:
+                # Framing may be lost mid-response - never reuse the socket
+                self.close()
+                raise
+            except socket.timeout as e:
+                self.close()
+                raise EmbeddingModelUnavailable(
+                    f"Embedding sidecar timed out after {self.timeout:g}s"
+                ) from e
+            except OSError as e:
+                self.close()
+                if attempt:
+                    raise EmbeddingModelUnavailable(f"Embedding sidecar unavailable: {e}") from e
+
+    def probe(self, timeout: float = 2.0):
+        """
+        Readiness ping on a fresh connection (the main socket belongs to
+        the embedding service thread)
+        """
+        import socket
+        from app.services.embedding_sidecar import pack_request, recv_response
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(self.socket_path)
+            sock.sendall(pack_request([]))
+            recv_response(sock)
+        except OSError as e:
+            raise EmbeddingModelUnavailable(f"Embedding sidecar unavailable: {e}") from e
+        finally:
+            sock.close()
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _connect(self):
+        import socket
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+
+
+def load_backend(
+    backend: str = settings.EMBEDDING_BACKEND,
+    model_name: str = settings.EMBEDDING_MODEL_NAME,
+) -> EmbeddingBackend:
+    """Instantiate the configured embedding backend"""
+    if backend == SentenceTransformerBackend.name:
+        return SentenceTransformerBackend(model_name)
+    if backend == OnnxInt8Backend.name:
+        return OnnxInt8Backend(settings.EMBEDDING_ONNX_DIR, settings.EMBEDDING_MAX_SEQ_LENGTH)
+    if backend == SidecarBackend.name:
+        return SidecarBackend(settings.EMBEDDING_SIDECAR_SOCKET)
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def export_onnx_int8(model_name: str, output_dir: str) -> Path:
+    """
+    Export a sentence-transformers model to ONNX and quantize it to int8
+
+    Requires torch + transformers (build-time only; the runtime backend needs
+    just onnxruntime + tokenizers).
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    repo = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(repo)
+    model = AutoModel.from_pretrained(repo).eval()
+    tokenizer.save_pretrained(output_dir)
+
+    sample = tokenizer(["Hallux export sample"], return_tensors="pt")
+    input_names = list(sample.keys())
+    fp32_path = output_dir / "model-fp32.onnx"
+
+    logger.info(f"Exporting {repo} to ONNX...")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]},
+            opset_version=14,
+        )
+
+    logger.info("Quantizing ONNX model to int8...")
+    quantized_path = output_dir / "model.onnx"
+    quantize_dynamic(str(fp32_path), str(quantized_path), weight_type=QuantType.QInt8)
+    fp32_path.unlink()
+
+    logger.info(f"✅ Int8 ONNX model written to {quantized_path}")
+    return quantized_path
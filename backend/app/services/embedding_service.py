@@ -0,0 +1,277 @@
+"""
+Embedding Service
+Runs embedding inference on a dedicated thread and micro-batches encode
+requests coming from concurrent coroutines
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+from app.core.embedding_cache import EmbeddingCache, embedding_cache
+from app.services.embedding_backends import (
+    EmbeddingBackend,
+    EmbeddingModelLoading,
+    EmbeddingModelUnavailable,
+    load_backend,
+)
+
+
+@dataclass
+class _EncodeRequest:
+    texts: List[str]
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+
+
+def _resolve(future: asyncio.Future, result=None, error: Optional[BaseException] = None):
+    """Complete a future on its own loop (no-op if the caller gave up)"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class EmbeddingService:
+    """
+    Non-blocking, micro-batched text embedding
+
+    Coroutines call ``await encode(texts)``; requests are queued to a single
+    inference thread that drains the queue into batches of up to
+    ``max_batch_size`` texts, waiting at most ``max_wait_ms`` for a batch to
+    fill, runs one forward pass and resolves every caller's future with its
+    slice of the float32 vectors.
+
+    Texts already seen (same model, same content hash) are served from the
+    embedding cache and never reach the model.
+    """
+
+    def __init__(
+        self,
+        model_name: str = settings.EMBEDDING_MODEL_NAME,
+        backend: str = settings.EMBEDDING_BACKEND,
+        max_batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+        max_wait_ms: int = settings.EMBEDDING_BATCH_WAIT_MS,
+        cache: Optional[EmbeddingCache] = embedding_cache,
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.cache = cache
+        # Backends produce slightly different vectors, so they never share entries
+        self.cache_namespace = f"{backend}:{model_name}"
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._model = None
+        self._load_error: Optional[Exception] = None
+        self._load_error_at = 0.0
+        self._queue: "queue.Queue[Optional[_EncodeRequest]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def quantized(self) -> bool:
+        """Whether vectors come from the int8-quantized model (resolved through the sidecar)"""
+        backend = settings.EMBEDDING_SIDECAR_BACKEND if self.backend == "sidecar" else self.backend
+        return backend == "onnx-int8"
+
+    # ========== PUBLIC API ==========
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts without blocking the event loop
+
+        Returns:
+            float32 array of shape (len(texts), dim)
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        if self.cache is None:
+            return await self._submit(list(texts))
+
+        vectors = await self.cache.get_many(self.cache_namespace, texts)
+
+        # Embed each distinct uncached text once
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            computed = await self._submit(missing)
+            await self.cache.set_many(self.cache_namespace, missing, computed)
+            by_text = dict(zip(missing, computed))
+            vectors = [v if v is not None else by_text[t] for t, v in zip(texts, vectors)]
+
+        return np.stack(vectors)
+
+    async def _submit(self, texts: List[str]) -> np.ndarray:
+        """Queue texts for the inference thread and await the vectors"""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_EncodeRequest(texts, future, loop))
+        return await future
+
+    @property
+    def ready(self) -> bool:
+        """True once the model is loaded and encode() won't wait for it"""
+        return self._model is not None
+
+    @property
+    def status(self) -> str:
+        """
+        Load state: ready, loading, unavailable (last load failed) or
+        not_loaded (loads on first use) - see probe for a live check
+        """
+        if self._model is not None:
+            return "ready"
+        if self._load_lock.locked():
+            return "loading"
+        if self._load_error is not None and not self._load_retry_due():
+            return "unavailable"
+        return "not_loaded"
+
+    async def probe(self) -> str:
+        """
+        Live state for health checks: ready, loading, unavailable or not_loaded
+
+        Read-only - never starts a load. Once the backend is loaded it is
+        pinged; for the sidecar that is a round trip to the sidecar
+        process, which answers "loading" until its own model is up.
+        """
+        if self._model is None:
+            return self.status
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._model.probe)
+        except EmbeddingModelLoading:
+            return "loading"
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding backend probe failed: {e}")
+            return "unavailable"
+        return "ready"
+
+    def _load_retry_due(self) -> bool:
+        return time.monotonic() - self._load_error_at >= settings.EMBEDDING_LOAD_RETRY_SECONDS
+
+    async def warm_up(self):
+        """
+        Load the model in the background so the first Layer 3 request
+        doesn't pay for it (the event loop keeps serving meanwhile)
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._get_model)
+        except EmbeddingModelUnavailable:
+            pass
+
+    def close(self):
+        """Stop the inference thread after it drains queued work"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    # ========== INFERENCE THREAD ==========
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-service", daemon=True
+                )
+                self._thread.start()
+
+    def _get_model(self) -> EmbeddingBackend:
+        """Load the backend once (inference thread or warm-up executor)"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    # Don't retry a failed load on every request
+                    if self._load_error is not None and not self._load_retry_due():
+                        raise EmbeddingModelUnavailable(str(self._load_error))
+                    try:
+                        self._model = load_backend(self.backend, self.model_name)
+                        self._load_error = None
+                        logger.info(f"✅ Loaded {self.backend} embedding backend ('{self.model_name}') for semantic similarity")
+                    except Exception as e:
+                        logger.error(f"Failed to load embeddings model: {e}")
+                        self._load_error = e
+                        self._load_error_at = time.monotonic()
+                        raise EmbeddingModelUnavailable(str(e)) from e
+        return self._model
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+
+            # Collect more requests until the batch is full or the window closes
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._encode_batch(batch)
+            if stop:
+                return
+
+    def _encode_batch(self, batch: List[_EncodeRequest]):
+        live = [r for r in batch if not r.future.done()]
+        if not live:
+            return
+
+        texts = [text for request in live for text in request.texts]
+        try:
+            model = self._get_model()
+            vectors = model.encode(texts, batch_size=self.max_batch_size)
+        except Exception as e:
+            for request in live:
+                self._complete(request, error=e)
+            return
+
+        logger.debug(f"Embedded {len(texts)} texts for {len(live)} requests")
+
+        offset = 0
+        for request in live:
+            count = len(request.texts)
+            self._complete(request, result=vectors[offset:offset + count])
+            offset += count
+
+    @staticmethod
+    def _complete(request: _EncodeRequest, result=None, error: Optional[BaseException] = None):
+        try:
+            request.loop.call_soon_threadsafe(_resolve, request.future, result, error)
+        except RuntimeError:
+            # Event loop already closed - nobody is waiting any more
+            pass
+
+
+# Global embedding service instance
+embedding_service = EmbeddingService()
@@ -0,0 +1,195 @@
+"""
+Embedding Sidecar
+One process per host owns the embedding model and serves batched encode
+requests to every gunicorn worker over a Unix domain socket
+
+Run next to the API workers and point them at it:
+    python -m app.services.embedding_sidecar
+    EMBEDDING_BACKEND=sidecar gunicorn app.main:app --workers 4 ...
+
+Wire protocol (network byte order, one request/response at a time per
+connection, connections are reused):
+    request:  magic "HLXE" | version u8 | count u32 | count x (length u32 | utf-8 bytes)
+              (count 0 is a readiness ping: empty response once the model is loaded)
+    response: magic "HLXE" | status u8 | rows u32 | dim u32 | rows*dim float32 (little-endian)
+    error:    magic "HLXE" | status 1  | 0 | 0 | length u32 | utf-8 message
+              (status 2: same layout, the model is still loading)
+"""
+
+import asyncio
+import os
+import socket
+import struct
+from typing import List
+
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+from app.services.embedding_backends import EmbeddingModelLoading, EmbeddingModelUnavailable
+from app.services.embedding_service import EmbeddingService
+
+MAGIC = b"HLXE"
+VERSION = 1
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_LOADING = 2
+
+MAX_TEXTS_PER_REQUEST = 4096
+MAX_TEXT_BYTES = 1024 * 1024
+
+_REQUEST_HEADER = struct.Struct("!4sBI")  # magic, version, count
+_RESPONSE_HEADER = struct.Struct("!4sBII")  # magic, status, rows, dim
+_LENGTH = struct.Struct("!I")
+_VECTOR_DTYPE = np.dtype("<f4")
+
+
+class SidecarError(EmbeddingModelUnavailable):
+    """Raised when the sidecar answers with an error or breaks the protocol"""
+
+
+class SidecarLoading(SidecarError, EmbeddingModelLoading):
+    """Raised when the sidecar answers a ping while its model is still loading"""
+
+
+# ========== PROTOCOL ==========
+
+def pack_request(texts: List[str]) -> bytes:
+    """Serialize an encode request"""
+    parts = [_REQUEST_HEADER.pack(MAGIC, VERSION, len(texts))]
+    for text in texts:
+        data = text.encode("utf-8")
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def pack_response(vectors: np.ndarray) -> bytes:
+    """Serialize a vector matrix"""
+    rows, dim = vectors.shape if vectors.size else (0, 0)
+    header = _RESPONSE_HEADER.pack(MAGIC, STATUS_OK, rows, dim)
+    return header + np.ascontiguousarray(vectors, dtype=_VECTOR_DTYPE).tobytes()
+
+
+def pack_error(message: str, status: int = STATUS_ERROR) -> bytes:
+    """Serialize an error response"""
+    data = message.encode("utf-8")[:4096]
+    return _RESPONSE_HEADER.pack(MAGIC, status, 0, 0) + _LENGTH.pack(len(data)) + data
+
+
+async def read_request(reader: asyncio.StreamReader) -> List[str]:
+    """Read one encode request (raises IncompleteReadError on EOF)"""
+    magic, version, count = _REQUEST_HEADER.unpack(await reader.readexactly(_REQUEST_HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Bad request header")
+    if count > MAX_TEXTS_PER_REQUEST:
+        raise ValueError(f"Too many texts in one request ({count})")
+
+    texts = []
+    for _ in range(count):
+        (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+        if length > MAX_TEXT_BYTES:
+            raise ValueError(f"Text too large ({length} bytes)")
+        texts.append((await reader.readexactly(length)).decode("utf-8"))
+    return texts
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Embedding sidecar closed the connection")
+        received += count
+    return bytes(buffer)
+
+
+def recv_response(sock: socket.socket) -> np.ndarray:
+    """Read one response from a blocking socket"""
+    magic, status, rows, dim = _RESPONSE_HEADER.unpack(_recv_exactly(sock, _RESPONSE_HEADER.size))
+    if magic != MAGIC:
+        raise SidecarError("Bad response header from embedding sidecar")
+
+    if status != STATUS_OK:
+        (length,) = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+        message = _recv_exactly(sock, length).decode("utf-8", errors="replace")
+        raise (SidecarLoading if status == STATUS_LOADING else SidecarError)(message)
+
+    payload = _recv_exactly(sock, rows * dim * _VECTOR_DTYPE.itemsize)
+    return np.frombuffer(payload, dtype=_VECTOR_DTYPE).astype(np.float32).reshape(rows, dim)
+
+
+# ========== SERVER ==========
+
+async def serve(socket_path: str = settings.EMBEDDING_SIDECAR_SOCKET):
+    """
+    Serve encode requests until cancelled
+
+    Listens right away and loads the model in the background: pings are
+    answered "loading" meanwhile, and encode requests wait for the model.
+    """
+    # No cache here - workers cache vectors before they ever hit the socket;
+    # requests from every worker share one micro-batching queue
+    service = EmbeddingService(backend=settings.EMBEDDING_SIDECAR_BACKEND, cache=None)
+
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    texts = await read_request(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                except (ValueError, UnicodeDecodeError) as e:
+                    # Framing is lost - report and drop the connection
+                    writer.write(pack_error(str(e)))
+                    await writer.drain()
+                    break
+
+                if not texts:
+                    # Readiness ping - answer without waiting for the model
+                    if service.ready:
+                        writer.write(pack_response(np.empty((0, 0), dtype=_VECTOR_DTYPE)))
+                    elif service.status == "unavailable":
+                        writer.write(pack_error("Embedding model unavailable"))
+                    else:
+                        writer.write(pack_error("Embedding model loading", STATUS_LOADING))
+                    await writer.drain()
+                    continue
+
+                try:
+                    vectors = await service.encode(texts)
+                    writer.write(pack_response(vectors))
+                except Exception as e:
+                    logger.error(f"Sidecar encode error: {e}")
+                    writer.write(pack_error(str(e)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # Stale socket from a previous run
+
+    server = await asyncio.start_unix_server(handle_connection, path=socket_path)
+    os.chmod(socket_path, 0o600)
+    logger.info(f"✅ Embedding sidecar listening on {socket_path} ({service.backend})")
+    warm_up = asyncio.ensure_future(service.warm_up())
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        warm_up.cancel()
+        service.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        logger.info("Embedding sidecar stopped")
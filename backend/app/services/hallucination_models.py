@@ -3,10 +3,17 @@ Advanced Hallucination Detection Models
 Integrates multiple detection strategies
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterable, AsyncIterator, Iterable, Iterator
+from pathlib import Path
 from loguru import logger
+import asyncio
+import math
 import re
-from difflib import SequenceMatcher
+
+from app.core.config import settings
+from app.core.executors import process_pool_workers, run_in_process
+from app.services.pattern_rules import DEFAULT_RULES_FILE, PatternRuleSet
+from app.services.quote_locator import QuoteLocator
 
 
 class HallucinationDetector:
@@ -15,43 +22,10 @@ class HallucinationDetector:
     Inspired by Citation-Hallucination-Detection and exa-labs approaches
     """
     
-    def __init__(self):
-        self.patterns = self._load_hallucination_patterns()
-        
-    def _load_hallucination_patterns(self) -> List[Dict[str, Any]]:
-        """Common hallucination patterns in citations"""
-        return [
-            {
-                "name": "impossible_year",
-                "pattern": r'\b(20[3-9]\d|2[1-9]\d{2})\b',  # Years > 2029
-                "severity": "high",
-                "description": "Citation references future year"
-            },
-            {
-                "name": "fake_doi_structure",
-                "pattern": r'10\.(?![\d]{4})',  # Malformed DOI
-                "severity": "medium",
-                "description": "DOI doesn't follow standard format"
-            },
-            {
-                "name": "nonexistent_journal",
-                "pattern": r'\b(Nature|Science|Cell|Lancet)\s+\d{4}\b',
-                "severity": "low",
-                "description": "High-impact journal without proper citation"
-            },
-            {
-                "name": "fake_arxiv",
-                "pattern": r'arXiv:(?!\d{4}\.\d{4,5})',
-                "severity": "high",
-                "description": "Invalid arXiv format"
-            },
-            {
-                "name": "suspicious_url",
-                "pattern": r'https?://(?:example\.com|test\.org|fake)',
-                "severity": "high",
-                "description": "Placeholder or test URL detected"
-            }
-        ]
+    def __init__(self, rules_file: Optional[str] = None):
+        # Rules live in a data file so they can change without code changes
+        self.rules_file = str(rules_file or settings.HALLUCINATION_RULES_FILE or DEFAULT_RULES_FILE)
+        self.rules = PatternRuleSet.load(Path(self.rules_file))
     
     def detect_hallucinations(
         self,
@@ -66,32 +40,8 @@ class HallucinationDetector:
         """
         logger.info(f"Running hallucination detection on: {citation[:100]}")
         
-        flags = []
-        severity_score = 0
-        
-        # Pattern-based detection
-        for pattern_def in self.patterns:
-            matches = re.finditer(pattern_def["pattern"], citation, re.IGNORECASE)
-            for match in matches:
-                flags.append({
-                    "type": pattern_def["name"],
-                    "matched": match.group(0),
-                    "severity": pattern_def["severity"],
-                    "description": pattern_def["description"]
-                })
-                
-                # Add to severity score
-                if pattern_def["severity"] == "high":
-                    severity_score += 0.3
-                elif pattern_def["severity"] == "medium":
-                    severity_score += 0.15
-                else:
-                    severity_score += 0.05
-        
-        # Structure analysis
-        structure_flags = self._analyze_structure(citation)
-        flags.extend(structure_flags)
-        severity_score += len(structure_flags) * 0.1
+        # Pattern and structure rules, all in one scan
+        flags, severity_score = self._apply_rules(citation)
         
         # Claim extraction and verification
         if context:
@@ -112,52 +62,42 @@ class HallucinationDetector:
             "recommendation": self._generate_recommendation(hallucination_probability, flags)
         }
     
-    def _analyze_structure(self, citation: str) -> List[Dict[str, Any]]:
-        """Analyze citation structure for anomalies"""
+    def _apply_rules(self, citation: str) -> Tuple[List[Dict[str, Any]], float]:
+        """Turn rule hits into flags (in rule order) and a severity score"""
         flags = []
+        severity_score = 0.0
         
-        # Check for proper citation format
-        has_author = bool(re.search(r'\b[A-Z][a-z]+\s+(?:et\s+al\.?|and\s+[A-Z])', citation))
-        has_year = bool(re.search(r'\b(19|20)\d{2}\b', citation))
-        has_source = bool(re.search(r'https?://|doi:|arXiv:', citation, re.IGNORECASE))
-        
-        if not has_author:
-            flags.append({
-                "type": "missing_author",
-                "severity": "medium",
-                "description": "No clear author pattern found"
-            })
-        
-        if not has_year:
-            flags.append({
-                "type": "missing_year",
-                "severity": "medium",
-                "description": "No publication year found"
-            })
-        
-        if not has_source:
-            flags.append({
-                "type": "missing_source",
-                "severity": "high",
-                "description": "No verifiable source (URL/DOI/arXiv) found"
-            })
-        
-        # Check for overly confident language (hallucination indicator)
-        confident_phrases = [
-            r'\bevery\b', r'\ball\b', r'\balways\b', r'\bnever\b',
-            r'\bclearly\b', r'\bobviously\b', r'\bundoubtedly\b'
-        ]
-        
-        for phrase_pattern in confident_phrases:
-            if re.search(phrase_pattern, citation, re.IGNORECASE):
+        for rule, hits in zip(self.rules.rules, self.rules.scan(citation)):
+            if rule["kind"] == "match":
+                # Every occurrence is a separate red flag
+                for position, matched in hits:
+                    flags.append({
+                        "type": rule["name"],
+                        "matched": matched,
+                        "position": position,
+                        "severity": rule["severity"],
+                        "description": rule["description"]
+                    })
+                    severity_score += rule["weight"]
+            elif rule["kind"] == "required" and not hits:
                 flags.append({
-                    "type": "overconfident_language",
-                    "severity": "low",
-                    "description": "Contains overly confident language (common in hallucinations)"
+                    "type": rule["name"],
+                    "severity": rule["severity"],
+                    "description": rule["description"]
                 })
-                break
+                severity_score += rule["weight"]
+            elif rule["kind"] == "present" and hits:
+                position, matched = hits[0]
+                flags.append({
+                    "type": rule["name"],
+                    "matched": matched,
+                    "position": position,
+                    "severity": rule["severity"],
+                    "description": rule["description"]
+                })
+                severity_score += rule["weight"]
         
-        return flags
+        return flags, severity_score
     
     def _verify_claims(
         self,
@@ -169,24 +109,26 @@ class HallucinationDetector:
         
         # Extract quoted text
         quoted_text = re.findall(r'"([^"]+)"', citation)
+        if not quoted_text:
+            return flags
         
+        locator = QuoteLocator(context)
         for quote in quoted_text:
-            # Check if quote appears in context
-            similarity = self._calculate_similarity(quote.lower(), context.lower())
+            # Check if quote appears in context (best-matching window)
+            match = locator.locate(quote)
+            similarity = match["score"] if match else 0.0
             
-            if similarity < 0.3:
+            if similarity < settings.HALLUCINATION_QUOTE_MIN_SCORE:
                 flags.append({
                     "type": "unverified_quote",
                     "severity": "high",
-                    "description": f"Quote not found in context: '{quote[:50]}...'"
+                    "description": f"Quote not found in context: '{quote[:50]}...'",
+                    "similarity": similarity,
+                    "closest_match": match
                 })
         
         return flags
     
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate text similarity using sequence matching"""
-        return SequenceMatcher(None, text1, text2).ratio()
-    
     def _generate_recommendation(
         self,
         probability: float,
@@ -217,6 +159,128 @@ class HallucinationDetector:
             results.append(result)
         
         return results
+    
+    async def stream_batch_detect(
+        self,
+        citations: List[str],
+        contexts: Optional[List[Optional[str]]] = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Detect hallucinations in many citations across the CPU worker pool
+        
+        The input is split into contiguous shards (a few per worker, so a
+        slow shard doesn't hold up a whole core's share). Results are
+        yielded as (index, result) in input order, as soon as every earlier
+        shard has finished. Batches up to HALLUCINATION_BATCH_INLINE_MAX run
+        inline - the pool round trip costs more than the detection itself.
+        """
+        contexts = [
+            contexts[i] if contexts and i < len(contexts) else None
+            for i in range(len(citations))
+        ]
+        
+        if len(citations) <= settings.HALLUCINATION_BATCH_INLINE_MAX:
+            for i, citation in enumerate(citations):
+                yield i, self.detect_hallucinations(citation, contexts[i])
+            return
+        
+        shard_size = max(
+            settings.HALLUCINATION_MIN_SHARD_SIZE,
+            math.ceil(len(citations) / (process_pool_workers() * 4))
+        )
+        shards = [
+            asyncio.ensure_future(run_in_process(
+                _detect_shard, self.rules_file, start,
+                citations[start:start + shard_size], contexts[start:start + shard_size]
+            ))
+            for start in range(0, len(citations), shard_size)
+        ]
+        logger.info(f"🔍 Hallucination batch: {len(citations)} citations in {len(shards)} shards")
+        
+        finished: Dict[int, List[Dict[str, Any]]] = {}
+        next_start = 0
+        try:
+            for shard in asyncio.as_completed(shards):
+                start, results = await shard
+                finished[start] = results
+                # Release everything that is now contiguous with what was sent
+                while next_start in finished:
+                    for offset, result in enumerate(finished.pop(next_start)):
+                        yield next_start + offset, result
+                    next_start += shard_size
+        finally:
+            # Client went away or a shard failed - drop shards not yet started
+            for shard in shards:
+                shard.cancel()
+
+
+_shard_detectors: Dict[str, HallucinationDetector] = {}
+
+
+def _detect_shard(
+    rules_file: str,
+    start: int,
+    citations: List[str],
+    contexts: List[Optional[str]]
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """Run one shard of a batch inside a pool worker (detector cached per rule set)"""
+    detector = _shard_detectors.get(rules_file)
+    if detector is None:
+        detector = _shard_detectors[rules_file] = HallucinationDetector(rules_file)
+    return start, detector.batch_detect(citations, contexts)
+
+
+# Claim extraction patterns (compiled once)
+_SENTENCE_END = re.compile(r'[.!?]+')
+_CITATION_REFERENCE = re.compile(r'\([\d]{4}\)|\[\d+\]|et\s+al\.')
+_STATISTIC = re.compile(r'\d+%|\d+\s+(?:percent|cases|studies)')
+_DEFINITIVE_VERB = re.compile(r'is|are|was|demonstrates|shows|proves', re.IGNORECASE)
+_STATISTICAL_CLAIM = re.compile(r'\d+%|\d+\s+percent')
+_CITED_CLAIM = re.compile(r'according to|cited in|\([\d]{4}\)')
+_RESEARCH_CLAIM = re.compile(r'study|research|paper|article', re.IGNORECASE)
+
+
+class _SentenceSplitter:
+    """
+    Incremental version of re.split(r'[.!?]+', text)
+    
+    Text is fed in chunks; complete sentences come out as
+    (start_offset, sentence). Only the unfinished tail is kept between
+    chunks, capped at `max_chars` - a longer run without terminator is
+    cut there.
+    """
+    
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._buffer = ""
+        self._offset = 0  # Offset of _buffer[0] in the full text
+    
+    def feed(self, chunk: str) -> List[Tuple[int, str]]:
+        self._buffer += chunk
+        sentences = []
+        consumed = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if match.end() == len(self._buffer):
+                break  # The terminator run may continue in the next chunk
+            sentences.append((self._offset + consumed, self._buffer[consumed:match.start()]))
+            consumed = match.end()
+        
+        while len(self._buffer) - consumed > self.max_chars:
+            sentences.append((self._offset + consumed, self._buffer[consumed:consumed + self.max_chars]))
+            consumed += self.max_chars
+        
+        self._buffer = self._buffer[consumed:]
+        self._offset += consumed
+        return sentences
+    
+    def close(self) -> List[Tuple[int, str]]:
+        # Flush the tail: a trailing terminator run ends one last sentence
+        tail = self._buffer
+        self._buffer = ""
+        match = _SENTENCE_END.search(tail)
+        if match and match.end() == len(tail):
+            return [(self._offset, tail[:match.start()])]
+        return [(self._offset, tail)]
 
 
 class ClaimExtractor:
@@ -225,44 +289,75 @@ class ClaimExtractor:
     Inspired by exa-labs approach
     """
     
-    def extract_claims(self, text: str) -> List[Dict[str, str]]:
+    def extract_claims(self, text: str) -> List[Dict[str, Any]]:
         """Break down text into individual verifiable claims"""
         
         logger.info("Extracting claims from text...")
+        return list(self.iter_claims([text]))
+    
+    def iter_claims(self, chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield claims from text arriving in chunks
         
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
+        Memory stays bounded by the chunk size plus one sentence
+        (CLAIM_MAX_SENTENCE_CHARS), so book-length text can be streamed.
+        Each claim carries its start/end offsets in the full text.
+        """
+        splitter = _SentenceSplitter(settings.CLAIM_MAX_SENTENCE_CHARS)
+        for chunk in chunks:
+            for offset, sentence in splitter.feed(chunk):
+                claim = self._to_claim(offset, sentence)
+                if claim:
+                    yield claim
+        for offset, sentence in splitter.close():
+            claim = self._to_claim(offset, sentence)
+            if claim:
+                yield claim
+    
+    async def aiter_claims(self, chunks: AsyncIterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Async variant of iter_claims (e.g. for chunks read from an upload)"""
+        splitter = _SentenceSplitter(settings.CLAIM_MAX_SENTENCE_CHARS)
+        async for chunk in chunks:
+            for offset, sentence in splitter.feed(chunk):
+                claim = self._to_claim(offset, sentence)
+                if claim:
+                    yield claim
+        for offset, sentence in splitter.close():
+            claim = self._to_claim(offset, sentence)
+            if claim:
+                yield claim
+    
+    def _to_claim(self, offset: int, raw: str) -> Optional[Dict[str, Any]]:
+        sentence = raw.strip()
+        if not sentence or len(sentence) < 10:
+            return None
         
-        claims = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence or len(sentence) < 10:
-                continue
-            
-            # Identify factual claims (contain citations, data, or assertions)
-            if self._is_factual_claim(sentence):
-                claims.append({
-                    "text": sentence,
-                    "type": self._classify_claim(sentence),
-                    "needs_verification": True
-                })
+        # Identify factual claims (contain citations, data, or assertions)
+        if not self._is_factual_claim(sentence):
+            return None
         
-        return claims
+        start = offset + len(raw) - len(raw.lstrip())
+        return {
+            "text": sentence,
+            "type": self._classify_claim(sentence),
+            "needs_verification": True,
+            "start": start,
+            "end": start + len(sentence)
+        }
     
     def _is_factual_claim(self, sentence: str) -> bool:
         """Check if sentence contains factual claim"""
         
         # Contains citation reference
-        if re.search(r'\([\d]{4}\)|\[\d+\]|et\s+al\.', sentence):
+        if _CITATION_REFERENCE.search(sentence):
             return True
         
         # Contains statistical data
-        if re.search(r'\d+%|\d+\s+(?:percent|cases|studies)', sentence):
+        if _STATISTIC.search(sentence):
             return True
         
         # Contains definitive statement
-        definitive_verbs = ['is', 'are', 'was', 'demonstrates', 'shows', 'proves']
-        if any(verb in sentence.lower() for verb in definitive_verbs):
+        if _DEFINITIVE_VERB.search(sentence):
             return True
         
         return False
@@ -270,11 +365,11 @@ class ClaimExtractor:
     def _classify_claim(self, sentence: str) -> str:
         """Classify type of claim"""
         
-        if re.search(r'\d+%|\d+\s+percent', sentence):
+        if _STATISTICAL_CLAIM.search(sentence):
             return "statistical"
-        elif re.search(r'according to|cited in|\([\d]{4}\)', sentence):
+        elif _CITED_CLAIM.search(sentence):
             return "cited"
-        elif re.search(r'study|research|paper|article', sentence, re.IGNORECASE):
+        elif _RESEARCH_CLAIM.search(sentence):
             return "research"
         else:
             return "general"
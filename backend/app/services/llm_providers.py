@@ -0,0 +1,235 @@
+"""
+LLM Providers
+Async interface shared by every Layer 4 backend, with per-provider
+concurrency limits and timeouts so a slow LLM never blocks the event loop
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+class LLMProviderError(RuntimeError):
+    """Raised when a provider call fails or times out"""
+
+
+class LLMProvider:
+    """
+    Base class for LLM backends
+
+    Subclasses implement ``_complete``; ``complete`` wraps it with the
+    provider's concurrency limit and timeout.
+    """
+
+    name = "base"
+    model = ""
+
+    def __init__(self, max_concurrency: int, timeout: float = settings.LLM_TIMEOUT_SECONDS):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for the running loop (created on first use)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def complete(self, system: str, prompt: str, max_tokens: int = 500) -> Dict[str, Any]:
+        """
+        Run one completion
+
+        Returns:
+            {"text": str, "tokens": Optional[int]}
+
+        Raises:
+            LLMProviderError on timeout, provider failure or an empty completion
+        """
+        async with self._get_semaphore():
+            try:
+                result = await asyncio.wait_for(self._complete(system, prompt, max_tokens), self.timeout)
+            except asyncio.TimeoutError:
+                raise LLMProviderError(f"{self.name} timed out after {self.timeout:g}s")
+            except LLMProviderError:
+                raise
+            except Exception as e:
+                raise LLMProviderError(f"{self.name} error: {e}") from e
+
+        # Filtered or truncated responses can come back without content
+        if not (result.get("text") or "").strip():
+            raise LLMProviderError(f"{self.name} returned an empty completion")
+        return result
+
+    async def _complete(self, system: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions via the SDK's native async client"""
+
+    name = "openai"
+    model = "gpt-4"
+
+    def __init__(self, api_key: str, max_concurrency: int = settings.OPENAI_MAX_CONCURRENCY):
+        super().__init__(max_concurrency)
+        from openai import AsyncOpenAI
+
+        # Retries would stretch a call past our timeout - fail over instead
+        self.client = AsyncOpenAI(api_key=api_key, timeout=self.timeout, max_retries=0)
+
+    async def _complete(self, system: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=max_tokens,
+            temperature=0.3,
+        )
+        return {
+            "text": response.choices[0].message.content,
+            "tokens": response.usage.total_tokens if response.usage else None,
+        }
+
+
+class GeminiProvider(LLMProvider):
+    """
+    Google Gemini via the synchronous SDK
+
+    Calls run on a dedicated thread pool sized to the concurrency limit, so
+    Gemini can never take more threads than it is allowed requests.
+
+    The SDK call can't be cancelled: one that times out keeps holding its
+    thread until the SDK returns. Later calls queue for a free thread
+    within their own timeout, so a hung Gemini fails fast rather than
+    piling up threads.
+    """
+
+    name = "google"
+    model = "gemini-pro"
+
+    def __init__(self, api_key: str, max_concurrency: int = settings.GEMINI_MAX_CONCURRENCY):
+        super().__init__(max_concurrency)
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.client = genai.GenerativeModel(self.model)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+
+    async def _complete(self, system: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(self._executor, self._generate, system, prompt, max_tokens)
+        return {"text": response.text, "tokens": None}
+
+    def _generate(self, system: str, prompt: str, max_tokens: int):
+        # gemini-pro has no system role - prepend it to the prompt
+        return self.client.generate_content(
+            f"{system}\n\n{prompt}",
+            generation_config={"max_output_tokens": max_tokens, "temperature": 0.3},
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Offline stand-in for load and regression testing (LLM_PROVIDER=fake)
+
+    Answers are a pure function of the prompt: the confidence follows the
+    layer summary in the prompt (metadata passed/failed) plus a stable
+    hash-based offset, in the same "Confidence Score: x" format the real
+    models are asked for, or as a JSON array for batched prompts. Latency
+    is log-normal around FAKE_LLM_LATENCY_MS and a FAKE_LLM_ERROR_RATE
+    share of calls fail; both are drawn from a seeded generator so runs are
+    reproducible.
+    """
+
+    name = "fake"
+    model = "fake-llm"
+
+    BASE_CONFIDENCE = {"passed": 0.85, "failed": 0.2, "warning": 0.55}
+
+    def __init__(
+        self,
+        latency_ms: float = settings.FAKE_LLM_LATENCY_MS,
+        latency_sigma: float = settings.FAKE_LLM_LATENCY_SIGMA,
+        error_rate: float = settings.FAKE_LLM_ERROR_RATE,
+        seed: int = settings.FAKE_LLM_SEED,
+        max_concurrency: int = settings.FAKE_LLM_MAX_CONCURRENCY,
+    ):
+        super().__init__(max_concurrency)
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    async def _complete(self, system: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        delay = self.latency_ms / 1000 * self._random.lognormvariate(0.0, self.latency_sigma)
+        fail = self._random.random() < self.error_rate
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("simulated provider error")
+
+        citations = re.split(r"^### Citation \d+$", prompt, flags=re.MULTILINE)[1:]
+        if citations:
+            entries = [
+                {"id": number, "confidence": self._confidence(section), "reasoning": "Simulated analysis"}
+                for number, section in enumerate(citations, start=1)
+            ]
+            return {"text": json.dumps(entries), "tokens": len(prompt) // 4}
+
+        return {
+            "text": f"Confidence Score: {self._confidence(prompt):.2f}\n\nReasoning: Simulated analysis",
+            "tokens": len(prompt) // 4,
+        }
+
+    def _confidence(self, section: str) -> float:
+        """Same score for a citation whether it is scored alone or in a batch"""
+        status = re.search(r"Metadata Check: (\w+)", section)
+        base = self.BASE_CONFIDENCE.get(status.group(1) if status else "", 0.6)
+        citation = re.search(r"\*\*Citation:\*\*\n(.*)", section)
+        key = citation.group(1) if citation else section
+        offset = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return round(min(1.0, max(0.0, base + (offset - 0.5) * 0.2)), 2)
+
+
+def load_providers() -> List[LLMProvider]:
+    """Configured providers in preference order (OpenAI, then Gemini)"""
+    if settings.LLM_PROVIDER == FakeLLMProvider.name:
+        logger.warning("⚠️ Using the fake LLM provider - Layer 4 scores are simulated")
+        return [FakeLLMProvider()]
+
+    providers: List[LLMProvider] = []
+
+    if settings.OPENAI_API_KEY:
+        try:
+            providers.append(OpenAIProvider(settings.OPENAI_API_KEY))
+            logger.info("✅ OpenAI client initialized")
+        except Exception as e:
+            logger.warning(f"OpenAI initialization failed: {e}")
+
+    google_key = settings.GOOGLE_API_KEY or settings.GEMINI_API_KEY
+    if google_key:
+        try:
+            providers.append(GeminiProvider(google_key))
+            logger.info("✅ Gemini client initialized")
+        except Exception as e:
+            logger.warning(f"Gemini initialization failed: {e}")
+
+    return providers
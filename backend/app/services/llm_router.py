@@ -0,0 +1,133 @@
+"""
+LLM Router
+Sends each Layer 4 request to the healthiest configured provider, based on
+rolling latency and error rate, and fails over within the request deadline
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from loguru import logger
+
+from app.core.config import settings
+from app.services.llm_providers import LLMProvider, LLMProviderError
+
+
+class ProviderStats:
+    """
+    Rolling outcomes for one provider
+
+    Keeps the last ``max_samples`` calls that are younger than
+    ``window_seconds``; a provider that hasn't been used for a while has no
+    history and is probed again.
+    """
+
+    def __init__(self, max_samples: int, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, float, bool]] = deque(maxlen=max_samples)  # (at, latency, ok)
+
+    def record(self, latency: float, ok: bool):
+        self._samples.append((time.monotonic(), latency, ok))
+
+    def _recent(self) -> List[Tuple[float, float, bool]]:
+        cutoff = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        return list(self._samples)
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = self._recent()
+        latencies = [latency for _, latency, ok in samples if ok]
+        errors = sum(1 for _, _, ok in samples if not ok)
+        return {
+            "samples": len(samples),
+            "error_rate": round(errors / len(samples), 3) if samples else 0.0,
+            "mean_latency_ms": round(sum(latencies) / len(latencies) * 1000) if latencies else None,
+        }
+
+    def expected_seconds(self, error_penalty: float) -> float:
+        """Mean latency, counting each error as ``error_penalty`` extra seconds"""
+        samples = self._recent()
+        if not samples:
+            return 0.0  # Unknown - try it
+        latencies = [latency for _, latency, ok in samples if ok]
+        error_rate = sum(1 for _, _, ok in samples if not ok) / len(samples)
+        mean_latency = sum(latencies) / len(latencies) if latencies else error_penalty
+        return mean_latency + error_rate * error_penalty
+
+
+class LLMRouter:
+    """
+    Picks the provider with the lowest expected latency for each request
+
+    Ties (e.g. no history yet) keep the configured preference order. On an
+    error or timeout the next provider is tried, as long as the request
+    deadline hasn't passed.
+    """
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        deadline: float = settings.LLM_REQUEST_DEADLINE_SECONDS,
+        max_samples: int = settings.LLM_ROUTER_MAX_SAMPLES,
+        window_seconds: float = settings.LLM_ROUTER_WINDOW_SECONDS,
+    ):
+        self.providers = providers
+        self.deadline = deadline
+        self.stats = {p.name: ProviderStats(max_samples, window_seconds) for p in providers}
+
+    def ranked(self) -> List[LLMProvider]:
+        """Providers ordered healthiest first"""
+        return sorted(
+            self.providers,
+            key=lambda p: self.stats[p.name].expected_seconds(error_penalty=p.timeout),
+        )
+
+    async def complete(self, system: str, prompt: str, max_tokens: int = 500) -> Dict[str, Any]:
+        """
+        Run a completion on the healthiest provider, failing over on errors
+
+        Returns:
+            Provider response plus {"provider", "model", "latency_ms", "failed_over"}
+
+        Raises:
+            LLMProviderError if every provider failed or the deadline passed
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        errors = []
+
+        for provider in self.ranked():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                errors.append("request deadline exceeded")
+                break
+
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(provider.complete(system, prompt, max_tokens), remaining)
+            except (LLMProviderError, asyncio.TimeoutError) as e:
+                latency = time.perf_counter() - started
+                self.stats[provider.name].record(latency, ok=False)
+                message = str(e) or f"{provider.name} exceeded the request deadline"
+                logger.warning(f"⚠️ LLM provider {provider.name} failed after {latency:.1f}s: {message}")
+                errors.append(message)
+                continue
+
+            latency = time.perf_counter() - started
+            self.stats[provider.name].record(latency, ok=True)
+            return {
+                **response,
+                "provider": provider.name,
+                "model": provider.model,
+                "latency_ms": round(latency * 1000),
+                "failed_over": list(errors),
+            }
+
+        raise LLMProviderError("All LLM providers failed: " + "; ".join(errors))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-provider rolling stats (for the health endpoint)"""
+        return {name: stats.snapshot() for name, stats in self.stats.items()}
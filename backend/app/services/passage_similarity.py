@@ -0,0 +1,80 @@
+"""
+Passage-level Semantic Similarity
+Chunks a scraped document into overlapping passages and scores a claim
+against all of them with vectorized cosine similarity
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+def chunk_passages(
+    text: str,
+    size: int = 1000,
+    overlap: int = 200,
+    max_passages: int = 64,
+) -> List[Tuple[int, str]]:
+    """
+    Split text into overlapping character windows
+
+    Window starts are nudged forward to the next word boundary so passages
+    don't begin mid-word.
+
+    Returns:
+        List of (offset, passage) pairs, offset being the index into text
+    """
+    text_length = len(text)
+    if text_length <= size:
+        return [(0, text)] if text.strip() else []
+
+    step = max(size - overlap, 1)
+    passages = []
+    start = 0
+    while start < text_length and len(passages) < max_passages:
+        if start > 0 and not text[start - 1].isspace():
+            boundary = text.find(" ", start, start + 50)
+            if boundary != -1:
+                start = boundary + 1
+
+        passage = text[start:start + size]
+        if passage.strip():
+            passages.append((start, passage))
+        if start + size >= text_length:
+            break
+        start += step
+
+    return passages
+
+
+def score_passages(
+    query_embedding: np.ndarray,
+    passage_embeddings: np.ndarray,
+    top_k: int = 3,
+) -> Dict[str, Any]:
+    """
+    Cosine similarity of one query vector against every passage vector
+
+    Returns:
+        {
+            "max_score": float,  # Best passage similarity
+            "top_k_mean": float,  # Mean of the top_k best passages
+            "top_k_scores": List[float],
+            "best_index": int  # Index of the best passage
+        }
+    """
+    query = query_embedding / (np.linalg.norm(query_embedding) or 1.0)
+    norms = np.linalg.norm(passage_embeddings, axis=1)
+    norms[norms == 0.0] = 1.0
+    scores = (passage_embeddings @ query) / norms
+
+    k = min(top_k, len(scores))
+    top = np.sort(scores)[::-1][:k]
+    best_index = int(np.argmax(scores))
+
+    return {
+        "max_score": float(scores[best_index]),
+        "top_k_mean": float(top.mean()),
+        "top_k_scores": [round(float(s), 4) for s in top],
+        "best_index": best_index,
+    }
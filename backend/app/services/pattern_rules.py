@@ -0,0 +1,112 @@
+"""
+Pattern Rule Engine
+Compiles a rule set into a single regex so each text is scanned in one
+pass, reporting every rule's hits with their positions
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_RULES_FILE = Path(__file__).resolve().parent.parent / "data" / "hallucination_rules.json"
+
+RULE_KINDS = ("match", "required", "present")
+SEVERITY_WEIGHTS = {"high": 0.3, "medium": 0.15, "low": 0.05}
+
+# Named groups and numbered backreferences would collide once rules are merged
+_UNSUPPORTED_SYNTAX = re.compile(r"\(\?P[<=]|\\[1-9]")
+
+
+class PatternRuleSet:
+    """
+    A set of regex rules matched together
+
+    Each rule becomes an optional zero-width lookahead with its own named
+    group, ``(?:(?=(?P<rN>...)))?``, so every rule is tried at every
+    position in one left-to-right scan and overlapping hits from different
+    rules are all seen. A conditional chain after the lookaheads makes the
+    combined pattern fail where no rule matched, so the scan only stops at
+    positions with at least one hit. Per-rule flags are scoped with
+    ``(?i:...)``.
+
+    Rules (dicts):
+        name, pattern, severity, description
+        kind: "match" (every hit) | "required" (flag if absent) | "present" (flag once)
+        ignore_case: bool (default False)
+        weight: score added per flag (default by severity)
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules = [self._validate(rule) for rule in rules]
+
+        lookaheads = []
+        for index, rule in enumerate(self.rules):
+            body = f"(?i:{rule['pattern']})" if rule["ignore_case"] else f"(?:{rule['pattern']})"
+            lookaheads.append(f"(?:(?=(?P<r{index}>{body})))?")
+
+        # (?(r0)|(?(r1)|...(?!))) - succeed iff some rule group matched here
+        chain = "(?!)"
+        for index in reversed(range(len(self.rules))):
+            chain = f"(?(r{index})|{chain})"
+
+        self._matcher = re.compile("".join(lookaheads) + chain)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_RULES_FILE) -> "PatternRuleSet":
+        """Load rules from a JSON file ({"rules": [...]})"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["rules"])
+
+    @staticmethod
+    def _validate(rule: Dict[str, Any]) -> Dict[str, Any]:
+        missing = {"name", "pattern", "severity", "description"} - rule.keys()
+        if missing:
+            raise ValueError(f"Rule {rule.get('name', '?')} is missing {sorted(missing)}")
+
+        kind = rule.get("kind", "match")
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Rule {rule['name']}: unknown kind '{kind}'")
+
+        if _UNSUPPORTED_SYNTAX.search(rule["pattern"]):
+            raise ValueError(f"Rule {rule['name']}: named groups and backreferences are not supported")
+        try:
+            re.compile(rule["pattern"])
+        except re.error as e:
+            raise ValueError(f"Rule {rule['name']}: invalid pattern: {e}") from e
+
+        return {
+            "name": rule["name"],
+            "pattern": rule["pattern"],
+            "kind": kind,
+            "ignore_case": bool(rule.get("ignore_case", False)),
+            "severity": rule["severity"],
+            "description": rule["description"],
+            "weight": float(rule.get("weight", SEVERITY_WEIGHTS.get(rule["severity"], 0.05))),
+        }
+
+    def scan(self, text: str) -> List[List[Tuple[int, str]]]:
+        """
+        Hits per rule, in rule order: lists of (position, matched_text)
+
+        A rule's hits are exactly what ``re.finditer`` would return for that
+        rule alone - hits overlapping an earlier hit of the same rule are
+        dropped. (Rules that can match the empty string are the exception:
+        the lookahead only sees a position's first match, so finditer's
+        extra non-empty match at an empty hit's position is not reported.)
+        """
+        hits: List[List[Tuple[int, str]]] = [[] for _ in self.rules]
+        next_allowed = [0] * len(self.rules)
+
+        for match in self._matcher.finditer(text):
+            for group, value in match.groupdict().items():
+                if value is None:
+                    continue
+                index = int(group[1:])
+                start, end = match.span(group)
+                if start < next_allowed[index]:
+                    continue
+                hits[index].append((start, value))
+                next_allowed[index] = end if end > start else start + 1
+
+        return hits
@@ -0,0 +1,125 @@
+"""
+Quote Locator
+Finds where a (possibly paraphrased or mistyped) quote best matches inside a
+long context, without comparing the quote against the whole context
+"""
+
+from array import array
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+GRAM = 3
+MAX_POSTINGS = 2000  # Grams this common ("the", " of") carry no position information
+MAX_CANDIDATES = 3
+
+
+class QuoteLocator:
+    """
+    Character-trigram index over a context
+
+    Build once per context, then call ``locate`` for each quote. Every
+    trigram of the quote that occurs in the context votes for the window
+    start it implies (occurrence position minus its offset in the quote).
+    Only the few most-voted windows are aligned with SequenceMatcher, so a
+    lookup costs roughly the number of trigram occurrences instead of
+    quote length times context length.
+
+    Matching is case-insensitive and treats any whitespace run as one
+    space; offsets are reported in the original context.
+    """
+
+    def __init__(self, context: str):
+        self.context = context
+
+        # Normalized text plus, per normalized char, its offset in `context`
+        chars: List[str] = []
+        self._offsets = array("l")
+        previous_space = True
+        for index, char in enumerate(context):
+            if char.isspace():
+                if previous_space:
+                    continue
+                chars.append(" ")
+                self._offsets.append(index)
+                previous_space = True
+                continue
+            for lowered in char.lower():
+                chars.append(lowered)
+                self._offsets.append(index)
+            previous_space = False
+        self.text = "".join(chars)
+
+        self._index: Dict[str, List[int]] = defaultdict(list)
+        for position in range(len(self.text) - GRAM + 1):
+            self._index[self.text[position:position + GRAM]].append(position)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def locate(self, quote: str) -> Optional[Dict[str, Any]]:
+        """
+        Best-matching window for a quote
+
+        Returns:
+            {
+                "score": float,  # 0-1, SequenceMatcher ratio against the window
+                "start": int,  # Offsets into the original context
+                "end": int,
+                "matched": str
+            }
+            or None if nothing in the context resembles the quote
+        """
+        needle = self.normalize(quote)
+        if not needle or not self.text:
+            return None
+
+        exact = self.text.find(needle)
+        if exact >= 0:
+            return self._result(1.0, exact, exact + len(needle))
+
+        if len(needle) < GRAM:
+            return None
+
+        # Vote for window starts; buckets absorb small insertions/deletions
+        bucket = max(1, len(needle) // 4)
+        votes: Counter = Counter()
+        for offset in range(len(needle) - GRAM + 1):
+            postings = self._index.get(needle[offset:offset + GRAM])
+            if not postings or len(postings) > MAX_POSTINGS:
+                continue
+            for position in postings:
+                votes[(position - offset) // bucket] += 1
+
+        best = None
+        for slot, _ in votes.most_common(MAX_CANDIDATES):
+            low = max(0, slot * bucket - bucket)
+            high = min(len(self.text), slot * bucket + len(needle) + 2 * bucket)
+            candidate = self._align(needle, low, high)
+            if candidate and (best is None or candidate[0] > best[0]):
+                best = candidate
+
+        return self._result(*best) if best else None
+
+    def _align(self, needle: str, low: int, high: int):
+        """(score, start, end) of the needle aligned inside text[low:high]"""
+        matcher = SequenceMatcher(None, needle, self.text[low:high], autojunk=False)
+        blocks = [block for block in matcher.get_matching_blocks() if block.size]
+        if not blocks:
+            return None
+
+        start = low + blocks[0].b
+        end = low + blocks[-1].b + blocks[-1].size
+        matched = sum(block.size for block in blocks)
+        return 2.0 * matched / (len(needle) + end - start), start, end
+
+    def _result(self, score: float, start: int, end: int) -> Dict[str, Any]:
+        original_start = self._offsets[start]
+        original_end = self._offsets[end - 1] + 1
+        return {
+            "score": round(score, 3),
+            "start": original_start,
+            "end": original_end,
+            "matched": self.context[original_start:original_end],
+        }
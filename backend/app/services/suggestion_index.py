@@ -0,0 +1,308 @@
+"""
+Citation Suggestion Index
+Local nearest-neighbour index over title+abstract embeddings of known papers,
+used to suggest real alternatives for suspicious or fake citations
+
+Build once from a JSON-lines metadata dump (one paper per line with "title"
+and optionally "abstract", "authors", "year", "doi", "url"):
+    python -m app.services.suggestion_index build papers.jsonl --out data/suggestion-index
+
+Then set SUGGESTION_INDEX_DIR=data/suggestion-index. The vector matrix and
+the paper metadata (JSON lines plus a line offset table) are memory-mapped,
+so the index costs page cache rather than per-worker RSS and is shared by
+every worker on the host. Only the papers actually suggested are parsed.
+"""
+
+import argparse
+import asyncio
+import json
+import mmap
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+from app.models.schemas import CitationSuggestion
+from app.services.embedding_backends import load_backend
+from app.services.embedding_service import embedding_service
+
+VECTORS_FILE = "vectors.npy"
+PAPERS_FILE = "papers.jsonl"
+OFFSETS_FILE = "papers.offsets.npy"  # Byte offset of each line in PAPERS_FILE, plus the end
+MANIFEST_FILE = "index.json"
+
+# Rows scored per matrix product - bounds temporary memory on large indexes
+SEARCH_CHUNK_ROWS = 65536
+
+
+def _paper_text(paper: Dict[str, Any]) -> str:
+    """Text embedded for a paper: title + abstract"""
+    return f"{paper.get('title', '')}. {paper.get('abstract') or ''}".strip()
+
+
+def _embedding_identity() -> Dict[str, Any]:
+    """What an index's vectors depend on: the model and whether it is int8-quantized"""
+    return {"model": embedding_service.model_name, "quantized": embedding_service.quantized}
+
+
+class SuggestionIndex:
+    """
+    Exact inner-product search over normalized vectors (flat index)
+
+    Queries are answered in batch: one matrix product per chunk of index rows
+    for all queries at once, with a running top-k merge.
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = Path(index_dir)
+        self.vectors: Optional[np.ndarray] = None
+        self.manifest: Dict[str, Any] = {}
+        self._papers: Optional[mmap.mmap] = None
+        self._offsets: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return 0 if self._offsets is None else len(self._offsets) - 1
+
+    def load(self) -> bool:
+        """
+        Memory-map the index; returns False if it is missing or incompatible
+
+        Blocking (file IO) - call it off the event loop.
+        """
+        try:
+            self.manifest = json.loads((self.index_dir / MANIFEST_FILE).read_text())
+            self.vectors = np.load(self.index_dir / VECTORS_FILE, mmap_mode="r")
+            with open(self.index_dir / PAPERS_FILE, "rb") as f:
+                self._papers = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            offsets_path = self.index_dir / OFFSETS_FILE
+            if offsets_path.exists():
+                self._offsets = np.load(offsets_path, mmap_mode="r")
+            else:
+                # Index built before offset tables existed
+                self._offsets = _line_offsets(self._papers)
+            if len(self) != len(self.vectors):
+                raise ValueError(f"{len(self)} papers but {len(self.vectors)} vectors")
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Suggestion index unavailable ({self.index_dir}): {e}")
+            self.vectors = None
+            return False
+
+        # Only the model and its quantization change the vectors, not how they are served
+        expected = _embedding_identity()
+        if self.manifest.get("embedding") != expected:
+            logger.warning(
+                f"⚠️ Suggestion index built with {self.manifest.get('embedding')}, "
+                f"but the API embeds with {expected} - suggestions disabled"
+            )
+            self.vectors = None
+            return False
+
+        logger.info(f"✅ Suggestion index loaded: {len(self)} papers")
+        return True
+
+    def paper(self, paper_id: int) -> Dict[str, Any]:
+        """Metadata of one paper, parsed from the mapped file on demand"""
+        start, end = int(self._offsets[paper_id]), int(self._offsets[paper_id + 1])
+        return json.loads(self._papers[start:end])
+
+    def search(self, queries: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+        """
+        Top-k most similar papers for each query vector
+
+        Returns:
+            Per query, a list of (paper_index, cosine_score), best first
+        """
+        queries = queries / np.clip(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12, None)
+        query_count = len(queries)
+        best_scores = np.full((query_count, 0), -np.inf, dtype=np.float32)
+        best_ids = np.empty((query_count, 0), dtype=np.int64)
+
+        for start in range(0, len(self.vectors), SEARCH_CHUNK_ROWS):
+            chunk = np.asarray(self.vectors[start:start + SEARCH_CHUNK_ROWS])
+            scores = queries @ chunk.T  # (queries, rows)
+            ids = np.broadcast_to(np.arange(start, start + len(chunk)), scores.shape)
+
+            # Merge this chunk's candidates with the running top-k
+            scores = np.concatenate([best_scores, scores], axis=1)
+            ids = np.concatenate([best_ids, ids], axis=1)
+            keep = min(k, scores.shape[1])
+            top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_ids = np.take_along_axis(ids, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        return [
+            [(int(i), float(s)) for i, s in zip(row_ids, row_scores)]
+            for row_ids, row_scores in zip(best_ids, best_scores)
+        ]
+
+
+class SuggestionEngine:
+    """Embeds citations and looks up similar known papers"""
+
+    def __init__(
+        self,
+        index_dir: str = settings.SUGGESTION_INDEX_DIR,
+        top_k: int = settings.SUGGESTION_TOP_K,
+        min_score: float = settings.SUGGESTION_MIN_SCORE,
+    ):
+        self.index = SuggestionIndex(index_dir) if index_dir else None
+        self.top_k = top_k
+        self.min_score = min_score
+
+    async def load(self):
+        """Load the index in a worker thread (done once at startup)"""
+        if self.index is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.index.load)
+
+    @property
+    def available(self) -> bool:
+        return self.index is not None and self.index.vectors is not None
+
+    async def suggest_many(self, citations: List[str]) -> List[List[CitationSuggestion]]:
+        """Suggestions for several citations with one embedding call and one search"""
+        if not citations or not self.available:
+            return [[] for _ in citations]
+
+        queries = await embedding_service.encode(citations)
+
+        # numpy releases the GIL for the matrix products
+        loop = asyncio.get_running_loop()
+        hits = await loop.run_in_executor(None, self.index.search, queries, self.top_k)
+
+        return [
+            [
+                self._to_suggestion(self.index.paper(paper_id), score)
+                for paper_id, score in citation_hits
+                if score >= self.min_score
+            ]
+            for citation_hits in hits
+        ]
+
+    async def suggest(self, citation: str) -> List[CitationSuggestion]:
+        """Suggestions for a single citation"""
+        return (await self.suggest_many([citation]))[0]
+
+    @staticmethod
+    def _to_suggestion(paper: Dict[str, Any], score: float) -> CitationSuggestion:
+        doi = paper.get("doi")
+        return CitationSuggestion(
+            title=paper.get("title", "Untitled"),
+            authors=paper.get("authors"),
+            year=paper.get("year"),
+            doi=doi,
+            url=paper.get("url") or (f"https://doi.org/{doi}" if doi else None),
+            confidence=round(score, 3),
+            reason=f"Semantically similar title/abstract ({score:.0%} match)",
+        )
+
+
+def _line_offsets(data) -> np.ndarray:
+    """Start offset of every line in a JSON-lines buffer, plus its end"""
+    offsets = [0]
+    position = data.find(b"\n")
+    while position != -1:
+        offsets.append(position + 1)
+        position = data.find(b"\n", position + 1)
+    if offsets[-1] != len(data):
+        offsets.append(len(data))  # Last line without a newline
+    return np.array(offsets, dtype=np.int64)
+
+
+def build_index(dump_path: str, index_dir: str, batch_size: int = 256) -> int:
+    """
+    Build an index directory from a JSON-lines metadata dump
+
+    Streams the dump and writes vectors straight into a memory-mapped .npy
+    file, so memory stays flat regardless of dump size.
+
+    Returns:
+        Number of indexed papers
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(dump_path, encoding="utf-8") as f:
+        total = sum(1 for line in f if line.strip() and json.loads(line).get("title"))
+    if not total:
+        raise ValueError(f"No papers with a title in {dump_path}")
+
+    backend = load_backend(embedding_service.backend, embedding_service.model_name)
+    vectors = None
+    offsets = np.lib.format.open_memmap(
+        index_dir / OFFSETS_FILE, mode="w+", dtype=np.int64, shape=(total + 1,)
+    )
+    offsets[0] = 0
+    count = 0
+
+    def flush(batch: List[Dict[str, Any]]):
+        nonlocal vectors, count
+        embedded = backend.encode([_paper_text(p) for p in batch], batch_size=batch_size)
+        embedded /= np.clip(np.linalg.norm(embedded, axis=1, keepdims=True), 1e-12, None)
+        if vectors is None:
+            vectors = np.lib.format.open_memmap(
+                index_dir / VECTORS_FILE, mode="w+", dtype=np.float32, shape=(total, embedded.shape[1])
+            )
+        vectors[count:count + len(batch)] = embedded
+        for paper in batch:
+            line = (json.dumps(paper, ensure_ascii=False) + "\n").encode("utf-8")
+            offsets[count + 1] = offsets[count] + len(line)
+            papers_out.write(line)
+            count += 1
+        logger.info(f"Indexed {count}/{total} papers")
+
+    with open(dump_path, encoding="utf-8") as dump, \
+            open(index_dir / PAPERS_FILE, "wb") as papers_out:
+        batch = []
+        for line in dump:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not record.get("title"):
+                continue
+            batch.append({
+                "title": record["title"],
+                "abstract": record.get("abstract"),
+                "authors": record.get("authors"),
+                "year": record.get("year"),
+                "doi": record.get("doi"),
+                "url": record.get("url"),
+            })
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+    vectors.flush()
+    offsets.flush()
+    del vectors, offsets
+
+    manifest = {
+        "embedding": _embedding_identity(),
+        "count": count,
+    }
+    (index_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    logger.info(f"✅ Suggestion index written to {index_dir} ({count} papers)")
+    return count
+
+
+# Global suggestion engine instance
+suggestion_engine = SuggestionEngine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Citation suggestion index tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="Build an index from a JSON-lines metadata dump")
+    build.add_argument("dump", help="Path to papers.jsonl")
+    build.add_argument("--out", default=settings.SUGGESTION_INDEX_DIR or "data/suggestion-index")
+    build.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    build_index(args.dump, args.out, batch_size=args.batch_size)
@@ -0,0 +1,166 @@
+"""
+URL Liveness Checker
+Concurrent link checks with HEAD → ranged-GET fallback, a per-URL status
+cache with status-dependent TTLs, and redirect-chain reuse
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import httpx
+from loguru import logger
+
+from app.core.cache import cache_service
+from app.core.config import settings
+from app.core.http import get_http_client
+
+# HEAD rejections that usually mean "use GET", not "broken"
+HEAD_FALLBACK_STATUS = {400, 403, 405, 406, 501}
+
+USER_AGENT = "HalluxBot/1.0 (Academic Citation Verification; +https://hallux.ai)"
+
+
+def status_ttl(status_code: Optional[int]) -> int:
+    """How long a check result stays valid, by outcome"""
+    if status_code is None:
+        return settings.URL_CHECK_TTL_NETWORK_ERROR
+    if 200 <= status_code < 400:
+        return settings.URL_CHECK_TTL_OK
+    if status_code in (404, 410):
+        return settings.URL_CHECK_TTL_NOT_FOUND
+    # 403/429/5xx are often transient (bot walls, rate limits, outages)
+    return settings.URL_CHECK_TTL_ERROR
+
+
+class UrlChecker:
+    """
+    Checks URL liveness for Layer 1
+
+    Results are cached per URL in-process and in the shared cache. Every hop
+    of a redirect chain is cached with the final outcome, so e.g. a doi.org
+    link resolves over the network only once. Concurrent checks of the same
+    URL share a single request.
+    """
+
+    def __init__(self, timeout: float = 10.0, max_local_entries: int = 10000):
+        self.timeout = timeout
+        self.max_local_entries = max_local_entries
+        self._local: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def check_many(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Check URLs concurrently, results in input order
+
+        Each result:
+            {
+                "url": str,
+                "status_code": Optional[int],  # None on network error
+                "final_url": str,
+                "redirects": List[str],  # Hops before final_url
+                "method": str,  # "HEAD" or "GET" (ranged fallback)
+                "error": Optional[str],
+                "cached": bool
+            }
+        """
+        return await asyncio.gather(*(self.check(url) for url in urls))
+
+    async def check(self, url: str) -> Dict[str, Any]:
+        """Check one URL, using the cache and de-duplicating in-flight checks"""
+        cached = await self._get_cached(url)
+        if cached is not None:
+            return {**cached, "url": url, "cached": True}
+
+        # The probe runs detached, so a cancelled caller never cancels it for the others
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._probe_and_store(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda done: self._probe_done(url, done))
+        return {**(await asyncio.shield(task)), "url": url}
+
+    async def _probe_and_store(self, url: str) -> Dict[str, Any]:
+        result = await self._probe(url)
+        await self._store(result)
+        return result
+
+    def _probe_done(self, url: str, task: asyncio.Task):
+        del self._inflight[url]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved when every caller was cancelled
+
+    # ========== PROBING ==========
+
+    async def _probe(self, url: str) -> Dict[str, Any]:
+        client = get_http_client()
+        request_options = {
+            "headers": {"User-Agent": USER_AGENT},
+            "follow_redirects": True,
+            "timeout": self.timeout,
+        }
+        method = "HEAD"
+        try:
+            response = await client.head(url, **request_options)
+            if response.status_code in HEAD_FALLBACK_STATUS:
+                # Many publishers reject HEAD - ask for a single byte instead
+                method = "GET"
+                request_options["headers"]["Range"] = "bytes=0-0"
+                async with client.stream("GET", url, **request_options) as streamed:
+                    response = streamed
+        except httpx.RequestError as e:
+            logger.warning(f"URL check failed for {url}: {e}")
+            return {
+                "url": url,
+                "status_code": None,
+                "final_url": url,
+                "redirects": [],
+                "method": method,
+                "error": str(e) or type(e).__name__,
+                "cached": False,
+            }
+
+        return {
+            "url": url,
+            "status_code": response.status_code,
+            "final_url": str(response.url),
+            "redirects": [str(hop.url) for hop in response.history],
+            "method": method,
+            "error": None,
+            "cached": False,
+        }
+
+    # ========== CACHE ==========
+
+    async def _get_cached(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(url)
+        if entry is not None:
+            if entry["expires_at"] > time.time():
+                self._local.move_to_end(url)
+                return entry["result"]
+            del self._local[url]
+
+        result = await cache_service.get(cache_service.make_key("urlstatus", url))
+        if result is not None:
+            self._put_local(url, result, status_ttl(result.get("status_code")))
+        return result
+
+    async def _store(self, result: Dict[str, Any]):
+        ttl = status_ttl(result["status_code"])
+        cached = {k: v for k, v in result.items() if k not in ("url", "cached")}
+
+        # Cache the requested URL, every redirect hop and the final URL
+        for url in dict.fromkeys([result["url"], *result["redirects"], result["final_url"]]):
+            self._put_local(url, cached, ttl)
+            await cache_service.set(cache_service.make_key("urlstatus", url), cached, ttl=ttl)
+
+    def _put_local(self, url: str, result: Dict[str, Any], ttl: int):
+        self._local[url] = {"result": result, "expires_at": time.time() + ttl}
+        self._local.move_to_end(url)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+
+# Global URL checker instance
+url_checker = UrlChecker()
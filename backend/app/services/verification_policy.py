@@ -0,0 +1,142 @@
+"""
+Verification Policies
+Rules that decide, from deterministic layer results, when the expensive
+layers can be skipped
+"""
+
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.models.schemas import LayerResult, LayerStatus
+
+
+class AIGatingPolicy:
+    """
+    Decides whether Layer 4 (LLM scoring) is needed after Layers 1-3
+
+    The LLM is only called for inconclusive citations. A DOI whose
+    citation details (authors and year by default) were actually compared
+    with Crossref and matched, or a DOI that Crossref doesn't know, already
+    settles the verdict. Identifiers that merely resolve (e.g. arXiv IDs)
+    still go to the LLM.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = settings.AI_GATING_ENABLED,
+        confirm_fields: List[str] = settings.AI_GATING_CONFIRM_FIELDS,
+        reject_status_codes: List[int] = settings.AI_GATING_REJECT_STATUS_CODES,
+        rejected_confidence: float = settings.AI_GATING_REJECTED_CONFIDENCE,
+    ):
+        self.enabled = enabled
+        self.confirm_fields = list(confirm_fields)
+        self.reject_status_codes = set(reject_status_codes)
+        self.rejected_confidence = rejected_confidence
+
+    def evaluate(
+        self,
+        url_result: LayerResult,
+        metadata_result: LayerResult,
+        content_result: LayerResult,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Check whether Layers 1-3 are conclusive
+
+        Returns:
+            None if the LLM should be called, otherwise:
+            {
+                "decision": "confirmed" | "rejected",
+                "reason": str,  # Why the LLM was skipped
+                "confidence": float  # Stands in for the LLM's score
+            }
+        """
+        if not self.enabled:
+            return None
+
+        metadata = metadata_result.metadata or {}
+
+        # Decisive rejection: registry says the identifier doesn't exist
+        crossref_status = metadata.get("crossref_status")
+        if crossref_status in self.reject_status_codes:
+            return {
+                "decision": "rejected",
+                "reason": f"DOI not found in Crossref (HTTP {crossref_status})",
+                "confidence": self.rejected_confidence,
+            }
+
+        if metadata_result.status == LayerStatus.FAILED and url_result.status == LayerStatus.FAILED:
+            return {
+                "decision": "rejected",
+                "reason": "Metadata check and URL validation both failed",
+                "confidence": self.rejected_confidence,
+            }
+
+        # Decisive confirmation: Crossref compared the citation's details and
+        # they match, with no contradicting evidence from the other layers
+        matched_fields = metadata.get("matched_fields") or []
+        if (
+            metadata_result.status == LayerStatus.PASSED
+            and metadata.get("source") == "crossref"
+            and self.confirm_fields
+            and all(field in matched_fields for field in self.confirm_fields)
+            and not metadata.get("mismatches")
+            and url_result.status != LayerStatus.FAILED
+            and content_result.status != LayerStatus.FAILED
+        ):
+            return {
+                "decision": "confirmed",
+                "reason": f"Crossref record matches the citation's {' and '.join(self.confirm_fields)}",
+                "confidence": metadata_result.confidence,
+            }
+
+        return None
+
+
+class EarlyExitPolicy:
+    """
+    Stops a verification once its verdict can no longer change
+
+    The overall status is FAKE as soon as two layers fail (see
+    VerificationService._calculate_overall_status), so once that many
+    finished layers have failed, the remaining layers - content scraping,
+    AI scoring and the citation graph - can't change the outcome.
+    """
+
+    LAYER_LABELS = {
+        "url_validation": "URL validation",
+        "metadata_check": "metadata check",
+        "content_verification": "content verification",
+    }
+
+    def __init__(
+        self,
+        enabled: bool = settings.EARLY_EXIT_ENABLED,
+        min_failed_layers: int = settings.EARLY_EXIT_MIN_FAILED_LAYERS,
+    ):
+        self.enabled = enabled
+        self.min_failed_layers = min_failed_layers
+
+    def evaluate(self, completed: Dict[str, LayerResult]) -> Optional[str]:
+        """
+        Check the layers finished so far
+
+        Args:
+            completed: Finished layer results by layer name
+
+        Returns:
+            Reason to stop, or None to keep going
+        """
+        if not self.enabled:
+            return None
+
+        failed = [name for name, result in completed.items() if result.status == LayerStatus.FAILED]
+        if len(failed) < self.min_failed_layers:
+            return None
+
+        labels = [self.LAYER_LABELS.get(name, name) for name in failed]
+        return f"Verdict already determined - {' and '.join(labels)} failed"
+
+
+# Global policy instances
+ai_gating_policy = AIGatingPolicy()
+early_exit_policy = EarlyExitPolicy()
@@ -5,11 +5,11 @@ Implements 5-layer verification system
 
 import re
 import asyncio
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from loguru import logger
 from datetime import datetime
-import httpx
 
+from app.core.config import settings
 from app.models.schemas import (
     VerificationResult,
     TextVerificationResult,
@@ -24,6 +24,15 @@ from app.models.schemas import (
 from app.services.ai_service import ai_service
 from app.services.hallucination_models import hallucination_detector
 from app.services.advanced_verification import advanced_verifier
+from app.services.suggestion_index import suggestion_engine
+from app.services.url_checker import url_checker
+from app.services.verification_policy import ai_gating_policy, early_exit_policy
+
+
+MAX_TEXT_CITATIONS = 20  # Citations verified per text/document (demo limit)
+
+# Sentence end, as VerificationService._extract_citations splits sentences
+_SENTENCE_BOUNDARY = re.compile(r'[.!?]\s+')
 
 
 class VerificationService:
@@ -62,37 +71,166 @@ class VerificationService:
         """
         logger.info(f"Starting verification for: {citation[:100]}")
         
-        # Run verification layers in parallel where possible
-        tasks = []
+        # Layers 1-3 (may stop early once the verdict is settled)
+        url_result, metadata_result, content_result, exit_reason = await self._run_technical_layers(
+            citation, context, options
+        )
         
-        # Layer 1: URL Validation (fast, always run first)
-        url_result = await self._verify_url(citation)
+        # Layer 4: AI Scoring (after other layers complete)
+        if exit_reason:
+            ai_result = self._policy_skipped_layer("ai_scoring", exit_reason)
+        elif options.enable_ai_scoring:
+            ai_result = await self._ai_confidence_scoring(
+                citation, context, url_result, metadata_result, content_result,
+                use_cache=options.use_cache
+            )
+        else:
+            ai_result = await self._skip_layer("ai_scoring", "Disabled by options")
         
-        # Layer 2: Metadata Check (parallel with Layer 3)
-        tasks.append(self._verify_metadata(citation))
+        return await self._finish_verification(
+            citation, url_result, metadata_result, content_result, ai_result, options, exit_reason
+        )
+    
+    async def _verify_many(
+        self,
+        citations: List[str],
+        options: VerificationOptions,
+        limit: Optional[asyncio.Semaphore] = None
+    ) -> List[Any]:
+        """
+        Verify several citations, scoring Layer 4 for all of them together
         
-        # Layer 3: Content Verification (if enabled)
-        if options.check_content:
-            tasks.append(self._verify_content(citation, context))
-        else:
-            tasks.append(self._skip_layer("content_verification", "Disabled by options"))
+        Layers 1-3 run concurrently for up to VERIFY_MAX_CONCURRENT_CITATIONS
+        citations at a time, then the citations that got that far are
+        AI-scored with batched LLM requests. Callers that verify in several
+        calls pass a shared limit to bound them together.
         
-        # Run parallel tasks
-        metadata_result, content_result = await asyncio.gather(*tasks)
+        Returns:
+            VerificationResult or the raised exception (possibly CancelledError), per citation in order
+        """
+        limit = limit or asyncio.Semaphore(settings.VERIFY_MAX_CONCURRENT_CITATIONS)
         
-        # Layer 4: AI Scoring (after other layers complete)
-        if options.enable_ai_scoring:
-            ai_result = await self._ai_confidence_scoring(
-                citation, context, url_result, metadata_result, content_result
+        async def technical_layers(citation: str):
+            async with limit:
+                return await self._run_technical_layers(citation, None, options)
+        
+        technical = await asyncio.gather(
+            *(technical_layers(c) for c in citations),
+            return_exceptions=True
+        )
+        # BaseException: a cancelled layer pipeline comes back as CancelledError
+        ready = [i for i, layers in enumerate(technical) if not isinstance(layers, BaseException)]
+        to_score = [i for i in ready if not technical[i][3]]
+        
+        ai_results: Dict[int, LayerResult] = {}
+        if options.enable_ai_scoring and to_score:
+            scored = await self._ai_confidence_scoring_batch(
+                [(citations[i], None, *technical[i][:3]) for i in to_score],
+                use_cache=options.use_cache
             )
+            ai_results = dict(zip(to_score, scored))
+        
+        async def finish(index: int):
+            url_result, metadata_result, content_result, exit_reason = technical[index]
+            if exit_reason:
+                ai_result = self._policy_skipped_layer("ai_scoring", exit_reason)
+            else:
+                ai_result = ai_results.get(index) or await self._skip_layer("ai_scoring", "Disabled by options")
+            return await self._finish_verification(
+                citations[index], url_result, metadata_result, content_result, ai_result, options, exit_reason,
+                suggest=False
+            )
+        
+        finished = await asyncio.gather(*(finish(i) for i in ready), return_exceptions=True)
+        results: List[Any] = list(technical)
+        for i, result in zip(ready, finished):
+            results[i] = result
+        
+        # Suggestions for all suspicious/fake citations with one lookup
+        needing = [r for r in results if isinstance(r, VerificationResult) and self._needs_suggestions(r.status)]
+        if needing:
+            suggestions = await self._generate_suggestions_many([r.citation for r in needing])
+            for result, found in zip(needing, suggestions):
+                result.suggestions = found
+        return results
+    
+    async def _run_technical_layers(
+        self,
+        citation: str,
+        context: Optional[str],
+        options: VerificationOptions
+    ) -> Tuple[LayerResult, LayerResult, LayerResult, Optional[str]]:
+        """
+        Layers 1-3: URL, metadata and content checks, run concurrently
+        
+        After each layer finishes the early-exit policy is consulted; once
+        the verdict is settled the remaining layers are cancelled and
+        marked as skipped by policy.
+        
+        Returns:
+            (url_result, metadata_result, content_result, early-exit reason or None)
+        """
+        completed: Dict[str, LayerResult] = {}
+        
+        # Layers 1 and 2 always run; Layer 3 (slowest) only if enabled
+        tasks = {
+            "url_validation": asyncio.create_task(self._verify_url(citation)),
+            "metadata_check": asyncio.create_task(self._verify_metadata(citation)),
+        }
+        if options.check_content:
+            tasks["content_verification"] = asyncio.create_task(self._verify_content(citation, context))
         else:
-            ai_result = await self._skip_layer("ai_scoring", "Disabled by options")
+            completed["content_verification"] = await self._skip_layer("content_verification", "Disabled by options")
         
+        exit_reason = None
+        pending = set(tasks.values())
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for name, task in tasks.items():
+                    if task in done:
+                        completed[name] = task.result()
+                
+                exit_reason = early_exit_policy.evaluate(completed)
+                if exit_reason:
+                    logger.info(f"⏹️ Early exit: {exit_reason}")
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+                # Retrieve the outcome so a late failure isn't logged as unhandled
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        
+        for name in tasks:
+            if name not in completed:
+                completed[name] = self._policy_skipped_layer(name, exit_reason)
+        
+        return (
+            completed["url_validation"],
+            completed["metadata_check"],
+            completed["content_verification"],
+            exit_reason,
+        )
+    
+    async def _finish_verification(
+        self,
+        citation: str,
+        url_result: LayerResult,
+        metadata_result: LayerResult,
+        content_result: LayerResult,
+        ai_result: LayerResult,
+        options: VerificationOptions,
+        exit_reason: Optional[str] = None,
+        suggest: bool = True
+    ) -> VerificationResult:
+        """Layer 5, aggregation and (unless suggest is False) suggestions"""
         # Layer 5: Citation Graph (optional, slower)
-        if options.enable_citation_graph:
-            graph_result = await self._citation_graph_analysis(citation)
-        else:
+        if not options.enable_citation_graph:
             graph_result = None
+        elif exit_reason:
+            graph_result = self._policy_skipped_layer("citation_graph", exit_reason)
+        else:
+            graph_result = await self._citation_graph_analysis(citation)
         
         # Aggregate results
         verification_layers = VerificationLayers(
@@ -111,7 +249,7 @@ class VerificationService:
         
         # Generate suggestions if citation is suspicious/fake
         suggestions = []
-        if status in [VerificationStatus.SUSPICIOUS, VerificationStatus.FAKE]:
+        if suggest and self._needs_suggestions(status):
             suggestions = await self._generate_suggestions(citation)
         
         return VerificationResult(
@@ -124,6 +262,7 @@ class VerificationService:
             metadata={
                 "processing_time_ms": 0,  # Will be set by API handler
                 "timestamp": datetime.utcnow().isoformat(),
+                **({"early_exit": exit_reason} if exit_reason else {}),
             },
         )
     
@@ -143,33 +282,31 @@ class VerificationService:
         logger.info(f"Found {len(citations)} potential citations")
         
         if not citations:
-            return TextVerificationResult(
-                total_citations=0,
-                verified_count=0,
-                suspicious_count=0,
-                fake_count=0,
-                results=[],
-                overall_confidence=100.0,
-                processing_time_ms=0,
-            )
+            return self._text_result(0, [])
         
-        # Verify each citation
+        # Verify each citation (Layer 4 is scored in batches)
         results = []
-        for citation in citations[:20]:  # Limit to first 20 for demo
-            try:
-                result = await self.verify_single_citation(citation, None, options)
+        for result in await self._verify_many(citations[:MAX_TEXT_CITATIONS], options):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to verify citation: {result}")
+            else:
                 results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to verify citation: {e}")
+        
+        return self._text_result(len(citations), results)
+    
+    def _text_result(self, total_citations: int, results: List[VerificationResult]) -> TextVerificationResult:
+        """Summary statistics for the verified citations of a text"""
         
         # Calculate statistics
         verified_count = sum(1 for r in results if r.status == VerificationStatus.VERIFIED)
         suspicious_count = sum(1 for r in results if r.status == VerificationStatus.SUSPICIOUS)
         fake_count = sum(1 for r in results if r.status == VerificationStatus.FAKE)
         overall_confidence = sum(r.confidence for r in results) / len(results) if results else 0
+        if not total_citations:
+            overall_confidence = 100.0  # Nothing to doubt
         
         return TextVerificationResult(
-            total_citations=len(citations),
+            total_citations=total_citations,
             verified_count=verified_count,
             suspicious_count=suspicious_count,
             fake_count=fake_count,
@@ -207,12 +344,11 @@ class VerificationService:
         batch_size = 10
         for i in range(0, len(citations), batch_size):
             batch = citations[i:i+batch_size]
-            tasks = [self.verify_single_citation(c, None, options) for c in batch]
             
             try:
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+                batch_results = await self._verify_many(batch, options)
                 for result in batch_results:
-                    if isinstance(result, Exception):
+                    if isinstance(result, BaseException):
                         failed += 1
                         logger.error(f"Citation verification failed: {result}")
                     else:
@@ -234,7 +370,7 @@ class VerificationService:
     async def _verify_url(self, citation: str) -> LayerResult:
         """
         Layer 1: Validate URLs in citation
-        Checks HTTP status, SSL, domain reputation
+        Checks HTTP status of all URLs concurrently (cached per URL)
         """
         logger.debug("Layer 1: URL Validation")
         
@@ -249,28 +385,37 @@ class VerificationService:
             )
         
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-                for url in urls[:3]:  # Check first 3 URLs only
-                    try:
-                        response = await client.head(url)
-                        
-                        if response.status_code == 200:
-                            return LayerResult(
-                                status=LayerStatus.PASSED,
-                                details=f"URL accessible: {url} (Status: {response.status_code})",
-                                confidence=0.95,
-                                metadata={"url": url, "status_code": response.status_code},
-                            )
-                        elif 400 <= response.status_code < 500:
-                            return LayerResult(
-                                status=LayerStatus.FAILED,
-                                details=f"URL broken: {url} (Status: {response.status_code})",
-                                confidence=0.1,
-                                metadata={"url": url, "status_code": response.status_code},
-                            )
-                    except httpx.RequestError as e:
-                        logger.warning(f"URL check failed for {url}: {e}")
-                        continue
+            results = await url_checker.check_many(urls[:3])  # Check first 3 URLs only
+            
+            # First decisive URL (in citation order) determines the outcome
+            for result in results:
+                url = result["url"]
+                status_code = result["status_code"]
+                metadata = {
+                    "url": url,
+                    "status_code": status_code,
+                    "final_url": result["final_url"],
+                    "redirects": result["redirects"],
+                    "method": result["method"],
+                    "cached": result["cached"],
+                }
+                
+                if status_code is None:
+                    continue
+                if 200 <= status_code < 300:
+                    return LayerResult(
+                        status=LayerStatus.PASSED,
+                        details=f"URL accessible: {url} (Status: {status_code})",
+                        confidence=0.95,
+                        metadata=metadata,
+                    )
+                elif 400 <= status_code < 500:
+                    return LayerResult(
+                        status=LayerStatus.FAILED,
+                        details=f"URL broken: {url} (Status: {status_code})",
+                        confidence=0.1,
+                        metadata=metadata,
+                    )
             
             return LayerResult(
                 status=LayerStatus.WARNING,
@@ -313,9 +458,12 @@ class VerificationService:
                         metadata={
                             "doi": doi,
                             "source": "crossref",
+                            "crossref_status": result.get("status_code"),
                             "title": result.get("actual_title"),
                             "authors": result.get("actual_authors"),
-                            "year": result.get("actual_year")
+                            "year": result.get("actual_year"),
+                            "compared_fields": result.get("compared_fields", []),
+                            "matched_fields": result.get("matched_fields", []),
                         },
                     )
                 else:
@@ -323,7 +471,14 @@ class VerificationService:
                         status=LayerStatus.FAILED if result["confidence"] < 0.3 else LayerStatus.WARNING,
                         details=result["reason"],
                         confidence=result["confidence"],
-                        metadata={"doi": doi, "mismatches": result.get("mismatches", [])},
+                        metadata={
+                            "doi": doi,
+                            "source": "crossref",
+                            "crossref_status": result.get("status_code"),
+                            "mismatches": result.get("mismatches", []),
+                            "compared_fields": result.get("compared_fields", []),
+                            "matched_fields": result.get("matched_fields", []),
+                        },
                     )
             except Exception as e:
                 logger.error(f"Crossref verification failed: {e}")
@@ -408,6 +563,8 @@ class VerificationService:
                     metadata={
                         "url": url,
                         "similarity_score": result.get("similarity_score"),
+                        "top_k_scores": result.get("top_k_scores"),
+                        "best_passage_offset": result.get("best_passage_offset"),
                         "content_length": result.get("content_length")
                     },
                 )
@@ -419,6 +576,8 @@ class VerificationService:
                     metadata={
                         "url": url,
                         "similarity_score": result.get("similarity_score"),
+                        "top_k_scores": result.get("top_k_scores"),
+                        "best_passage_offset": result.get("best_passage_offset"),
                         "flags": result.get("flags", [])
                     },
                 )
@@ -440,6 +599,7 @@ class VerificationService:
         url_result: LayerResult,
         metadata_result: LayerResult,
         content_result: LayerResult,
+        use_cache: bool = True,
     ) -> LayerResult:
         """
         Layer 4: AI analyzes citation for hallucination patterns
@@ -448,41 +608,20 @@ class VerificationService:
         """
         logger.debug("Layer 4: AI Confidence Scoring + Advanced Checks")
         
+        # Skip the LLM when Layers 1-3 already settle the verdict
+        gate = ai_gating_policy.evaluate(url_result, metadata_result, content_result)
+        if gate:
+            return self._gated_ai_result(citation, context, gate)
+        
         try:
-            # GEMINI SUGGESTION: Temporal consistency check (time-travel detection)
-            temporal_check = advanced_verifier.check_temporal_consistency(citation, context)
-            
-            # Prepare verification data for AI analysis
-            verification_data = {
-                "url_status": url_result.status.value,
-                "metadata_status": metadata_result.status.value,
-                "content_confidence": content_result.confidence if content_result.confidence else "N/A",
-            }
-            
             # Use AI service for actual analysis
             ai_result = await ai_service.analyze_citation_confidence(
                 citation=citation,
                 context=context,
-                verification_data=verification_data
-            )
-            
-            # Combine temporal check with AI analysis
-            combined_confidence = ai_result.confidence if ai_result.confidence else 0.5
-            reasoning_parts = [ai_result.details]
-            
-            if not temporal_check["passed"]:
-                combined_confidence = min(combined_confidence, 0.2)  # Severe penalty for temporal violations
-                reasoning_parts.extend(temporal_check["flags"])
-            
-            return LayerResult(
-                status=LayerStatus.PASSED if combined_confidence > 0.7 else LayerStatus.WARNING,
-                details=" | ".join(reasoning_parts),
-                confidence=combined_confidence,
-                metadata={
-                    **ai_result.metadata,
-                    "temporal_check": temporal_check
-                },
+                verification_data=self._ai_verification_data(url_result, metadata_result, content_result),
+                use_cache=use_cache
             )
+            return self._combine_ai_result(citation, context, ai_result)
         except Exception as e:
             logger.error(f"AI scoring error: {e}")
             return LayerResult(
@@ -491,6 +630,115 @@ class VerificationService:
                 confidence=0.5,
             )
     
+    async def _ai_confidence_scoring_batch(
+        self,
+        entries: List[Tuple[str, Optional[str], LayerResult, LayerResult, LayerResult]],
+        use_cache: bool = True,
+    ) -> List[LayerResult]:
+        """
+        Layer 4 for several citations at once
+        Entries are (citation, context, url_result, metadata_result, content_result)
+        """
+        logger.debug(f"Layer 4: Batched AI Confidence Scoring ({len(entries)} citations)")
+        
+        results: List[Optional[LayerResult]] = []
+        for citation, context, url_result, metadata_result, content_result in entries:
+            gate = ai_gating_policy.evaluate(url_result, metadata_result, content_result)
+            results.append(self._gated_ai_result(citation, context, gate) if gate else None)
+        
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        try:
+            ai_results = await ai_service.analyze_citations_batch(
+                [
+                    {
+                        "citation": entries[i][0],
+                        "context": entries[i][1],
+                        "verification_data": self._ai_verification_data(*entries[i][2:]),
+                    }
+                    for i in pending
+                ],
+                use_cache=use_cache
+            )
+            for i, ai_result in zip(pending, ai_results):
+                results[i] = self._combine_ai_result(entries[i][0], entries[i][1], ai_result)
+        except Exception as e:
+            logger.error(f"AI scoring error: {e}")
+            for i in pending:
+                results[i] = LayerResult(
+                    status=LayerStatus.WARNING,
+                    details=f"AI analysis unavailable: {str(e)}",
+                    confidence=0.5,
+                )
+        
+        return results
+    
+    def _gated_ai_result(
+        self,
+        citation: str,
+        context: Optional[str],
+        gate: Dict[str, Any],
+    ) -> LayerResult:
+        """Layer 4 result when the gating policy skipped the LLM"""
+        logger.info(f"⏭️ Skipping AI scoring: {gate['reason']}")
+        return self._combine_ai_result(
+            citation,
+            context,
+            LayerResult(
+                status=LayerStatus.PASSED if gate["decision"] == "confirmed" else LayerStatus.FAILED,
+                details=f"AI scoring skipped - {gate['reason']}",
+                confidence=gate["confidence"],
+                metadata={
+                    "skipped_by_policy": "ai_gating",
+                    "skip_reason": gate["reason"],
+                    "decision": gate["decision"],
+                },
+            ),
+        )
+    
+    def _ai_verification_data(
+        self,
+        url_result: LayerResult,
+        metadata_result: LayerResult,
+        content_result: LayerResult,
+    ) -> Dict[str, Any]:
+        """Layer 1-3 summary passed to the AI prompt"""
+        return {
+            "url_status": url_result.status.value,
+            "metadata_status": metadata_result.status.value,
+            "content_confidence": content_result.confidence if content_result.confidence else "N/A",
+        }
+    
+    def _combine_ai_result(
+        self,
+        citation: str,
+        context: Optional[str],
+        ai_result: LayerResult,
+    ) -> LayerResult:
+        """Combine the AI analysis with the temporal consistency check"""
+        # GEMINI SUGGESTION: Temporal consistency check (time-travel detection)
+        temporal_check = advanced_verifier.check_temporal_consistency(citation, context)
+        
+        # Combine temporal check with AI analysis
+        combined_confidence = ai_result.confidence if ai_result.confidence else 0.5
+        reasoning_parts = [ai_result.details]
+        
+        if not temporal_check["passed"]:
+            combined_confidence = min(combined_confidence, 0.2)  # Severe penalty for temporal violations
+            reasoning_parts.extend(temporal_check["flags"])
+        
+        return LayerResult(
+            status=LayerStatus.PASSED if combined_confidence > 0.7 else LayerStatus.WARNING,
+            details=" | ".join(reasoning_parts),
+            confidence=combined_confidence,
+            metadata={
+                **ai_result.metadata,
+                "temporal_check": temporal_check
+            },
+        )
+    
     # ========== LAYER 5: CITATION GRAPH ANALYSIS ==========
     
     async def _citation_graph_analysis(self, citation: str) -> LayerResult:
@@ -550,12 +798,21 @@ class VerificationService:
             confidence=None,
         )
     
+    def _policy_skipped_layer(self, layer_name: str, reason: str) -> LayerResult:
+        """Layer not run (or cancelled) because the early-exit policy settled the verdict"""
+        return LayerResult(
+            status=LayerStatus.SKIPPED,
+            details=f"{layer_name}: Skipped by early-exit policy - {reason}",
+            confidence=None,
+            metadata={"skipped_by_policy": "early_exit", "skip_reason": reason},
+        )
+    
     def _extract_citations(self, text: str, format: str) -> List[str]:
         """Extract potential citations from text"""
         citations = []
         
         # Extract sentences that contain citation patterns
-        sentences = re.split(r'[.!?]\s+', text)
+        sentences = _SENTENCE_BOUNDARY.split(text)
         
         for sentence in sentences:
             for pattern in self.citation_patterns:
@@ -680,22 +937,163 @@ Overall Assessment: {self._get_verdict_message(status, confidence)}
         else:
             return "incomplete"
     
+    @staticmethod
+    def _needs_suggestions(status: VerificationStatus) -> bool:
+        return status in [VerificationStatus.SUSPICIOUS, VerificationStatus.FAKE]
+    
     async def _generate_suggestions(self, citation: str) -> List[CitationSuggestion]:
-        """Generate alternative citation suggestions"""
-        
-        # TODO: Implement actual suggestion generation
-        # - Use semantic search on OpenAlex/Semantic Scholar
-        # - Find similar papers
-        # - Rank by relevance
-        
-        return [
-            CitationSuggestion(
-                title="Example Alternative Paper",
-                authors=["Smith, J.", "Doe, A."],
-                year=2023,
-                doi="10.1234/example",
-                url="https://example.com/paper",
-                confidence=0.85,
-                reason="Similar topic and methodology",
+        """Suggestions for a single citation (see _generate_suggestions_many)"""
+        return (await self._generate_suggestions_many([citation]))[0]
+    
+    async def _generate_suggestions_many(self, citations: List[str]) -> List[List[CitationSuggestion]]:
+        """
+        Generate alternative citation suggestions
+        Nearest known papers by title/abstract embedding (local index),
+        one embedding call and one index search for all citations
+        """
+        try:
+            return await suggestion_engine.suggest_many(citations)
+        except Exception as e:
+            logger.error(f"Suggestion lookup failed: {e}")
+            return [[] for _ in citations]
+
+
+class PageCitationStream:
+    """
+    Verifies a document's citations while its pages are still being read
+    
+    Pass ``add_page`` as the ``on_page`` callback of
+    DocumentProcessor.process_file: citations are extracted from each page
+    as it arrives (e.g. from OCR) and their verification starts right away,
+    overlapping with the remaining pages. ``finish`` returns the same
+    result as VerificationService.verify_text.
+    
+    Citations are whole sentences, so a page's first and last (unterminated)
+    sentences are held back and extracted joined with the neighbouring
+    page's, as they would be from the full text; blank pages are joined
+    across. Pages may arrive in any order; pieces whose neighbour never
+    arrives are extracted on their own in ``finish``.
+    """
+    
+    CARRY_MAX_CHARS = 2000  # Longest sentence piece held back per page edge
+    
+    def __init__(self, service: VerificationService, options: VerificationOptions):
+        self.service = service
+        self.options = options
+        self.seen: set = set()
+        self.started = 0
+        self.tasks: List[asyncio.Task] = []
+        self.limit = asyncio.Semaphore(settings.VERIFY_MAX_CONCURRENT_CITATIONS)
+        # Sentence pieces waiting for a neighbouring page, by page number
+        self._heads: Dict[int, str] = {}  # First sentence; predecessor missing
+        self._tails: Dict[int, str] = {}  # Unterminated last sentence; successor missing
+        self._open: Dict[int, str] = {}  # Pages without any sentence end
+    
+    async def add_page(self, page_num: int, text: str):
+        if not text.strip():
+            text = ""  # Blank page: its neighbours join across it, as in the document text
+        head, body, tail = self._split_page(text)
+        if head is None:
+            # The page is the middle of one sentence
+            self._open[page_num] = text
+            left = self._left_end(page_num)
+            right = self._right_end(page_num)
+            if left is not None and right is not None:
+                self._join(left, right)
+            return
+        
+        self._start(f"Page {page_num}", body)
+        
+        self._heads[page_num] = head
+        left = self._left_end(page_num)
+        if left is not None:
+            self._join(left, page_num)
+        
+        self._tails[page_num] = tail
+        right = self._right_end(page_num)
+        if right is not None:
+            self._join(page_num, right)
+    
+    async def finish(self) -> TextVerificationResult:
+        # Pieces next to pages that had no text: join what is adjacent
+        pieces = sorted(
+            [(n, 1, t) for n, t in self._heads.items()]
+            + [(n, 0, t) for n, t in self._open.items()]
+            + [(n, -1, t) for n, t in self._tails.items()]
+        )
+        chain: List[str] = []
+        for index, (page_num, role, text) in enumerate(pieces):
+            previous = pieces[index - 1] if index else None
+            continues = (
+                previous is not None and previous[0] == page_num - 1
+                and previous[1] <= 0 and role >= 0
             )
-        ]
+            if chain and not continues:
+                self._start("Page edges", "\n\n".join(filter(None, chain)))
+                chain = []
+            chain.append(text)
+        if chain:
+            self._start("Page edges", "\n\n".join(filter(None, chain)))
+        self._heads.clear()
+        self._tails.clear()
+        self._open.clear()
+        
+        results = []
+        for batch in await asyncio.gather(*self.tasks):
+            for result in batch:
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to verify citation: {result}")
+                else:
+                    results.append(result)
+        
+        logger.info(f"Found {len(self.seen)} potential citations")
+        return self.service._text_result(len(self.seen), results)
+    
+    def cancel(self):
+        for task in self.tasks:
+            task.cancel()
+    
+    def _left_end(self, page_num: int) -> Optional[int]:
+        """Page whose tail starts the sentence running into page_num (0 = document start), if known"""
+        left = page_num - 1
+        while left in self._open:
+            left -= 1
+        return left if left == 0 or left in self._tails else None
+    
+    def _right_end(self, page_num: int) -> Optional[int]:
+        """Page whose head ends the sentence running out of page_num, if it has arrived"""
+        right = page_num + 1
+        while right in self._open:
+            right += 1
+        return right if right in self._heads else None
+    
+    def _join(self, left: int, right: int):
+        """Extract the sentence from the tail of page left to the head of page right"""
+        parts = [self._tails.pop(left)] if left else []
+        parts += [self._open.pop(n) for n in range(left + 1, right)]
+        parts.append(self._heads.pop(right))
+        self._start(f"Pages {max(left, 1)}-{right}", "\n\n".join(filter(None, parts)))
+    
+    def _start(self, label: str, text: str):
+        """Extract new citations from text and start verifying them"""
+        citations = [c for c in self.service._extract_citations(text, "plain") if c not in self.seen]
+        self.seen.update(citations)
+        
+        batch = citations[:MAX_TEXT_CITATIONS - self.started]
+        if batch:
+            logger.info(f"{label}: verifying {len(batch)} citations")
+            self.started += len(batch)
+            self.tasks.append(asyncio.create_task(self.service._verify_many(batch, self.options, self.limit)))
+    
+    def _split_page(self, text: str) -> Tuple[Optional[str], str, str]:
+        """
+        (head, body, tail): the first sentence with its terminator, the
+        complete sentences after it, and the unterminated rest; head is
+        None for a page without any sentence end
+        """
+        boundaries = list(_SENTENCE_BOUNDARY.finditer(text))
+        if not boundaries:
+            return None, "", text
+        head_end = min(boundaries[0].end(), self.CARRY_MAX_CHARS)
+        tail_start = max(boundaries[-1].end(), len(text) - self.CARRY_MAX_CHARS, head_end)
+        return text[:head_end], text[head_end:tail_start], text[tail_start:]
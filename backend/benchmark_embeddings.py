@@ -0,0 +1,170 @@
+"""
+Embedding Backend Benchmark
+Compares the int8 ONNX backend against the PyTorch sentence-transformers model
+on a fixed corpus: throughput, memory and cosine-score agreement
+
+Usage:
+    python benchmark_embeddings.py --export   # build models/...-onnx-int8 first
+    python benchmark_embeddings.py
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+
+import numpy as np
+
+from app.core.config import settings
+
+# Fixed corpus: claim-like sentences and passage-like abstracts
+CORPUS = [
+    "This paper presents GPT-3, a large language model with 175 billion parameters.",
+    "We show that GPT-3 can perform few-shot learning without gradient updates.",
+    "AlphaFold2 achieves unprecedented accuracy in protein structure prediction.",
+    "The model uses attention mechanisms to predict 3D structures from sequences.",
+    "We use superconducting qubits to simulate molecular dynamics.",
+    "Results show a 100x speedup over classical methods on benchmark molecules.",
+    "Transformers replace recurrence entirely with self-attention.",
+    "The proposed method reduces word error rate by 12% on LibriSpeech.",
+    "Randomized controlled trials found no significant effect on mortality.",
+    "Deep residual networks ease the training of very deep architectures.",
+    "We introduce BERT, a bidirectional encoder pre-trained on masked language modeling.",
+    "Climate models project a warming of 1.5 degrees Celsius by 2040.",
+    "The vaccine showed 95% efficacy against symptomatic infection.",
+    "Graph neural networks aggregate information from neighbouring nodes.",
+    "Our dataset contains 1.2 million labelled images across 1000 classes.",
+    "Language models often hallucinate citations that do not exist.",
+    (
+        "Recent work has demonstrated substantial gains on many NLP tasks and benchmarks by "
+        "pre-training on a large corpus of text followed by fine-tuning on a specific task. "
+        "While typically task-agnostic in architecture, this method still requires "
+        "task-specific fine-tuning datasets of thousands or tens of thousands of examples."
+    ),
+    (
+        "Proteins are essential to life, and understanding their structure can facilitate a "
+        "mechanistic understanding of their function. Through an enormous experimental effort, "
+        "the structures of around 100,000 unique proteins have been determined."
+    ),
+    (
+        "The dominant sequence transduction models are based on complex recurrent or "
+        "convolutional neural networks that include an encoder and a decoder. We propose a new "
+        "simple network architecture based solely on attention mechanisms."
+    ),
+    (
+        "Deeper neural networks are more difficult to train. We present a residual learning "
+        "framework to ease the training of networks that are substantially deeper than those "
+        "used previously, and provide evidence that they are easier to optimize."
+    ),
+]
+
+REPEATS = 20  # Throughput corpus = CORPUS * REPEATS
+AGREEMENT_MIN_COSINE = 0.99  # Per-text cosine between backend vectors
+AGREEMENT_MAX_SCORE_DELTA = 0.05  # Max change of any pairwise similarity score
+
+
+def _rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_backend(backend_name: str, results: dict):
+    """Benchmark one backend in a fresh process so memory numbers don't mix"""
+    from app.services.embedding_backends import load_backend
+
+    baseline_rss = _rss_mb()
+    start = time.perf_counter()
+    backend = load_backend(backend_name)
+    load_seconds = time.perf_counter() - start
+
+    backend.encode(CORPUS[:4])  # Warm-up
+
+    corpus = CORPUS * REPEATS
+    start = time.perf_counter()
+    backend.encode(corpus, batch_size=settings.EMBEDDING_BATCH_SIZE)
+    encode_seconds = time.perf_counter() - start
+
+    results[backend_name] = {
+        "load_seconds": load_seconds,
+        "texts_per_second": len(corpus) / encode_seconds,
+        "peak_rss_mb": _rss_mb(),
+        "model_rss_mb": _rss_mb() - baseline_rss,
+        "vectors": backend.encode(CORPUS),
+    }
+
+
+def benchmark(backends):
+    print("=" * 80)
+    print("EMBEDDING BACKEND BENCHMARK")
+    print("=" * 80)
+
+    context = multiprocessing.get_context("spawn")
+    manager = context.Manager()
+    results = manager.dict()
+
+    for backend_name in backends:
+        process = context.Process(target=_run_backend, args=(backend_name, results))
+        process.start()
+        process.join()
+        if backend_name not in results:
+            print(f"❌ {backend_name}: benchmark failed (see errors above)")
+            return 1
+
+    print(f"\n{'Backend':<24}{'Load (s)':>10}{'Texts/s':>12}{'Peak RSS (MB)':>16}{'Model RSS (MB)':>16}")
+    print("-" * 80)
+    for backend_name in backends:
+        r = results[backend_name]
+        print(
+            f"{backend_name:<24}{r['load_seconds']:>10.2f}{r['texts_per_second']:>12.1f}"
+            f"{r['peak_rss_mb']:>16.0f}{r['model_rss_mb']:>16.0f}"
+        )
+
+    if len(backends) < 2:
+        return 0
+
+    reference = results[backends[0]]["vectors"]
+    candidate = results[backends[1]]["vectors"]
+
+    # Vector agreement: same text, different backend
+    per_text = np.sum(reference * candidate, axis=1)
+
+    # Score agreement: every pairwise similarity Layer 3 could compute
+    score_delta = np.abs(reference @ reference.T - candidate @ candidate.T)
+
+    print(f"\n📐 Agreement ({backends[1]} vs {backends[0]}):")
+    print(f"   Per-text cosine: min {per_text.min():.4f}, mean {per_text.mean():.4f}")
+    print(f"   Pairwise score delta: max {score_delta.max():.4f}, mean {score_delta.mean():.4f}")
+    print(
+        f"   Speedup: {results[backends[1]]['texts_per_second'] / results[backends[0]]['texts_per_second']:.2f}x"
+    )
+
+    parity = per_text.min() >= AGREEMENT_MIN_COSINE and score_delta.max() <= AGREEMENT_MAX_SCORE_DELTA
+    if parity:
+        print("\n✅ PARITY: quantized backend agrees with the PyTorch model")
+    else:
+        print("\n❌ NO PARITY: quantized backend drifts beyond tolerance")
+
+    print("\n" + "=" * 80)
+    return 0 if parity else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--export", action="store_true", help="Export and quantize the ONNX model first")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["sentence-transformers", "onnx-int8"],
+        help="Backends to compare (first one is the reference)",
+    )
+    args = parser.parse_args()
+
+    if args.export:
+        from app.services.embedding_backends import export_onnx_int8
+
+        export_onnx_int8(settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_ONNX_DIR)
+
+    sys.exit(benchmark(args.backends))
@@ -0,0 +1,140 @@
+"""
+Verification Pipeline Benchmark
+Throughput and tail latency of the full verification pipeline with the
+offline fake LLM provider - no API keys or network needed
+
+The synthetic citations carry no DOI or URL, so Layers 1-3 resolve locally
+and every citation reaches Layer 4. Shape the simulated LLM with the
+FAKE_LLM_* settings (latency median/spread, error rate, seed).
+
+Usage:
+    python benchmark_pipeline.py
+    python benchmark_pipeline.py --requests 500 --concurrency 50
+    python benchmark_pipeline.py --mode batch --batch-size 20
+    FAKE_LLM_ERROR_RATE=0.05 python benchmark_pipeline.py
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Must be set before the app reads its settings
+os.environ.setdefault("LLM_PROVIDER", "fake")
+
+from app.core.config import settings  # noqa: E402
+from app.models.schemas import VerificationOptions  # noqa: E402
+from app.services.verification_service import VerificationService  # noqa: E402
+
+AUTHORS = ["Smith", "Chen", "Garcia", "Okafor", "Novak", "Tanaka", "Müller", "Haddad"]
+TOPICS = [
+    "Attention-based models for protein folding",
+    "Sparse mixtures of experts at scale",
+    "Causal inference in observational health data",
+    "Quantum error correction with surface codes",
+    "Retrieval-augmented generation for scientific QA",
+    "Graph neural networks for molecule property prediction",
+]
+
+
+def synthetic_citations(count: int):
+    """Distinct, reproducible citations without DOIs or URLs"""
+    return [
+        f"{AUTHORS[i % len(AUTHORS)]} et al. ({2010 + i % 14}). "
+        f"{TOPICS[i % len(TOPICS)]}, part {i}. Journal of Benchmarks, {i % 50 + 1}({i % 12 + 1})."
+        for i in range(count)
+    ]
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_single(service, citations, concurrency: int, options):
+    """One verify_single_citation per citation, at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(citation):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            result = await service.verify_single_citation(citation, None, options)
+            latencies.append(time.perf_counter() - start)
+            if result.verification_layers.ai_scoring.metadata.get("error"):
+                errors += 1
+
+    await asyncio.gather(*(one(c) for c in citations))
+    return latencies, errors
+
+
+async def run_batch(service, citations, batch_size: int, concurrency: int, options):
+    """batch_verify requests of `batch_size` citations, `concurrency` requests in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(batch):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            result = await service.batch_verify(batch, "balanced", options.model_copy())
+            latencies.append(time.perf_counter() - start)
+            errors += sum(1 for r in result.results if r.verification_layers.ai_scoring.metadata.get("error"))
+
+    batches = [citations[i:i + batch_size] for i in range(0, len(citations), batch_size)]
+    await asyncio.gather(*(one(b) for b in batches))
+    return latencies, errors
+
+
+async def benchmark(args) -> int:
+    print("=" * 80)
+    print("VERIFICATION PIPELINE BENCHMARK")
+    print("=" * 80)
+    print(f"LLM provider: {settings.LLM_PROVIDER}")
+    if settings.LLM_PROVIDER == "fake":
+        print(
+            f"Fake LLM: median {settings.FAKE_LLM_LATENCY_MS:.0f}ms, sigma {settings.FAKE_LLM_LATENCY_SIGMA}, "
+            f"error rate {settings.FAKE_LLM_ERROR_RATE:.1%}, seed {settings.FAKE_LLM_SEED}"
+        )
+    print(f"Mode: {args.mode}, requests: {args.requests}, concurrency: {args.concurrency}")
+
+    service = VerificationService()
+    options = VerificationOptions(
+        check_content=False,
+        enable_citation_graph=False,
+        use_cache=False,  # Measure the LLM path, not the outcome cache
+    )
+    citations = synthetic_citations(args.requests)
+
+    start = time.perf_counter()
+    if args.mode == "single":
+        latencies, errors = await run_single(service, citations, args.concurrency, options)
+    else:
+        latencies, errors = await run_batch(service, citations, args.batch_size, args.concurrency, options)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    unit = "request" if args.mode == "single" else f"batch of {args.batch_size}"
+    print(f"\n⏱️  {len(citations)} citations in {elapsed:.2f}s ({len(citations) / elapsed:.1f} citations/s)")
+    print(f"   Latency per {unit} (ms):")
+    print(
+        f"   p50 {percentile(latencies, 0.50) * 1000:.0f}   p95 {percentile(latencies, 0.95) * 1000:.0f}   "
+        f"p99 {percentile(latencies, 0.99) * 1000:.0f}   max {latencies[-1] * 1000:.0f}"
+    )
+    print(f"   Layer 4 errors: {errors}")
+
+    print("\n" + "=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["single", "batch"], default="single")
+    parser.add_argument("--requests", type=int, default=200, help="Number of citations")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight")
+    parser.add_argument("--batch-size", type=int, default=10, help="Citations per batch_verify call")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(benchmark(args)))
@@ -0,0 +1,79 @@
+"""
+ClaimSourceIndex: tolerance-based number matching against a naive
+pairwise comparison, and a few spelled-out cases
+"""
+
+import random
+
+from app.services.claim_alignment import ClaimSourceIndex, extract_quantities
+
+UNITS = ["", "%", " percent", "x", "-fold", " ms", " s", " minutes", " GB", " MB", " million"]
+
+
+def naive_match(source, quantities, rel_tol=0.0, abs_tol=0.0):
+    """Closest agreeing source quantity per quantity, one pair at a time"""
+    matches = []
+    for q in quantities:
+        best, best_distance = None, None
+        for s in source:
+            if s["unit"] != q["unit"]:
+                continue
+            distance = abs(q["value"] - s["value"])
+            tolerance = max(
+                max(q["precision"], s["precision"]),
+                rel_tol * max(abs(q["value"]), abs(s["value"])),
+                abs_tol,
+            )
+            if distance <= tolerance and (best is None or distance < best_distance):
+                best, best_distance = s, distance
+        matches.append(best)
+    return matches
+
+
+def random_text(rng, count):
+    parts = []
+    for _ in range(count):
+        decimals = rng.choice([0, 0, 1, 2])
+        number = f"{rng.uniform(0, 120):.{decimals}f}"
+        parts.append(f"about {number}{rng.choice(UNITS)} of the runs")
+    return ", ".join(parts) + "."
+
+
+def assert_same(index, quantities, rel_tol=0.0, abs_tol=0.0):
+    expected = naive_match(index.quantities, quantities, rel_tol, abs_tol)
+    actual = index.match_quantities(quantities, rel_tol, abs_tol)
+    assert [id(m) if m else None for m in actual] == [id(m) if m else None for m in expected]
+
+
+def test_random_texts_match_naive():
+    rng = random.Random(47)
+    for _ in range(50):
+        index = ClaimSourceIndex(random_text(rng, rng.randint(0, 40)))
+        quantities = extract_quantities(random_text(rng, rng.randint(0, 40)))
+        for rel_tol, abs_tol in [(0.0, 0.0), (0.05, 0.0), (0.0, 2.0), (0.02, 0.5)]:
+            assert_same(index, quantities, rel_tol, abs_tol)
+
+
+def test_more_claim_numbers_than_one_block():
+    rng = random.Random(7)
+    index = ClaimSourceIndex(random_text(rng, 200))
+    quantities = extract_quantities(random_text(rng, 3000))
+    assert_same(index, quantities, rel_tol=0.01)
+
+
+def test_written_precision_and_units():
+    index = ClaimSourceIndex("Accuracy rose to 94.6 percent; latency fell to 1.5 s at 2.5 million requests.")
+    matched = index.check("Accuracy was 95% with 1500 ms latency.")["numbers"]
+    assert {m["claim"]: m["source"] for m in matched["matched"]} == {"95%": "94.6 percent", "1500 ms": "1.5 s"}
+    assert matched["unmatched"] == []
+
+
+def test_closest_agreeing_value_wins():
+    index = ClaimSourceIndex("Scores of 10, 12 and 11 were reported.")
+    assert index.match_quantities(extract_quantities("11.4"), abs_tol=2.0)[0]["raw"] == "11"
+
+
+def test_unit_mismatch_is_unmatched():
+    result = ClaimSourceIndex("The model is 3x faster.").check("The model is 3% faster.")
+    assert result["numbers"]["unmatched"] == ["3%"]
+    assert not result["aligned"]
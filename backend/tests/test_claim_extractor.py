@@ -0,0 +1,82 @@
+"""
+ClaimExtractor.iter_claims / aiter_claims over arbitrary chunkings must
+give the same claims as splitting the whole text with re.split
+"""
+
+import asyncio
+import random
+import re
+
+from app.services.hallucination_models import ClaimExtractor
+
+PIECES = [
+    "Smith et al", " (2020) report", " a 45% gain", " in 12 studies", " according to [3]",
+    " the model is robust", " this paper shows", " research proves it", " ok", " hmm",
+    " Results vary", "\n", "  ", " e.g", " 3", " percent",
+]
+TERMINATORS = [".", "...", "!", "?", "?!", ". ", ".\n", "!! ", ""]
+
+
+def random_text(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(0, 15)):
+        body = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 6)))
+        sentences.append(body + rng.choice(TERMINATORS))
+    return "".join(sentences)
+
+
+def random_chunks(rng: random.Random, text: str):
+    cuts = sorted(rng.randint(0, len(text)) for _ in range(rng.randint(0, 8)))
+    bounds = [0] + cuts + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]  # May include empty chunks
+
+
+def expected_claims(extractor: ClaimExtractor, text: str):
+    claims = []
+    for sentence in re.split(r'[.!?]+', text):
+        sentence = sentence.strip()
+        if len(sentence) >= 10 and extractor._is_factual_claim(sentence):
+            claims.append((sentence, extractor._classify_claim(sentence)))
+    return claims
+
+
+def check(claims, text, expected):
+    assert [(c["text"], c["type"]) for c in claims] == expected, text
+    for claim in claims:
+        assert text[claim["start"]:claim["end"]] == claim["text"]
+        assert claim["needs_verification"] is True
+    starts = [c["start"] for c in claims]
+    assert starts == sorted(starts)
+
+
+def test_iter_claims_matches_re_split():
+    extractor = ClaimExtractor()
+    rng = random.Random(46)
+    for _ in range(500):
+        text = random_text(rng)
+        expected = expected_claims(extractor, text)
+        check(list(extractor.iter_claims(random_chunks(rng, text))), text, expected)
+        check(extractor.extract_claims(text), text, expected)
+
+
+def test_aiter_claims_matches_re_split():
+    extractor = ClaimExtractor()
+    rng = random.Random(460)
+
+    async def stream(chunks):
+        for chunk in chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+    async def collect(chunks):
+        return [claim async for claim in extractor.aiter_claims(stream(chunks))]
+
+    for _ in range(200):
+        text = random_text(rng)
+        check(asyncio.run(collect(random_chunks(rng, text))), text, expected_claims(extractor, text))
+
+
+def test_single_character_chunks():
+    extractor = ClaimExtractor()
+    text = "Smith et al. (2020) found a 45% gain... Was it real?! This paper shows it is.\n"
+    check(list(extractor.iter_claims(list(text))), text, expected_claims(extractor, text))
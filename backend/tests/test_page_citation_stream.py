@@ -0,0 +1,88 @@
+"""
+PageCitationStream must find the same citations as extracting them from
+the whole document, including sentences that wrap across page breaks,
+whatever order the pages arrive in
+"""
+
+import asyncio
+import itertools
+import random
+
+from app.services.verification_service import PageCitationStream, VerificationService
+
+
+class RecordingService(VerificationService):
+    """Real citation extraction; verification only records what was started"""
+
+    def __init__(self):
+        super().__init__()
+        self.verified = []
+
+    async def _verify_many(self, citations, options, limit=None):
+        self.verified.extend(citations)
+        return []
+
+
+PAGES = [
+    "Intro text. As shown in arXiv:2101.00001 and",
+    "later work. See also Jones and",
+    "Lee (2019) for details. The dataset is at https://data.example.org/x",
+    "which is public",
+    "[4] agrees. Final remarks without citations. The registry lists 10.1234/abcd",
+]
+
+
+def stream_citations(pages, order):
+    service = RecordingService()
+
+    async def main():
+        stream = PageCitationStream(service, options=None)
+        for page_num in order:
+            await stream.add_page(page_num, pages[page_num - 1])
+        return await stream.finish()
+
+    result = asyncio.run(main())
+    assert len(service.verified) == len(set(service.verified))
+    assert result.total_citations == len(service.verified)
+    return set(service.verified)
+
+
+def document_citations(pages):
+    # The document text skips blank pages, as DocumentProcessor does
+    text = "\n\n".join(page for page in pages if page.strip())
+    return set(VerificationService()._extract_citations(text, "plain"))
+
+
+def test_wrapped_sentences_in_any_order():
+    expected = document_citations(PAGES)
+    assert "See also Jones and\n\nLee (2019) for details" in expected
+    assert "The dataset is at https://data.example.org/x\n\nwhich is public\n\n[4] agrees" in expected
+    for order in itertools.permutations(range(1, len(PAGES) + 1)):
+        assert stream_citations(PAGES, order) == expected, order
+
+
+def test_pages_without_text_break_sentences():
+    # Page 2 had no text (never reported): pages 1 and 3 don't join
+    pages = ["Start. Cited in arXiv:2101.00001", "", "[2] shows it. End."]
+    found = stream_citations(pages, [3, 1])
+    assert found == {"Cited in arXiv:2101.00001", "[2] shows it"}
+
+
+def test_random_pages_match_document():
+    rng = random.Random(49)
+    words = ["results", "Smith and", "Kim (2020)", "[3]", "doi 10.1000/xyz", "arXiv:1706.03762",
+             "https://example.org/p", "hold", ".", ". ", "? ", "!\n", "\n", "again"]
+    for _ in range(200):
+        pages = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 10))) for _ in range(rng.randint(1, 5))]
+        order = list(range(1, len(pages) + 1))
+        rng.shuffle(order)
+        assert stream_citations(pages, order) == document_citations(pages), (pages, order)
+
+
+def test_blank_pages_join_like_the_document():
+    # Every page is reported, blank ones included
+    pages = ["Start. Cited in arXiv:2101.00001", "  \n", "", "[2] shows it. End."]
+    expected = document_citations(pages)
+    assert "Cited in arXiv:2101.00001\n\n[2] shows it" in expected
+    for order in itertools.permutations(range(1, len(pages) + 1)):
+        assert stream_citations(pages, order) == expected, order
@@ -0,0 +1,132 @@
+"""
+PatternRuleSet must agree with matching each rule on its own, and the
+rule-driven detector with the hand-written checks it replaced
+"""
+
+import random
+import re
+
+import pytest
+
+from app.services.hallucination_models import HallucinationDetector
+from app.services.pattern_rules import PatternRuleSet
+
+FRAGMENTS = [
+    "Smith et al.", "Smith et al", "Lee and Kim", "Nature 2020", "science 1999", "Cell  2031",
+    "(2019)", "2035", "2150", "1987", "arXiv:2101.00001", "arXiv:abc", "ARXIV:12.3",
+    "10.1234/abc", "10.12/x", "doi:10.5555/1", "https://example.com/a", "http://test.org",
+    "https://fakejournal.net", "https://real.edu/p", "all", "Always", "clearly", "never",
+    "the", "results", "show", ".", ",", " ", "aaa", "abab", "\n",
+]
+
+# Patterns that never match the empty string (see PatternRuleSet.scan)
+PATTERNS = [
+    r"a+", r"ab", r"aba", r"b", r"\d+", r"\d{4}", r"[A-Z][a-z]+", r"\b\w+\b", r"10\.(?!\d{4})",
+    r"arXiv:(?!\d{4}\.\d{4,5})", r"(?:ab)+", r"a(?=b)", r"(?<=a)b", r"\s+", r"et\s+al\.?",
+    r"(Nature|Science)\s+\d{4}", r"https?://\S+", r"(?:[.,])",
+]
+
+
+def random_text(rng: random.Random) -> str:
+    return " ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12)))
+
+
+def expected_hits(rule, text):
+    flags = re.IGNORECASE if rule["ignore_case"] else 0
+    return [(m.start(), m.group(0)) for m in re.finditer(rule["pattern"], text, flags)]
+
+
+def test_scan_matches_each_rule_alone():
+    rng = random.Random(43)
+    for _ in range(300):
+        rules = [
+            {
+                "name": f"rule{i}",
+                "pattern": rng.choice(PATTERNS),
+                "ignore_case": rng.random() < 0.5,
+                "severity": "low",
+                "description": "",
+            }
+            for i in range(rng.randint(1, 6))
+        ]
+        rule_set = PatternRuleSet(rules)
+        for _ in range(10):
+            text = random_text(rng)
+            assert rule_set.scan(text) == [expected_hits(rule, text) for rule in rule_set.rules], (rules, text)
+
+
+def test_default_rules_match_each_rule_alone():
+    rule_set = PatternRuleSet.load()
+    rng = random.Random(7)
+    for _ in range(500):
+        text = random_text(rng)
+        assert rule_set.scan(text) == [expected_hits(rule, text) for rule in rule_set.rules], text
+
+
+def test_rejects_named_groups_and_backreferences():
+    for pattern in [r"(?P<x>a)", r"(a)\1"]:
+        with pytest.raises(ValueError):
+            PatternRuleSet([{"name": "bad", "pattern": pattern, "severity": "low", "description": ""}])
+
+
+# The pattern and structure checks as they were hard-coded before the rule file
+BASELINE_PATTERNS = [
+    ("impossible_year", r'\b(20[3-9]\d|2[1-9]\d{2})\b', "high", "Citation references future year"),
+    ("fake_doi_structure", r'10\.(?![\d]{4})', "medium", "DOI doesn't follow standard format"),
+    ("nonexistent_journal", r'\b(Nature|Science|Cell|Lancet)\s+\d{4}\b', "low",
+     "High-impact journal without proper citation"),
+    ("fake_arxiv", r'arXiv:(?!\d{4}\.\d{4,5})', "high", "Invalid arXiv format"),
+    ("suspicious_url", r'https?://(?:example\.com|test\.org|fake)', "high", "Placeholder or test URL detected"),
+]
+BASELINE_WEIGHTS = {"high": 0.3, "medium": 0.15, "low": 0.05}
+
+
+def baseline_detect(citation):
+    flags = []
+    severity_score = 0
+
+    for name, pattern, severity, description in BASELINE_PATTERNS:
+        for match in re.finditer(pattern, citation, re.IGNORECASE):
+            flags.append({"type": name, "matched": match.group(0), "severity": severity, "description": description})
+            severity_score += BASELINE_WEIGHTS[severity]
+
+    structure_flags = []
+    if not re.search(r'\b[A-Z][a-z]+\s+(?:et\s+al\.?|and\s+[A-Z])', citation):
+        structure_flags.append({"type": "missing_author", "severity": "medium",
+                                "description": "No clear author pattern found"})
+    if not re.search(r'\b(19|20)\d{2}\b', citation):
+        structure_flags.append({"type": "missing_year", "severity": "medium",
+                                "description": "No publication year found"})
+    if not re.search(r'https?://|doi:|arXiv:', citation, re.IGNORECASE):
+        structure_flags.append({"type": "missing_source", "severity": "high",
+                                "description": "No verifiable source (URL/DOI/arXiv) found"})
+    for phrase in [r'\bevery\b', r'\ball\b', r'\balways\b', r'\bnever\b',
+                   r'\bclearly\b', r'\bobviously\b', r'\bundoubtedly\b']:
+        if re.search(phrase, citation, re.IGNORECASE):
+            structure_flags.append({"type": "overconfident_language", "severity": "low",
+                                    "description": "Contains overly confident language (common in hallucinations)"})
+            break
+    flags.extend(structure_flags)
+    severity_score += len(structure_flags) * 0.1
+
+    return flags, min(severity_score, 1.0)
+
+
+def test_detector_matches_baseline():
+    detector = HallucinationDetector()
+    rng = random.Random(2024)
+    citations = [random_text(rng) for _ in range(500)] + [
+        "Smith et al. (2020). Deep learning. Nature 2020. https://doi.org/10.1038/nature14539",
+        "Johnson and Lee (2035) clearly show arXiv:99 at https://example.com",
+        "",
+    ]
+    for citation in citations:
+        result = detector.detect_hallucinations(citation)
+        flags, probability = baseline_detect(citation)
+
+        # New flags may add keys (e.g. position); the baseline's must agree
+        assert len(result["flags"]) == len(flags), citation
+        for new, old in zip(result["flags"], flags):
+            assert {key: new.get(key) for key in old} == old, citation
+        assert result["hallucination_probability"] == pytest.approx(probability), citation
+        assert result["is_likely_hallucinated"] == (result["hallucination_probability"] > 0.5)
@@ -0,0 +1,64 @@
+"""
+QuoteLocator: exact, mistyped and absent quotes, and offsets into
+contexts with irregular whitespace
+"""
+
+from app.services.quote_locator import QuoteLocator
+
+CONTEXT = (
+    "Transformers have become the dominant architecture for language tasks. "
+    "We find that scaling model size improves few-shot accuracy on most benchmarks, "
+    "while fine-tuning remains competitive for small datasets. "
+    "The largest model reaches 76.2% on the held-out suite."
+)
+
+
+def test_exact_quote():
+    locator = QuoteLocator(CONTEXT)
+    quote = "scaling model size improves few-shot accuracy"
+    match = locator.locate(quote)
+    assert match["score"] == 1.0
+    assert match["matched"] == quote
+    assert CONTEXT[match["start"]:match["end"]] == quote
+
+
+def test_exact_quote_ignores_case_and_whitespace():
+    match = QuoteLocator(CONTEXT).locate("  SCALING model\tsize ")
+    assert match["score"] == 1.0
+    assert match["matched"] == "scaling model size"
+
+
+def test_quote_with_typos():
+    locator = QuoteLocator(CONTEXT)
+    match = locator.locate("scalling modle size improves few shot acuracy")
+    assert 0.8 <= match["score"] < 1.0
+    start = CONTEXT.index("scaling model size")
+    assert abs(match["start"] - start) <= 2
+    assert "few-shot" in match["matched"]
+
+
+def test_no_match():
+    locator = QuoteLocator(CONTEXT)
+    match = locator.locate("quantum annealing of protein folding pathways")
+    assert match is None or match["score"] < 0.6
+    assert locator.locate("") is None
+    assert QuoteLocator("").locate("anything") is None
+
+
+def test_offsets_with_whitespace_runs_and_newlines():
+    context = "Intro  text.\n\n  The   model\n\treaches\n   76.2%   accuracy   on\n\nthe suite.  "
+    locator = QuoteLocator(context)
+
+    match = locator.locate("the model reaches 76.2% accuracy")
+    assert match["score"] == 1.0
+    assert match["start"] == context.index("The")
+    assert match["end"] == context.index("accuracy") + len("accuracy")
+    assert match["matched"] == context[match["start"]:match["end"]]
+    assert " ".join(match["matched"].split()).lower() == "the model reaches 76.2% accuracy"
+
+    # Fuzzy match across the blank lines before "the suite"
+    match = locator.locate("acuracy on the suit")
+    assert match["score"] >= 0.8
+    assert match["matched"] == context[match["start"]:match["end"]]
+    assert match["start"] >= context.index("accuracy") - 1
+    assert match["end"] <= context.index("suite.") + len("suite")
@@ -0,0 +1,61 @@
+"""
+Upload size limits: oversized bodies get 413, whether or not they
+declare a Content-Length
+"""
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.uploads import UploadSizeLimitMiddleware
+
+LIMIT = 4096
+BOUNDARY = "testboundary"
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, paths=["/upload"], max_bytes=LIMIT)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return TestClient(app)
+
+
+def multipart(size: int) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="doc.txt"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode() + b"x" * size + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def post(client: TestClient, body: bytes, chunked: bool):
+    headers = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+    if chunked:
+        def chunks():
+            for start in range(0, len(body), 1024):
+                yield body[start:start + 1024]
+        return client.post("/upload", content=chunks(), headers=headers)
+    return client.post("/upload", content=body, headers=headers)
+
+
+def test_small_upload_passes():
+    client = make_client()
+    for chunked in (False, True):
+        response = post(client, multipart(100), chunked)
+        assert response.status_code == 200
+        assert response.json() == {"size": 100}
+
+
+def test_oversized_upload_with_content_length():
+    response = post(make_client(), multipart(LIMIT * 2), chunked=False)
+    assert response.status_code == 413
+
+
+def test_oversized_chunked_upload():
+    response = post(make_client(), multipart(LIMIT * 2), chunked=True)
+    assert response.request.headers.get("transfer-encoding") == "chunked"
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413